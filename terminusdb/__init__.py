@@ -1,4 +1,4 @@
 # Re-export everything from terminusdb_client for the new import path.
 # Both `import terminusdb` and `import terminusdb_client` are supported.
 from terminusdb_client import *  # noqa
-from terminusdb_client import Client, WOQLClient, WOQLQuery, Var, Vars, Patch, GraphType, WOQLDataFrame, WOQLSchema  # noqa
+from terminusdb_client import Client, WOQLClient, WOQLQuery, Var, Vars, Patch, GraphType, WOQLDataFrame, WOQLSchema, BulkLoader, AsyncClient, DocumentCache  # noqa
@@ -1,2 +1,2 @@
 from terminusdb_client.client import *  # noqa
-from terminusdb_client.client import Client, GraphType, Patch  # noqa
+from terminusdb_client.client import Client, GraphType, Patch, BulkLoader, AsyncClient, DocumentCache  # noqa
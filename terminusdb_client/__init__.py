@@ -1,4 +1,4 @@
-from .client import GraphType, Patch, Client  # noqa
+from .client import GraphType, Patch, Client, BulkLoader, AsyncClient, DocumentCache  # noqa
 from .woqldataframe import woqlDataframe as WOQLDataFrame  # noqa
 from .woqlquery import WOQLQuery, Var, Vars  # noqa
 from .woqlschema import *  # noqa
@@ -4,28 +4,42 @@ Client is the Python public API for TerminusDB"""
 import base64
 import copy
 import gzip
+import itertools
 import json
 import os
+import threading
+import time
 import urllib.parse as urlparse
 import warnings
+import weakref
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union
 
 import requests
 
+from .. import json_codec
 from ..__version__ import __version__
 from ..errors import DatabaseError, InterfaceError
 from ..woql_utils import (
     _clean_dict,
     _dt_dict,
     _dt_list,
+    _finish_document_stream,
+    _finish_json,
     _finish_response,
+    _gzip_chunks,
     _result2stream,
+    _stream2chunks,
     _args_as_payload,
 )
+from ..woqldataframe.woqlArrow import to_record_batches
 from ..woqlquery.woql_query import WOQLQuery
+from .bulk_loader import BulkLoader
+from .document_cache import DocumentCache, _document_id
+from .http_pool import PoolAdapter
 
 # client object
 # license Apache Version 2
@@ -36,12 +50,14 @@ class WoqlResult:
     """Iterator for streaming WOQL results."""
 
     def __init__(self, lines):
-        preface = json.loads(next(lines))
+        self._set_preface(json_codec.loads(next(lines)))
+        self.lines = lines
+
+    def _set_preface(self, preface):
         if not ("@type" in preface and preface["@type"] == "PrefaceRecord"):
             raise DatabaseError(response=preface)
         self.preface = preface
         self.postscript = {}
-        self.lines = lines
 
     def _check_error(self, document):
         if "@type" in document:
@@ -60,7 +76,52 @@ class WoqlResult:
         return self
 
     def __next__(self):
-        return self._check_error(json.loads(next(self.lines)))
+        return self._check_error(json_codec.loads(next(self.lines)))
+
+
+class DocumentStream:
+    """Iterator for streaming documents.
+
+    Documents are decoded as the response body arrives, so only the document
+    being decoded is held in memory. The connection is released back to the
+    pool once the stream is exhausted or closed; use it as a context manager
+    (or call `close`) when not reading it to the end.
+
+    Examples
+    --------
+    >>> with client.get_all_documents() as documents:
+    ...     first = next(documents)
+    """
+
+    def __init__(self, response, documents):
+        self.response = response
+        self.documents = documents
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.closed:
+            raise StopIteration()
+        try:
+            return next(self.documents)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        """Stop reading and release the connection."""
+        if not self.closed:
+            self.closed = True
+            self.documents.close()
+            self.response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
 
 class JWTAuth(requests.auth.AuthBase):
@@ -154,6 +215,38 @@ class Patch:
         return copy.deepcopy(self)
 
 
+class _ServerCache:
+    """Cache of server info and database existence shared by the clients of a process"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl):
+        if ttl is None or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_server_cache = _ServerCache()
+
+
 class GraphType(str, Enum):
     """Type of graph"""
 
@@ -182,6 +275,13 @@ class Client:
         Ref setting for the client. Default to None.
     repo : str
         Repo identifier of the database that this client is connected to. Default to "local".
+
+    Notes
+    -----
+    A connected client can be shared by threads: the state of each call is
+    local to the call and the requests go through one thread-safe connection
+    pool (sized with `pool_maxsize`). Changing the connection settings (db,
+    branch, ref, team...) changes them for all the threads.
     """
 
     def from_json(self, json_str):
@@ -198,6 +298,14 @@ class Client:
         self,
         server_url: str,
         user_agent: str = f"terminusdb-client-python/{__version__}",
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        retries: int = 0,
+        backoff_factor: float = 0.5,
+        document_cache: Optional[DocumentCache] = None,
         **kwargs,
     ) -> None:
         r"""The Client constructor.
@@ -208,6 +316,22 @@ class Client:
             URL of the server that this client will connect to.
         user_agent : optional, str
             User agent header when making requests. Defaults to terminusdb-client-python with the version appended.
+        pool_connections : int
+            Number of hosts to keep a pool of connections for, default to be 10.
+        pool_maxsize : int
+            Maximum number of keep-alive connections to each host, default to be 10. Set it to the number of threads sharing the client.
+        pool_block : bool
+            If True, wait for a free connection when `pool_maxsize` connections are in use instead of opening an extra one that is discarded afterwards.
+        connect_timeout : optional, float
+            Seconds to wait for a connection to the server. Default to be None (wait forever).
+        read_timeout : optional, float
+            Seconds to wait for the server to send data. Default to be None (wait forever).
+        retries : int
+            Number of retries of idempotent requests (GET, HEAD, PUT, DELETE) on connection errors and 502/503/504 responses, default to be 0.
+        backoff_factor : float
+            Exponential backoff between retries, sleeping `backoff_factor * 2 ** (retry - 1)` seconds.
+        document_cache : optional, DocumentCache
+            Cache for the documents retrieved with `get_document`, can be shared by clients. Default to be None (no cache).
         **kwargs
             Extra configuration options
 
@@ -223,11 +347,35 @@ class Client:
         self._branch = None
         self._ref = None
         self._repo = None
-        self._references = {}
+
+        # forks share the session of the client they are forked from
+        self._owns_session = True
+        # with a lazy connect, the server is checked on the first request
+        self._pending_check = False
+        self._lazy = False
+        self._cache_ttl = None
+
+        # connection pool settings, see PoolAdapter
+        self._pool_options = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "pool_block": pool_block,
+            "connect_timeout": connect_timeout,
+            "read_timeout": read_timeout,
+            "retries": retries,
+            "backoff_factor": backoff_factor,
+        }
+
+        self._document_cache = document_cache
 
         # Default headers
         self._default_headers = {"user-agent": user_agent}
 
+    @property
+    def document_cache(self) -> Optional[DocumentCache]:
+        """Cache of the documents retrieved with `get_document`, None if not cached"""
+        return self._document_cache
+
     @property
     def team(self):
         if isinstance(self._team, str):
@@ -321,6 +469,8 @@ class Client:
         branch: str = "main",
         ref: Optional[str] = None,
         repo: str = "local",
+        lazy: bool = False,
+        cache_ttl: Optional[float] = None,
         **kwargs,
     ) -> None:
         r"""Connect to a Terminus server at the given URI with an API key.
@@ -351,6 +501,10 @@ class Client:
             Ref setting
         repo : optional, str
             Local or remote repo, default to be "local"
+        lazy : bool
+            If True, no request is made now: the server and the database are checked on the first request instead, raising the same InterfaceError if they are not available.
+        cache_ttl : optional, float
+            If given, the server info and the existence of the database are cached for this many seconds (by server url and credentials), and other connections made within that time reuse them instead of requesting them again.
         **kwargs
             Extra configuration options.
 
@@ -360,30 +514,44 @@ class Client:
         >>> client.connect(key="root", team="admin", user="admin", db="example_db")
         """
 
-        self.team = team
-        self.db = db
-        self._remote_auth_dict = remote_auth
-        self._key = key
-        self.user = user
-        if api_token:
-            self._use_token = True
-        else:
-            self._use_token = use_token
-        self._jwt_token = jwt_token
-        self._api_token = api_token
-        self.branch = branch
-        self.ref = ref
-        self.repo = repo
-        self._session = requests.Session()
+        self._set_connection(
+            team,
+            db,
+            remote_auth,
+            use_token,
+            jwt_token,
+            api_token,
+            key,
+            user,
+            branch,
+            ref,
+            repo,
+        )
+        self._session = self._new_session()
+        self._owns_session = True
         self._connected = True
+        self._lazy = lazy
+        self._cache_ttl = cache_ttl
+        self._author = self.user
+
+        if lazy:
+            self._pending_check = True
+        else:
+            self._check_server()
 
+    def _check_server(self):
+        """Check the server and the database connected to, raise InterfaceError if unavailable"""
+        info_key = self._server_cache_key()
+        db_key = info_key + (self.team, self.db)
         try:
-            self._db_info = self.info()
+            db_info = _server_cache.get(info_key)
+            if db_info is None:
+                db_info = self.info()
+                _server_cache.set(info_key, db_info, self._cache_ttl)
+            self._db_info = db_info
         except Exception as error:
-            raise InterfaceError(
-                f"Cannot connect to server, please make sure TerminusDB is running at {self.server_url} and the authentication details are correct. Details: {str(error)}"
-            ) from None
-        if self.db is not None:
+            raise self._connect_error(error) from None
+        if self.db is not None and not _server_cache.get(db_key):
             try:
                 _finish_response(
                     self._session.head(
@@ -395,7 +563,83 @@ class Client:
                 )
             except DatabaseError:
                 raise InterfaceError(f"Connection fail, {self.db} does not exist.")
-        self._author = self.user
+            _server_cache.set(db_key, True, self._cache_ttl)
+        self._pending_check = False
+
+    def _lazy_check(self):
+        """Lazy connect, check the server on the first request"""
+        self._check_server()
+
+    def _server_cache_key(self):
+        """Key of the server cache: the server and the credentials used"""
+        if not self._use_token and self._key and self.user:
+            credentials = ("basic", self.user, self._key)
+        elif self._jwt_token is not None:
+            credentials = ("jwt", self._jwt_token)
+        elif self._api_token is not None:
+            credentials = ("token", self._api_token)
+        else:
+            credentials = ("token", os.environ.get("TERMINUSDB_ACCESS_TOKEN"))
+        return (self.server_url,) + credentials
+
+    def _new_session(self):
+        session = requests.Session()
+        adapter = PoolAdapter(**self._pool_options)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def pool_stats(self) -> dict:
+        """Get the statistics of the connection pool of the client.
+
+        Returns
+        -------
+        dict
+            Number of `requests` sent, new `connections` opened, `reused` connections and the `reuse_rate`, `waits` for a free connection (with `pool_block`) and connections discarded because the pool was full (`discards`), in total and by host in `hosts`. A low reuse rate or many discards under concurrent use means `pool_maxsize` is too small.
+
+        Examples
+        --------
+        >>> client = Client("http://127.0.0.1:6363", pool_maxsize=64)
+        >>> client.connect()
+        >>> client.pool_stats()["reuse_rate"]
+        """
+        self._check_connection(check_db=False)
+        return self._session.get_adapter(self.api).pool_stats()
+
+    def _set_connection(
+        self,
+        team,
+        db,
+        remote_auth,
+        use_token,
+        jwt_token,
+        api_token,
+        key,
+        user,
+        branch,
+        ref,
+        repo,
+    ):
+        """Store the connection settings given to `connect`"""
+        self.team = team
+        self.db = db
+        self._remote_auth_dict = remote_auth
+        self._key = key
+        self.user = user
+        if api_token:
+            self._use_token = True
+        else:
+            self._use_token = use_token
+        self._jwt_token = jwt_token
+        self._api_token = api_token
+        self.branch = branch
+        self.ref = ref
+        self.repo = repo
+
+    def _connect_error(self, error):
+        return InterfaceError(
+            f"Cannot connect to server, please make sure TerminusDB is running at {self.server_url} and the authentication details are correct. Details: {str(error)}"
+        )
 
     def close(self) -> None:
         """Undo connect and close the connection.
@@ -409,6 +653,8 @@ class Client:
         Defaults to check if a db is connected"""
         if not self._connected:
             raise InterfaceError("Client is not connected to a TerminusDB server.")
+        if self._pending_check:
+            self._lazy_check()
         if check_db and self.db is None:
             raise InterfaceError(
                 "No database is connected. Please either connect to a database or create a new database."
@@ -442,13 +688,11 @@ class Client:
              }
              ```
         """
-        return json.loads(
-            _finish_response(
-                self._session.get(
-                    self.api + "/info",
-                    headers=self._default_headers,
-                    auth=self._auth(),
-                )
+        return _finish_json(
+            self._session.get(
+                self.api + "/info",
+                headers=self._default_headers,
+                auth=self._auth(),
             )
         )
 
@@ -518,7 +762,10 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        commits = json.loads(_finish_response(result))
+        return self._parse_log(_finish_json(result))
+
+    @staticmethod
+    def _parse_log(commits):
         for commit in commits:
             commit["timestamp"] = datetime.fromtimestamp(commit["timestamp"])
             commit["commit"] = commit["identifier"]  # For backwards compat.
@@ -642,6 +889,19 @@ class Client:
         team = team if team else self.team
         db = db if db else self.db
 
+        result = self._session.get(
+            f"{self.api}/history/{team}/{db}",
+            params=self._document_history_params(
+                doc_id, start, count, created, updated
+            ),
+            headers=self._default_headers,
+            auth=self._auth(),
+        )
+
+        return self._parse_document_history(_finish_json(result))
+
+    @staticmethod
+    def _document_history_params(doc_id, start, count, created, updated):
         params = {
             "id": doc_id,
             "start": start,
@@ -651,16 +911,10 @@ class Client:
             params["created"] = created
         if updated:
             params["updated"] = updated
+        return params
 
-        result = self._session.get(
-            f"{self.api}/history/{team}/{db}",
-            params=params,
-            headers=self._default_headers,
-            auth=self._auth(),
-        )
-
-        history = json.loads(_finish_response(result))
-
+    @staticmethod
+    def _parse_document_history(history):
         # Post-process timestamps from Unix timestamp to datetime objects
         if isinstance(history, list):
             for entry in history:
@@ -668,7 +922,6 @@ class Client:
                     entry["timestamp"], (int, float)
                 ):
                     entry["timestamp"] = datetime.fromtimestamp(entry["timestamp"])
-
         return history
 
     def _get_current_commit(self):
@@ -688,11 +941,8 @@ class Client:
     def get_all_branches(self, get_data_version=False):
         """Get all the branches available in the database."""
         self._check_connection()
-        api_url = self._documents_url().split("/")
-        api_url = api_url[:-2]
-        api_url = "/".join(api_url) + "/_commits"
         result = self._session.get(
-            api_url,
+            self._commits_url(),
             headers=self._default_headers,
             params={"type": "Branch"},
             auth=self._auth(),
@@ -720,6 +970,8 @@ class Client:
     def copy(self) -> "Client":
         """Create a deep copy of this client.
 
+        The document cache, if any, is shared with the copy.
+
         Returns
         -------
         Client
@@ -731,7 +983,63 @@ class Client:
         >>> clone = client.copy()
         >>> assert client is not clone
         """
-        return copy.deepcopy(self)
+        memo = {}
+        if self._document_cache is not None:
+            memo[id(self._document_cache)] = self._document_cache
+        return copy.deepcopy(self, memo)
+
+    def fork(
+        self,
+        team: Optional[str] = None,
+        db: Optional[str] = None,
+        branch: Optional[str] = None,
+        ref: Optional[str] = None,
+        repo: Optional[str] = None,
+    ) -> "Client":
+        """Create a client sharing the connection pool and the authentication of this one, pointing to another team, database, branch or commit.
+
+        Unlike `copy`, nothing is copied but the settings: the fork keeps using the warm keep-alive connections of this client, and no request is made. Closing the fork does not close the connections of this client.
+
+        Parameters
+        ----------
+        team : str, optional
+            Team of the fork, default to the team of this client.
+        db : str, optional
+            Database of the fork, default to the database of this client.
+        branch : str, optional
+            Branch of the fork, default to the branch of this client.
+        ref : str, optional
+            Commit of the fork. Default to the ref of this client, unless `branch` is given.
+        repo : str, optional
+            Repo of the fork, default to the repo of this client.
+
+        Returns
+        -------
+        Client
+            The forked client.
+
+        Examples
+        --------
+        >>> client = Client("http://127.0.0.1:6363/")
+        >>> client.connect(db="example_db")
+        >>> dev = client.fork(branch="dev")
+        >>> dev.get_all_branches()
+        """
+        forked = copy.copy(self)
+        forked._default_headers = self._default_headers.copy()
+        forked._owns_session = False
+        if team is not None:
+            forked.team = team
+        if db is not None:
+            forked.db = db
+        if branch is not None:
+            forked.branch = branch
+            forked.ref = ref
+        elif ref is not None:
+            forked.ref = ref
+        if repo is not None:
+            forked.repo = repo
+        return forked
 
     def set_db(self, dbid: str, team: Optional[str] = None) -> str:
         """Set the connection to another database. This will reset the connection.
@@ -768,6 +1076,8 @@ class Client:
             branch=self.branch,
             ref=self.ref,
             repo=self.repo,
+            lazy=self._lazy,
+            cache_ttl=self._cache_ttl,
         )
 
     def _get_prefixes(self):
@@ -994,7 +1304,28 @@ class Client:
         """
 
         self._check_connection(check_db=False)
+        details = self._database_details(
+            dbid, label, description, prefixes, include_schema
+        )
+        if team is None:
+            team = self.team
+
+        self.team = team
+        self._connected = True
+        self.db = dbid
+
+        _finish_response(
+            self._session.post(
+                self._db_url(),
+                headers=self._default_headers,
+                json=details,
+                auth=self._auth(),
+            )
+        )
 
+    @staticmethod
+    def _database_details(dbid, label, description, prefixes, include_schema):
+        """Body of the request creating a database"""
         details: Dict[str, Any] = {}
         if label:
             details["label"] = label
@@ -1010,21 +1341,7 @@ class Client:
             details["schema"] = False
         if prefixes:
             details["prefixes"] = prefixes
-        if team is None:
-            team = self.team
-
-        self.team = team
-        self._connected = True
-        self.db = dbid
-
-        _finish_response(
-            self._session.post(
-                self._db_url(),
-                headers=self._default_headers,
-                json=details,
-                auth=self._auth(),
-            )
-        )
+        return details
 
     def delete_database(
         self,
@@ -1059,7 +1376,19 @@ class Client:
         """
 
         self._check_connection(check_db=False)
+        payload = self._delete_database_params(dbid, team, force)
+        _finish_response(
+            self._session.delete(
+                self._db_url(),
+                headers=self._default_headers,
+                auth=self._auth(),
+                params=payload,
+            )
+        )
+        self._database_deleted()
 
+    def _delete_database_params(self, dbid, team, force):
+        """Point the client to the database to delete, return the parameters of the request"""
         if dbid is None:
             raise UserWarning(
                 f"You are currently using the database: {self.team}/{self.db}. If you want to delete it, please do 'delete_database({self.db},{self.team})' instead."
@@ -1069,21 +1398,18 @@ class Client:
         if team is None:
             warnings.warn(
                 f"Delete Database Warning: You have not specify the team, assuming {self.team}/{self.db}",
-                stacklevel=2,
+                stacklevel=3,
             )
         else:
             self.team = team
         payload = {}
         if force:
             payload["force"] = "true"
-        _finish_response(
-            self._session.delete(
-                self._db_url(),
-                headers=self._default_headers,
-                auth=self._auth(),
-                params=payload,
-            )
-        )
+        return payload
+
+    def _database_deleted(self):
+        if self._document_cache is not None:
+            self._document_cache.invalidate((self.team, self.db))
         self.db = None
 
     def get_triples(self, graph_type: GraphType) -> str:
@@ -1109,7 +1435,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def update_triples(
         self, graph_type: GraphType, content: str, commit_msg: str
@@ -1136,13 +1462,15 @@ class Client:
             "commit_info": self._generate_commit(commit_msg),
             "turtle": content,
         }
-        result = self._session.post(
+        response = self._session.post(
             self._triples_url(graph_type),
             headers=self._default_headers,
             json=params,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        result = _finish_json(response)
+        self._documents_written(response, graph_type)
+        return result
 
     def insert_triples(
         self, graph_type: GraphType, content: str, commit_msg: Optional[str] = None
@@ -1165,13 +1493,15 @@ class Client:
         """
         self._check_connection()
         params = {"commit_info": self._generate_commit(commit_msg), "turtle": content}
-        result = self._session.put(
+        response = self._session.put(
             self._triples_url(graph_type),
             headers=self._default_headers,
             json=params,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        result = _finish_json(response)
+        self._documents_written(response, graph_type)
+        return result
 
     def query_document(
         self,
@@ -1181,6 +1511,7 @@ class Client:
         count: Optional[int] = None,
         as_list: bool = False,
         get_data_version: bool = False,
+        chunk_size: Optional[int] = None,
         **kwargs,
     ) -> Union[Iterable, list]:
         """Retrieves all documents that match a given document template
@@ -1195,6 +1526,8 @@ class Client:
             If the result returned as list rather than an iterator.
         get_data_version : bool
             If the data version of the document(s) should be obtained. If True, the method return the result and the version as a tuple.
+        chunk_size : int or None
+            Number of bytes read from the connection at a time when streaming the result, default to 64 KiB.
 
         Raises
         ------
@@ -1207,14 +1540,9 @@ class Client:
         """
         self._check_connection()
 
-        payload = {"query": document_template, "graph_type": graph_type}
-        payload["skip"] = skip
-        if count is not None:
-            payload["count"] = count
-        add_args = ["prefixed", "minimized", "unfold"]
-        for the_arg in add_args:
-            if the_arg in kwargs:
-                payload[the_arg] = kwargs[the_arg]
+        payload = self._query_document_payload(
+            document_template, graph_type, skip, count, kwargs
+        )
         headers = self._default_headers.copy()
         headers["X-HTTP-Method-Override"] = "GET"
         result = self._session.post(
@@ -1222,20 +1550,21 @@ class Client:
             headers=headers,
             json=payload,
             auth=self._auth(),
+            stream=True,
         )
-        if get_data_version:
-            result, version = _finish_response(result, get_data_version)
-            return_obj = _result2stream(result)
-            if as_list:
-                return list(return_obj), version
-            else:
-                return return_obj, version
+        return self._document_stream(result, as_list, get_data_version, chunk_size)
 
-        return_obj = _result2stream(_finish_response(result))
-        if as_list:
-            return list(return_obj)
-        else:
-            return return_obj
+    @staticmethod
+    def _query_document_payload(document_template, graph_type, skip, count, kwargs):
+        payload = {"query": document_template, "graph_type": graph_type}
+        payload["skip"] = skip
+        if count is not None:
+            payload["count"] = count
+        add_args = ["prefixed", "minimized", "unfold"]
+        for the_arg in add_args:
+            if the_arg in kwargs:
+                payload[the_arg] = kwargs[the_arg]
+        return payload
 
     def get_document(
         self,
@@ -1266,25 +1595,232 @@ class Client:
         -------
         dict
         """
-        add_args = ["prefixed", "minimized", "unfold"]
         self._check_connection()
-        payload = {"id": iri_id, "graph_type": graph_type}
-        for the_arg in add_args:
-            if the_arg in kwargs:
-                payload[the_arg] = kwargs[the_arg]
+        cache = self._document_cache
+        if cache is not None:
+            branch = self._cache_branch()
+            key = cache.key(iri_id, graph_type, self._document_flags(kwargs))
+            cached = cache.get(branch, key)
+            if cached is not None:
+                document = json_codec.loads(cached[0])
+                return (document, cached[1]) if get_data_version else document
+            generation = cache.generation(branch)
 
         result = self._session.get(
             self._documents_url(),
             headers=self._default_headers,
-            params=payload,
+            params=self._get_document_payload(iri_id, graph_type, kwargs),
             auth=self._auth(),
         )
 
+        if cache is not None:
+            document, version = _finish_json(result, True)
+            cache.put(branch, key, result.content, version, generation)
+            return (document, version) if get_data_version else document
+
         if get_data_version:
-            result, version = _finish_response(result, get_data_version)
-            return json.loads(result), version
+            return _finish_json(result, get_data_version)
+
+        return _finish_json(result)
+
+    @staticmethod
+    def _document_flags(kwargs):
+        return tuple(
+            (flag, kwargs[flag])
+            for flag in ("prefixed", "minimized", "unfold")
+            if flag in kwargs
+        )
+
+    def _cache_branch(self, branch: Optional[str] = None):
+        """Key of the branch (or commit) of the client in the document cache"""
+        if self.ref and branch is None:
+            return (self.team, self.db, self.repo, "commit", self.ref)
+        return (self.team, self.db, self.repo, "branch", branch or self.branch)
+
+    def _cache_generation(self):
+        """Generation of the branch in the document cache, taken before a read"""
+        if self._document_cache is not None:
+            return self._document_cache.generation(self._cache_branch())
+
+    def _documents_written(self, response, graph_type=None, ids=None, branch=None):
+        """Drop the cached documents written by a request, all the branch ones if `ids` is None"""
+        if self._document_cache is not None:
+            self._document_cache.written(
+                self._cache_branch(branch),
+                graph_type,
+                ids if isinstance(ids, list) else None,
+                response.headers.get("Terminusdb-Data-Version"),
+            )
+
+    @staticmethod
+    def _get_document_payload(iri_id, graph_type, kwargs):
+        add_args = ["prefixed", "minimized", "unfold"]
+        payload = {"id": iri_id, "graph_type": graph_type}
+        for the_arg in add_args:
+            if the_arg in kwargs:
+                payload[the_arg] = kwargs[the_arg]
+        return payload
+
+    def get_documents(
+        self,
+        ids: Iterable,
+        graph_type: GraphType = GraphType.INSTANCE,
+        batch_size: int = 1000,
+        workers: int = 1,
+        missing: Any = None,
+        chunk_size: Optional[int] = None,
+        **kwargs,
+    ) -> list:
+        """Retrieves the documents of many ids in a few requests
+
+        The ids are split in batches of `batch_size`, each retrieved with one
+        request and decoded as it is streamed. When a batch contains an id
+        that does not exist, the batch is split in halves to find it.
 
-        return json.loads(_finish_response(result))
+        Parameters
+        ----------
+        ids : iterable of str
+            Iri ids of the documents to retrieve
+        graph_type : GraphType
+            Graph type, either GraphType.INSTANCE or GraphType.SCHEMA.
+        batch_size : int
+            Maximum number of ids in a request, default to be 1000.
+        workers : int
+            Number of requests sent in parallel, default to be 1.
+        missing : any
+            Put in place of the documents that do not exist, default to be None.
+        chunk_size : int, optional
+            Number of bytes read from the socket at a time, default to 64 KiB.
+        kwargs :
+            Additional boolean flags for retriving. Currently avaliable: "prefixed", "minimized", "unfold"
+
+        Raises
+        ------
+        InterfaceError
+            if the client does not connect to a database
+
+        Returns
+        -------
+        list
+            Documents in the order of `ids`, with `missing` for the ids that do not exist.
+
+        Examples
+        --------
+        >>> client = Client("http://127.0.0.1:6363/")
+        >>> client.connect(db="example_db")
+        >>> client.get_documents(["Person/Jane", "Person/Nobody"])
+        [{'@id': 'Person/Jane', '@type': 'Person', 'name': 'Jane'}, None]
+        """
+        self._check_connection()
+        if batch_size < 1:
+            raise ValueError("batch_size needs to be at least 1.")
+        ids = list(ids)
+        found, wanted = self._cached_documents(ids, graph_type, kwargs)
+        generation = self._cache_generation()
+        batches = [
+            wanted[start : start + batch_size]
+            for start in range(0, len(wanted), batch_size)
+        ]
+
+        def fetch(batch):
+            return self._get_document_batch(
+                batch, graph_type, kwargs, chunk_size, generation
+            )
+
+        if workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for batch_found in executor.map(fetch, batches):
+                    found.update(batch_found)
+        else:
+            for batch in batches:
+                found.update(fetch(batch))
+        return [found.get(_document_id(doc_id), missing) for doc_id in ids]
+
+    def _get_document_batch(self, ids, graph_type, kwargs, chunk_size, generation):
+        """Documents of a batch of ids by id, without the ids that do not exist"""
+        result = self._session.post(
+            self._documents_url(),
+            headers=self._get_documents_headers(),
+            json=self._get_documents_payload(ids, graph_type, kwargs),
+            auth=self._auth(),
+            stream=True,
+        )
+        try:
+            documents, version = _finish_document_stream(result, True, chunk_size)
+        except DatabaseError as exception:
+            if not self._is_document_not_found(exception):
+                raise exception
+            if len(ids) == 1:
+                return {}
+            middle = len(ids) // 2
+            found = {}
+            for half in (ids[:middle], ids[middle:]):
+                found.update(
+                    self._get_document_batch(
+                        half, graph_type, kwargs, chunk_size, generation
+                    )
+                )
+            return found
+        with DocumentStream(result, documents) as stream:
+            return self._found_documents(
+                stream, graph_type, kwargs, version, generation
+            )
+
+    def _get_documents_headers(self):
+        headers = self._default_headers.copy()
+        headers["X-HTTP-Method-Override"] = "GET"
+        return headers
+
+    @staticmethod
+    def _get_documents_payload(ids, graph_type, kwargs):
+        payload = {"ids": ids, "graph_type": graph_type, "as_list": False}
+        for flag, value in Client._document_flags(kwargs):
+            payload[flag] = value
+        return payload
+
+    def _cached_documents(self, ids, graph_type, kwargs):
+        """Documents of `ids` found in the cache by id, and the (distinct) ids to retrieve"""
+        found = {}
+        wanted = []
+        cache = self._document_cache
+        if cache is not None:
+            branch = self._cache_branch()
+            flags = self._document_flags(kwargs)
+        seen = set()
+        for doc_id in ids:
+            key = _document_id(doc_id)
+            if key in seen:
+                continue
+            seen.add(key)
+            if cache is not None:
+                cached = cache.get(branch, cache.key(doc_id, graph_type, flags))
+                if cached is not None:
+                    found[key] = json_codec.loads(cached[0])
+                    continue
+            wanted.append(doc_id)
+        return found, wanted
+
+    def _found_documents(self, documents, graph_type, kwargs, version, generation):
+        """Documents retrieved by id, cached if there is a document cache"""
+        found = {}
+        cache = self._document_cache
+        if cache is not None:
+            branch = self._cache_branch()
+            flags = self._document_flags(kwargs)
+        for document in documents:
+            doc_id = document.get("@id")
+            if doc_id is None:
+                continue
+            found[_document_id(doc_id)] = document
+            if cache is not None:
+                cache.put(
+                    branch,
+                    cache.key(doc_id, graph_type, flags),
+                    json_codec.dumps(document),
+                    version,
+                    generation,
+                )
+        return found
 
     def get_documents_by_type(
         self,
@@ -1313,7 +1849,7 @@ class Client:
         get_data_version : bool
             If the version of the document(s) should be obtained. If True, the method return the result and the version as a tuple.
         kwargs :
-            Additional boolean flags for retriving. Currently avaliable: "prefixed", "unfold"
+            Additional boolean flags for retriving. Currently avaliable: "prefixed", "unfold". `chunk_size` is passed on to `get_all_documents`.
 
         Raises
         ------
@@ -1323,7 +1859,7 @@ class Client:
         Returns
         -------
         iterable
-            Stream of dictionaries
+            Stream of dictionaries, as a DocumentStream which releases the connection when exhausted or closed
         """
         return self.get_all_documents(
             graph_type,
@@ -1343,6 +1879,7 @@ class Client:
         as_list: bool = False,
         get_data_version: bool = False,
         doc_type: Optional[str] = None,
+        chunk_size: Optional[int] = None,
         **kwargs,
     ) -> Union[Iterable, list, tuple]:
         """Retrieves all avalibale the documents
@@ -1359,6 +1896,10 @@ class Client:
             If the result returned as list rather than an iterator.
         get_data_version : bool
             If the version of the document(s) should be obtained. If True, the method return the result and the version as a tuple.
+        doc_type : str or None
+            Only retrieve the documents of this type.
+        chunk_size : int or None
+            Number of bytes read from the connection at a time when streaming the result, default to 64 KiB.
         kwargs :
             Additional boolean flags for retriving. Currently avaliable: "prefixed", "unfold"
 
@@ -1370,10 +1911,23 @@ class Client:
         Returns
         -------
         iterable
-            Stream of dictionaries
+            Stream of dictionaries, as a DocumentStream which releases the connection when exhausted or closed
         """
-        add_args = ["prefixed", "unfold"]
         self._check_connection()
+        result = self._session.get(
+            self._documents_url(),
+            headers=self._default_headers,
+            params=self._all_documents_payload(
+                graph_type, skip, count, doc_type, kwargs
+            ),
+            auth=self._auth(),
+            stream=True,
+        )
+        return self._document_stream(result, as_list, get_data_version, chunk_size)
+
+    @staticmethod
+    def _all_documents_payload(graph_type, skip, count, doc_type, kwargs):
+        add_args = ["prefixed", "unfold"]
         payload = _args_as_payload(
             {
                 "graph_type": graph_type,
@@ -1385,26 +1939,24 @@ class Client:
         for the_arg in add_args:
             if the_arg in kwargs:
                 payload[the_arg] = kwargs[the_arg]
-        result = self._session.get(
-            self._documents_url(),
-            headers=self._default_headers,
-            params=payload,
-            auth=self._auth(),
-        )
+        return payload
 
+    def _document_stream(
+        self, result, as_list=False, get_data_version=False, chunk_size=None
+    ):
+        """Decode a streamed document response into a DocumentStream or a list"""
         if get_data_version:
-            result, version = _finish_response(result, get_data_version)
-            return_obj = _result2stream(result)
-            if as_list:
-                return list(return_obj), version
-            else:
-                return return_obj, version
-
-        return_obj = _result2stream(_finish_response(result))
-        if as_list:
-            return list(return_obj)
+            documents, version = _finish_document_stream(
+                result, get_data_version, chunk_size
+            )
         else:
-            return return_obj
+            documents = _finish_document_stream(result, chunk_size=chunk_size)
+        return_obj = DocumentStream(result, documents)
+        if as_list:
+            return_obj = list(return_obj)
+        if get_data_version:
+            return return_obj, version
+        return return_obj
 
     def get_existing_classes(self):
         """Get all the existing classes (only ids) in a database."""
@@ -1415,7 +1967,55 @@ class Client:
                 all_existing_class[item["@id"]] = item
         return all_existing_class
 
+    def export_arrow(self, doc_type: str, batch_size: int = 10000, **kwargs):
+        """Export the documents of a class as typed Arrow record batches
+
+        The documents are streamed from the server and converted as the batches
+        are read. Datatypes follow the schema of the class (see `woql_type`),
+        timestamps are kept as timestamps and the properties of subdocuments
+        are in dotted columns. Requires `pyarrow`.
+
+        Parameters
+        ----------
+        doc_type : str
+            Class of the documents to export
+        batch_size : int
+            Maximum number of rows in a record batch, default to be 10000.
+        kwargs :
+            Additional boolean flags for retriving. Currently avaliable: "prefixed", "unfold"
+
+        Raises
+        ------
+        InterfaceError
+            if the client does not connect to a database or the class is not in the schema
+
+        Returns
+        -------
+        pyarrow.RecordBatchReader
+
+        Examples
+        --------
+        >>> import pyarrow.parquet as pq
+        >>> client = Client("http://127.0.0.1:6363/")
+        >>> client.connect(db="example_db")
+        >>> batches = client.export_arrow("Person")
+        >>> with pq.ParquetWriter("Person.parquet", batches.schema) as writer:
+        ...     for batch in batches:
+        ...         writer.write_batch(batch)
+        """
+        self._check_connection()
+        all_existing_class = self.get_existing_classes()
+        if doc_type not in all_existing_class:
+            raise InterfaceError(f"{doc_type} not found in database ({self.db}) schema.")
+        return to_record_batches(
+            self.get_documents_by_type(doc_type, **kwargs),
+            all_existing_class,
+            doc_type,
+            batch_size,
+        )
+
     def _conv_to_dict(self, obj):
+        """Convert a document to a dict"""
         if isinstance(obj, dict):
             return _clean_dict(obj)
         elif hasattr(obj, "to_dict"):
@@ -1424,46 +2024,99 @@ class Client:
             if hasattr(obj, "_isinstance") and obj._isinstance:
                 if hasattr(obj.__class__, "_subdocument"):
                     raise ValueError("Subdocument cannot be added directly")
-                (d, refs) = obj._obj_to_dict()
-                # merge all refs
-                self._references = {**self._references, **refs}
+                (d, _) = obj._obj_to_dict()
                 return d
             else:
                 return obj._to_dict()
         else:
             raise ValueError("Object cannot convert to dictionary")
 
-    def _unseen(self, seen):
-        unseen = []
-        for key in self._references:
-            if key not in seen:
-                unseen.append(self._references[key])
-        return unseen
-
     def _convert_document(self, document, graph_type):
-        if not isinstance(document, list):
+        """Convert documents to dicts, with the objects they reference.
+
+        Each captured object is converted once, see `_iter_convert_document`."""
+        return [
+            item_dict
+            for _, item_dict in self._iter_convert_document(document, graph_type)
+        ]
+
+    def _iter_convert_document(self, document, graph_type, seen=None, wait=None):
+        """Convert documents one at a time, yielding (object, dict) pairs.
+
+        The objects are walked with a worklist: the objects referenced by a
+        document are yielded right after it, in the order they are referenced,
+        and every captured object is converted and yielded only once across
+        the whole stream (or across all the calls sharing the `seen` set), so
+        the conversion is linear in the size of the object graph.
+
+        `wait` is called with the capture and the object of each object
+        referenced by a document that was converted before (in `seen`) or that
+        has an id now. If it returns True for any of them, their ids have been
+        set meanwhile and the document is converted again to refer to them by
+        id."""
+        if isinstance(document, dict) or hasattr(document, "_obj_to_dict"):
+            document = [document]
+        elif hasattr(document, "to_dict"):
             document = [document]
 
-        seen = {}
-        objects = []
-        while document != []:
-            for item in document:
+        if seen is None:
+            seen = set()
+        for top_item in document:
+            pending = [top_item]
+            while pending:
+                item = pending.pop()
+                capture = getattr(item, "_capture", None)
+                if capture is not None and capture in seen:
+                    continue
                 if hasattr(item, "to_dict") and graph_type != "schema":
                     raise InterfaceError(
                         "Inserting Schema object into non-schema graph."
                     )
-                item_dict = self._conv_to_dict(item)
-                if hasattr(item, "_capture"):
-                    seen[item._capture] = item_dict
+                if hasattr(item, "_obj_to_dict") and getattr(
+                    item, "_isinstance", False
+                ):
+                    if hasattr(item.__class__, "_subdocument"):
+                        raise ValueError("Subdocument cannot be added directly")
+                    (item_dict, refs) = item._obj_to_dict()
+                    if wait is not None and any(
+                        [
+                            wait(ref, obj)
+                            for ref, obj in refs.items()
+                            if ref in seen or hasattr(obj, "_backend_id")
+                        ]
+                    ):
+                        (item_dict, refs) = item._obj_to_dict()
+                    # popped from the end, keep the order of the references
+                    pending.extend(reversed(list(refs.values())))
                 else:
-                    if isinstance(item_dict, list):
-                        objects += item_dict
-                    else:
-                        objects.append(item_dict)
+                    item_dict = self._conv_to_dict(item)
+                if capture is not None:
+                    seen.add(capture)
+                if isinstance(item_dict, list):
+                    for sub_item in item_dict:
+                        yield item, sub_item
+                else:
+                    yield item, item_dict
 
-            document = self._unseen(seen)
+    def _document_stream_body(self, documents, headers, compress):
+        """Encode (object, dict) pairs as a chunked request body.
 
-        return list(seen.values()) + objects
+        Returns the body iterator and, by position in the request, weak
+        references to the DocumentTemplate objects that have no backend id yet."""
+        sent = {}
+
+        def dicts():
+            for idx, (item, item_dict) in enumerate(documents):
+                if hasattr(item, "_obj_to_dict") and not hasattr(item, "_backend_id"):
+                    sent[idx] = weakref.ref(item)
+                yield item_dict
+
+        body = _stream2chunks(dicts())
+        headers["Content-Type"] = "application/json"
+        if compress != "never":
+            headers["Content-Encoding"] = "gzip"
+            body = _gzip_chunks(body)
+        return body, sent
 
     def insert_document(
         self,
@@ -1480,6 +2133,7 @@ class Client:
         last_data_version: Optional[str] = None,
         compress: Union[str, int] = 1024,
         raw_json: bool = False,
+        stream: bool = False,
     ) -> None:
         """Inserts the specified document(s)
 
@@ -1499,6 +2153,8 @@ class Client:
             If it is an integer, size of the data larger than this (in bytes) will be compress with gzip in the request (assume encoding as UTF-8, 0 = always compress). If it is `never` it will never compress the data.
         raw_json : bool
             Update as raw json
+        stream : bool
+            If True, `document` can be any iterable (e.g. a generator) of documents. They are converted, encoded and gzip compressed one at a time and sent with chunked transfer encoding as a single commit, so memory use does not grow with the number of documents. Any `compress` other than `never` always compresses the stream.
 
         Raises
         ------
@@ -1511,6 +2167,37 @@ class Client:
             list of ids of the inseted docuemnts
         """
         self._check_connection()
+        params, headers = self._insert_params(
+            graph_type, full_replace, commit_msg, last_data_version, raw_json
+        )
+        new_doc, objects = self._prepare_insert(
+            document, graph_type, full_replace, stream
+        )
+        if new_doc is None:
+            return
+
+        if stream:
+            body, objects = self._document_stream_body(new_doc, headers, compress)
+            body = {"data": body}
+        else:
+            body = self._document_body(new_doc, headers, compress)
+        response = self._session.post(
+            self._documents_url(),
+            headers=headers,
+            params=params,
+            auth=self._auth(),
+            **body,
+        )
+        result = _finish_json(response)
+        self._documents_written(
+            response, graph_type, None if full_replace else result
+        )
+        self._set_backend_ids(objects, result)
+        return result
+
+    def _insert_params(
+        self, graph_type, full_replace, commit_msg, last_data_version, raw_json
+    ):
         params = self._generate_commit(commit_msg)
         params["graph_type"] = graph_type
         if full_replace:
@@ -1522,55 +2209,76 @@ class Client:
         headers = self._default_headers.copy()
         if last_data_version is not None:
             headers["TerminusDB-Data-Version"] = last_data_version
-
-        # make sure we track only internal references
-        self._references = {}
-        new_doc = self._convert_document(document, graph_type)
-        all_docs = list(self._references.values())
-        self._references = {}
-
-        if len(new_doc) == 0:
-            return
+        return params, headers
+
+    def _prepare_insert(self, document, graph_type, full_replace, stream):
+        """Convert the documents to insert and check the context object.
+
+        Returns the converted documents (an iterator of (object, dict) pairs
+        if `stream`) and the DocumentTemplate objects waiting for a backend id
+        by position, or (None, None) if there is nothing to insert."""
+        if stream:
+            new_doc = self._iter_convert_document(document, graph_type)
+            first_doc = next(new_doc, None)
+            if first_doc is None:
+                return None, None
+            new_doc = itertools.chain([first_doc], new_doc)
+            first_doc = first_doc[1]
+            objects = None
+        else:
+            new_doc, objects = self._convert_documents(document, graph_type)
+            if len(new_doc) == 0:
+                return None, None
+            first_doc = new_doc[0]
 
         if full_replace:
-            if new_doc[0].get("@type") != "@context":
+            if first_doc.get("@type") != "@context":
                 raise ValueError(
                     "The first item in docuemnt need to be dictionary representing the context object."
                 )
         else:
-            if new_doc[0].get("@type") == "@context":
+            if first_doc.get("@type") == "@context":
                 warnings.warn(
                     "To replace context, need to use `full_replace` or `replace_document`, skipping context object now.",
-                    stacklevel=2,
+                    stacklevel=3,
                 )
-                new_doc.pop(0)
-
-        json_string = json.dumps(new_doc).encode("utf-8")
+                if stream:
+                    next(new_doc)
+                else:
+                    new_doc.pop(0)
+                    # the positions are in the documents sent, after the context
+                    objects = {idx - 1: item for idx, item in objects.items()}
+        return new_doc, objects
+
+    def _convert_documents(self, document, graph_type):
+        """Convert the documents and collect the DocumentTemplate objects waiting for a backend id"""
+        new_doc = []
+        objects = {}
+        for item, item_dict in self._iter_convert_document(document, graph_type):
+            if hasattr(item, "_obj_to_dict") and not hasattr(item, "_backend_id"):
+                objects[len(new_doc)] = item
+            new_doc.append(item_dict)
+        return new_doc, objects
+
+    @staticmethod
+    def _document_body(new_doc, headers, compress):
+        """Request arguments for the document body, gzip compressed if larger than `compress`"""
+        json_string = json_codec.dumps(new_doc)
         if compress != "never" and len(json_string) > compress:
             headers.update(
                 {"Content-Encoding": "gzip", "Content-Type": "application/json"}
             )
-            result = self._session.post(
-                self._documents_url(),
-                headers=headers,
-                params=params,
-                data=gzip.compress(json_string),
-                auth=self._auth(),
-            )
-        else:
-            result = self._session.post(
-                self._documents_url(),
-                headers=headers,
-                params=params,
-                json=new_doc,
-                auth=self._auth(),
-            )
-        result = json.loads(_finish_response(result))
-        if isinstance(all_docs, list):
-            for idx, item in enumerate(all_docs):
-                if hasattr(item, "_obj_to_dict") and not hasattr(item, "_backend_id"):
-                    item._backend_id = result[idx]
-        return result
+            return {"data": gzip.compress(json_string)}
+        return {"json": new_doc}
+
+    @staticmethod
+    def _set_backend_ids(objects, result, prefix=""):
+        """Record the ids given by the server on the inserted DocumentTemplate objects"""
+        for idx, item in objects.items():
+            if isinstance(item, weakref.ref):
+                item = item()
+            if item is not None:
+                item._backend_id = result[idx][len(prefix) :]
 
     def replace_document(
         self,
@@ -1587,6 +2295,7 @@ class Client:
         compress: Union[str, int] = 1024,
         create: bool = False,
         raw_json: bool = False,
+        stream: bool = False,
     ) -> dict:
         """Updates the specified document(s)
 
@@ -1606,13 +2315,40 @@ class Client:
             Create the document if it does not yet exist.
         raw_json : bool
             Update as raw json
+        stream : bool
+            If True, `document` can be any iterable (e.g. a generator) of documents. They are converted, encoded and gzip compressed one at a time and sent with chunked transfer encoding as a single commit, so memory use does not grow with the number of documents. Any `compress` other than `never` always compresses the stream.
+
+        Raises
+        ------
+        InterfaceError
+            if the client does not connect to a database
+        """
+        self._check_connection()
+        params, headers = self._replace_params(
+            graph_type, commit_msg, last_data_version, create, raw_json
+        )
+
+        if stream:
+            body, objects = self._document_stream_body(
+                self._iter_convert_document(document, graph_type), headers, compress
+            )
+            body = {"data": body}
+        else:
+            new_doc, objects = self._convert_documents(document, graph_type)
+            body = self._document_body(new_doc, headers, compress)
+        response = self._session.put(
+            self._documents_url(),
+            headers=headers,
+            params=params,
+            auth=self._auth(),
+            **body,
+        )
+        result = _finish_json(response)
+        self._documents_written(response, graph_type, result)
+        self._set_backend_ids(objects, result, "terminusdb:///data/")
+        return result
 
-        Raises
-        ------
-        InterfaceError
-            if the client does not connect to a database
-        """
-        self._check_connection()
+    def _replace_params(self, graph_type, commit_msg, last_data_version, create, raw_json):
         params = self._generate_commit(commit_msg)
         params["graph_type"] = graph_type
         params["create"] = "true" if create else "false"
@@ -1621,38 +2357,7 @@ class Client:
         headers = self._default_headers.copy()
         if last_data_version is not None:
             headers["TerminusDB-Data-Version"] = last_data_version
-
-        self._references = {}
-        new_doc = self._convert_document(document, graph_type)
-        all_docs = list(self._references.values())
-        self._references = {}
-
-        json_string = json.dumps(new_doc).encode("utf-8")
-        if compress != "never" and len(json_string) > compress:
-            headers.update(
-                {"Content-Encoding": "gzip", "Content-Type": "application/json"}
-            )
-            result = self._session.put(
-                self._documents_url(),
-                headers=headers,
-                params=params,
-                data=gzip.compress(json_string),
-                auth=self._auth(),
-            )
-        else:
-            result = self._session.put(
-                self._documents_url(),
-                headers=headers,
-                params=params,
-                json=new_doc,
-                auth=self._auth(),
-            )
-        result = json.loads(_finish_response(result))
-        if isinstance(all_docs, list):
-            for idx, item in enumerate(all_docs):
-                if hasattr(item, "_obj_to_dict") and not hasattr(item, "_backend_id"):
-                    item._backend_id = result[idx][len("terminusdb:///data/") :]
-        return result
+        return params, headers
 
     def update_document(
         self,
@@ -1667,6 +2372,7 @@ class Client:
         commit_msg: Optional[str] = None,
         last_data_version: Optional[str] = None,
         compress: Union[str, int] = 1024,
+        stream: bool = False,
     ) -> None:
         """Updates the specified document(s). Add the document if not existed.
 
@@ -1682,6 +2388,8 @@ class Client:
             Last version before the update, used to check if the document has been changed unknowingly
         compress : str or int
             If it is an integer, size of the data larger than this (in bytes) will be compress with gzip in the request (assume encoding as UTF-8, 0 = always compress). If it is `never` it will never compress the data.
+        stream : bool
+            Upload an iterable of documents as a chunked stream, see `replace_document`.
 
         Raises
         ------
@@ -1689,8 +2397,78 @@ class Client:
             if the client does not connect to a database
         """
         self.replace_document(
-            document, graph_type, commit_msg, last_data_version, compress, True
+            document,
+            graph_type,
+            commit_msg,
+            last_data_version,
+            compress,
+            True,
+            stream=stream,
+        )
+
+    def bulk_insert(
+        self,
+        documents: Iterable,
+        batch_size: int = 1000,
+        batch_bytes: Optional[int] = None,
+        graph_type: GraphType = GraphType.INSTANCE,
+        commit_msg: Optional[str] = None,
+        compress: Union[str, int] = 1024,
+        replace: bool = False,
+        create: bool = False,
+        raw_json: bool = False,
+        on_batch=None,
+    ) -> list:
+        """Inserts (or replaces) a stream of documents in batches, one commit per batch.
+
+        The next batch is encoded and compressed on a worker thread while the current one is being uploaded. See `BulkLoader` for details.
+
+        Parameters
+        ----------
+        documents : iterable
+            Dicts or DocumentTemplate objects, can be a generator.
+        batch_size : int
+            Maximum number of documents in a batch, default to be 1000.
+        batch_bytes : int, optional
+            Maximum size (in bytes) of the JSON encoding of a batch.
+        graph_type : GraphType
+            Graph type, either GraphType.INSTANCE or GraphType.SCHEMA.
+        commit_msg : str
+            Commit message used for every batch.
+        compress : str or int
+            If it is an integer, batches larger than this (in bytes) are compressed with gzip. If it is `never` they are never compressed.
+        replace : bool
+            Replace the documents (as `replace_document`) instead of inserting them.
+        create : bool
+            With `replace`, create the documents that do not exist yet.
+        raw_json : bool
+            Load as raw json
+        on_batch : callable, optional
+            Called with a report dict (documents, bytes, seconds, docs_per_second, mb_per_second) after each batch is committed.
+
+        Raises
+        ------
+        InterfaceError
+            if the client does not connect to a database
+
+        Returns
+        -------
+        list
+            list of ids of the loaded documents
+        """
+        loader = BulkLoader(
+            self,
+            batch_size=batch_size,
+            batch_bytes=batch_bytes,
+            graph_type=graph_type,
+            commit_msg=commit_msg,
+            compress=compress,
+            replace=replace,
+            create=create,
+            raw_json=raw_json,
+            on_batch=on_batch,
         )
+        return loader.load(documents)
 
     def delete_document(
         self,
@@ -1718,6 +2496,27 @@ class Client:
             if the client does not connect to a database
         """
         self._check_connection()
+        doc_id = self._document_ids(document)
+        params = self._generate_commit(commit_msg)
+        params["graph_type"] = graph_type
+
+        headers = self._default_headers.copy()
+        if last_data_version is not None:
+            headers["TerminusDB-Data-Version"] = last_data_version
+
+        response = self._session.delete(
+            self._documents_url(),
+            headers=headers,
+            params=params,
+            json=doc_id,
+            auth=self._auth(),
+        )
+        _finish_response(response)
+        self._documents_written(response, graph_type, doc_id)
+
+    @staticmethod
+    def _document_ids(document):
+        """Ids of the document(s) given as ids, dicts or DocumentTemplate objects"""
         doc_id = []
         if not isinstance(document, (str, list, dict)) and hasattr(
             document, "__iter__"
@@ -1732,22 +2531,7 @@ class Client:
                 doc_id.append(doc.get("@id"))
             elif isinstance(doc, str):
                 doc_id.append(doc)
-        params = self._generate_commit(commit_msg)
-        params["graph_type"] = graph_type
-
-        headers = self._default_headers.copy()
-        if last_data_version is not None:
-            headers["TerminusDB-Data-Version"] = last_data_version
-
-        _finish_response(
-            self._session.delete(
-                self._documents_url(),
-                headers=headers,
-                params=params,
-                json=doc_id,
-                auth=self._auth(),
-            )
-        )
+        return doc_id
 
     def has_doc(self, doc_id: str, graph_type: GraphType = GraphType.INSTANCE) -> bool:
         """Check if a certain document exist in a database
@@ -1781,15 +2565,19 @@ class Client:
             _finish_response(response)
             return True
         except DatabaseError as exception:
-            body = exception.error_obj
-            if (
-                exception.status_code == 404
-                and "api:error" in body
-                and body["api:error"]["@type"] == "api:DocumentNotFound"
-            ):
+            if self._is_document_not_found(exception):
                 return False
             raise exception
 
+    @staticmethod
+    def _is_document_not_found(exception):
+        body = exception.error_obj
+        return (
+            exception.status_code == 404
+            and "api:error" in body
+            and body["api:error"]["@type"] == "api:DocumentNotFound"
+        )
+
     def get_class_frame(self, class_name):
         """Get the frame of the class of class_name. Provide information about all the avaliable properties of that class.
 
@@ -1811,7 +2599,7 @@ class Client:
             params=opts,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def commit(self):
         """Not implementated: open transactions currently not suportted. Please check back later."""
@@ -1854,19 +2642,12 @@ class Client:
         dict
         """
         self._check_connection()
-        query_obj = {"commit_info": self._generate_commit(commit_msg)}
-        if isinstance(woql_query, WOQLQuery):
-            request_woql_query = woql_query.to_dict()
-        else:
-            request_woql_query = woql_query
-        query_obj["query"] = request_woql_query
-        query_obj["streaming"] = streaming
-
-        headers = self._default_headers.copy()
-        if last_data_version is not None:
-            headers["TerminusDB-Data-Version"] = last_data_version
+        query_obj, headers = self._query_request(
+            woql_query, commit_msg, last_data_version, streaming
+        )
+        generation = self._cache_generation()
 
-        result = self._session.post(
+        response = self._session.post(
             self._query_url(),
             headers=headers,
             json=query_obj,
@@ -1875,14 +2656,38 @@ class Client:
         )
 
         if streaming:
-            return WoqlResult(lines=_finish_response(result, streaming=True))
+            if self._document_cache is not None:
+                # the bindings do not tell whether the query wrote
+                self._documents_written(response)
+            return WoqlResult(lines=_finish_response(response, streaming=True))
 
-        if get_data_version:
-            result, version = _finish_response(result, get_data_version)
-            result = json.loads(result)
+        if get_data_version or self._document_cache is not None:
+            result, version = _finish_json(response, True)
+        else:
+            result, version = _finish_json(response), None
+        if self._document_cache is not None:
+            if result.get("inserts") or result.get("deletes"):
+                self._documents_written(response)
+            else:
+                self._document_cache.observe(self._cache_branch(), version, generation)
+        return self._query_result(result, get_data_version, version)
+
+    def _query_request(self, woql_query, commit_msg, last_data_version, streaming):
+        query_obj = {"commit_info": self._generate_commit(commit_msg)}
+        if isinstance(woql_query, WOQLQuery):
+            request_woql_query = woql_query.to_dict()
         else:
-            result = json.loads(_finish_response(result))
+            request_woql_query = woql_query
+        query_obj["query"] = request_woql_query
+        query_obj["streaming"] = streaming
+
+        headers = self._default_headers.copy()
+        if last_data_version is not None:
+            headers["TerminusDB-Data-Version"] = last_data_version
+        return query_obj, headers
 
+    @staticmethod
+    def _query_result(result, get_data_version=False, version=None):
         if result.get("inserts") or result.get("deletes"):
             return "Commit successfully made."
         elif get_data_version:
@@ -1906,24 +2711,25 @@ class Client:
             if the client does not connect to a database
         """
         self._check_connection()
-        if empty:
-            source = {}
-        elif self.ref:
-            source = {"origin": f"{self.team}/{self.db}/{self.repo}/commit/{self.ref}"}
-        else:
-            source = {
-                "origin": f"{self.team}/{self.db}/{self.repo}/branch/{self.branch}"
-            }
-
         _finish_response(
             self._session.post(
                 self._branch_url(new_branch_id),
                 headers=self._default_headers,
-                json=source,
+                json=self._branch_source(empty),
                 auth=self._auth(),
             )
         )
 
+    def _branch_source(self, empty):
+        if empty:
+            return {}
+        elif self.ref:
+            return {"origin": f"{self.team}/{self.db}/{self.repo}/commit/{self.ref}"}
+        else:
+            return {
+                "origin": f"{self.team}/{self.db}/{self.repo}/branch/{self.branch}"
+            }
+
     def delete_branch(self, branch_id: str) -> None:
         """Delete a branch
 
@@ -1982,30 +2788,32 @@ class Client:
         >>> client.pull()
         """
         self._check_connection()
+        response = self._session.post(
+            self._pull_url(),
+            headers=self._default_headers,
+            json=self._pull_args(remote, remote_branch, message, author),
+            auth=self._auth(),
+        )
+        result = _finish_json(response)
+        self._documents_written(response)
+        return result
+
+    def _pull_args(self, remote, remote_branch, message, author):
         if remote_branch is None:
             remote_branch = self.branch
         if author is None:
-            author = self.author
+            author = self._author
         if message is None:
             message = (
                 f"Pulling from {remote}/{remote_branch} by Python client {__version__}"
             )
-        rc_args = {
+        return {
             "remote": remote,
             "remote_branch": remote_branch,
             "author": author,
             "message": message,
         }
 
-        result = self._session.post(
-            self._pull_url(),
-            headers=self._default_headers,
-            json=rc_args,
-            auth=self._auth(),
-        )
-
-        return json.loads(_finish_response(result))
-
     def fetch(
         self,
         remote_id: str,
@@ -2030,7 +2838,7 @@ class Client:
             auth=self._auth(),
         )
 
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def push(
         self,
@@ -2069,6 +2877,16 @@ class Client:
         dict
         """
         self._check_connection()
+        result = self._session.post(
+            self._push_url(),
+            headers=self._remote_headers(remote_auth),
+            json=self._push_args(remote, remote_branch, message, author),
+            auth=self._auth(),
+        )
+
+        return _finish_json(result)
+
+    def _push_args(self, remote, remote_branch, message, author):
         if remote_branch is None:
             remote_branch = self.branch
         if author is None:
@@ -2077,12 +2895,15 @@ class Client:
             message = (
                 f"Pushing to {remote}/{remote_branch} by Python client {__version__}"
             )
-        rc_args = {
+        return {
             "remote": remote,
             "remote_branch": remote_branch,
             "author": author,
             "message": message,
         }
+
+    def _remote_headers(self, remote_auth):
+        """Headers of a request to a remote, with the remote authorization if any"""
         headers = {}
         if self._remote_auth_dict or remote_auth:
             headers["Authorization-Remote"] = (
@@ -2091,15 +2912,7 @@ class Client:
                 else self._remote_auth()
             )
         headers.update(self._default_headers)
-
-        result = self._session.post(
-            self._push_url(),
-            headers=headers,
-            json=rc_args,
-            auth=self._auth(),
-        )
-
-        return json.loads(_finish_response(result))
+        return headers
 
     def rebase(
         self,
@@ -2141,7 +2954,17 @@ class Client:
         >>> client.rebase("the_branch")
         """
         self._check_connection()
+        response = self._session.post(
+            self._rebase_url(),
+            headers=self._default_headers,
+            json=self._rebase_args(branch, commit, rebase_source, message, author),
+            auth=self._auth(),
+        )
+        result = _finish_json(response)
+        self._documents_written(response)
+        return result
 
+    def _rebase_args(self, branch, commit, rebase_source, message, author):
         if branch is not None and commit is None:
             rebase_source = "/".join([self.team, self.db, self.repo, "branch", branch])
         elif branch is None and commit is not None:
@@ -2157,16 +2980,7 @@ class Client:
             author = self._author
         if message is None:
             message = f"Rebase from {rebase_source} by Python client {__version__}"
-        rc_args = {"rebase_from": rebase_source, "author": author, "message": message}
-
-        result = self._session.post(
-            self._rebase_url(),
-            headers=self._default_headers,
-            json=rc_args,
-            auth=self._auth(),
-        )
-
-        return json.loads(_finish_response(result))
+        return {"rebase_from": rebase_source, "author": author, "message": message}
 
     def reset(
         self, commit: Optional[str] = None, soft: bool = False, use_path: bool = False
@@ -2199,6 +3013,21 @@ class Client:
         """
 
         self._check_connection()
+        commit_path = self._reset_commit_path(commit, soft, use_path)
+        if commit_path is None:
+            return None
+
+        response = self._session.post(
+            self._reset_url(),
+            headers=self._default_headers,
+            json={"commit_descriptor": commit_path},
+            auth=self._auth(),
+        )
+        _finish_response(response)
+        self._documents_written(response)
+
+    def _reset_commit_path(self, commit, soft, use_path):
+        """Set the ref for the reset, returns the commit path for a hard reset"""
         if soft:
             if use_path:
                 self._ref = commit.split("/")[-1]
@@ -2212,18 +3041,9 @@ class Client:
             return None
 
         if use_path:
-            commit_path = commit
+            return commit
         else:
-            commit_path = f"{self.team}/{self.db}/{self.repo}/commit/{commit}"
-
-        _finish_response(
-            self._session.post(
-                self._reset_url(),
-                headers=self._default_headers,
-                json={"commit_descriptor": commit_path},
-                auth=self._auth(),
-            )
-        )
+            return f"{self.team}/{self.db}/{self.repo}/commit/{commit}"
 
     def optimize(self, path: str) -> None:
         """Optimize the specified path.
@@ -2311,7 +3131,8 @@ class Client:
         # 'api:old_commit' : Old_Commit,
         # 'api:status' : "api:success"}
 
-        commit_id = json.loads(_finish_response(result)).get("api:commit")
+        commit_id = _finish_json(result).get("api:commit")
+        self._documents_written(result)
         if reset:
             self.reset(commit_id)
         return commit_id
@@ -2342,20 +3163,19 @@ class Client:
         """
         self._check_connection()
         branch = branch if branch else self.branch
-        return json.loads(
-            _finish_response(
-                self._session.post(
-                    self._apply_url(branch=branch),
-                    headers=self._default_headers,
-                    json={
-                        "commit_info": self._generate_commit(message, author),
-                        "before_commit": before_version,
-                        "after_commit": after_version,
-                    },
-                    auth=self._auth(),
-                )
-            )
+        response = self._session.post(
+            self._apply_url(branch=branch),
+            headers=self._default_headers,
+            json={
+                "commit_info": self._generate_commit(message, author),
+                "before_commit": before_version,
+                "after_commit": after_version,
+            },
+            auth=self._auth(),
         )
+        result = _finish_json(response)
+        self._documents_written(response, branch=branch)
+        return result
 
     def diff_object(self, before_object, after_object):
         """Diff two different objects.
@@ -2368,14 +3188,12 @@ class Client:
             After object to compare
         """
         self._check_connection(check_db=False)
-        return json.loads(
-            _finish_response(
-                self._session.post(
-                    self._diff_url(),
-                    headers=self._default_headers,
-                    json={"before": before_object, "after": after_object},
-                    auth=self._auth(),
-                )
+        return _finish_json(
+            self._session.post(
+                self._diff_url(),
+                headers=self._default_headers,
+                json={"before": before_object, "after": after_object},
+                auth=self._auth(),
             )
         )
 
@@ -2390,17 +3208,15 @@ class Client:
             Commit or branch of the after version to compare
         """
         self._check_connection(check_db=False)
-        return json.loads(
-            _finish_response(
-                self._session.post(
-                    self._diff_url(),
-                    headers=self._default_headers,
-                    json={
-                        "before_data_version": before_version,
-                        "after_data_version": after_version,
-                    },
-                    auth=self._auth(),
-                )
+        return _finish_json(
+            self._session.post(
+                self._diff_url(),
+                headers=self._default_headers,
+                json={
+                    "before_data_version": before_version,
+                    "after_data_version": after_version,
+                },
+                auth=self._auth(),
             )
         )
 
@@ -2443,24 +3259,7 @@ class Client:
         >>> result.to_json = '{ "name" : { "@op" : "SwapValue", "@before" : "Jane", "@after": "Janine" }}'
         """
 
-        request_dict = {}
-        for key, item in {"before": before, "after": after}.items():
-            if isinstance(item, str):
-                request_dict[f"{key}_data_version"] = item
-            else:
-                request_dict[key] = self._convert_diff_document(item)
-        if document_id is not None:
-            if "before_data_version" in request_dict:
-                if document_id[: len("terminusdb:///data")] == "terminusdb:///data":
-                    request_dict["document_id"] = document_id
-                else:
-                    raise ValueError(
-                        f"Valid document id starts with `terminusdb:///data`, but got {document_id}"
-                    )
-            else:
-                raise ValueError(
-                    "`document_id` can only be used in conjusction with a data version or commit ID as `before`, not a document object"
-                )
+        request_dict = self._diff_request(before, after, document_id)
         if self._connected:
             result = _finish_response(
                 self._session.post(
@@ -2480,6 +3279,27 @@ class Client:
             )
         return Patch(json=result)
 
+    def _diff_request(self, before, after, document_id):
+        request_dict = {}
+        for key, item in {"before": before, "after": after}.items():
+            if isinstance(item, str):
+                request_dict[f"{key}_data_version"] = item
+            else:
+                request_dict[key] = self._convert_diff_document(item)
+        if document_id is not None:
+            if "before_data_version" in request_dict:
+                if document_id[: len("terminusdb:///data")] == "terminusdb:///data":
+                    request_dict["document_id"] = document_id
+                else:
+                    raise ValueError(
+                        f"Valid document id starts with `terminusdb:///data`, but got {document_id}"
+                    )
+            else:
+                raise ValueError(
+                    "`document_id` can only be used in conjusction with a data version or commit ID as `before`, not a document object"
+                )
+        return request_dict
+
     def patch(
         self,
         before: Union[
@@ -2565,24 +3385,26 @@ class Client:
         >>> result = client.patch_resource(patch_obj,branch="main")
         >>> print(result)
         '["Person/Jane"]'"""
+        response = self._session.post(
+            self._branch_base("patch", branch),
+            headers=self._default_headers,
+            json=self._patch_resource_request(
+                patch, message, author, match_final_state
+            ),
+            auth=self._auth(),
+        )
+        result = _finish_json(response)
+        self._documents_written(response, branch=branch)
+        return result
+
+    def _patch_resource_request(self, patch, message, author, match_final_state):
         commit_info = self._generate_commit(message, author)
-        request_dict = {
+        return {
             "patch": patch.content,
             "message": commit_info["message"],
             "author": commit_info["author"],
             "match_final_state": match_final_state,
         }
-        patch_url = self._branch_base("patch", branch)
-
-        result = _finish_response(
-            self._session.post(
-                patch_url,
-                headers=self._default_headers,
-                json=request_dict,
-                auth=self._auth(),
-            )
-        )
-        return json.loads(result)
 
     def clonedb(
         self,
@@ -2617,21 +3439,12 @@ class Client:
         self._check_connection(check_db=False)
         if description is None:
             description = f"New database {newid}"
-
-        headers = {}
-        if self._remote_auth_dict or remote_auth:
-            headers["Authorization-Remote"] = (
-                self._generate_remote_header(remote_auth)
-                if remote_auth
-                else self._remote_auth()
-            )
-        headers.update(self._default_headers)
         rc_args = {"remote_url": clone_source, "label": newid, "comment": description}
 
         _finish_response(
             self._session.post(
                 self._clone_url(newid),
-                headers=headers,
+                headers=self._remote_headers(remote_auth),
                 json=rc_args,
                 auth=self._auth(),
             )
@@ -2724,7 +3537,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def get_organization_users(self, org: str) -> Optional[dict]:
         """
@@ -2750,7 +3563,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def get_organization_user(self, org: str, username: str) -> Optional[dict]:
         """
@@ -2777,7 +3590,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def get_organization_user_databases(
         self, org: str, username: str
@@ -2806,7 +3619,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def get_organizations(self) -> Optional[dict]:
         """
@@ -2828,7 +3641,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def get_organization(self, org: str) -> Optional[dict]:
         """
@@ -2854,7 +3667,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def delete_organization(self, org: str) -> Optional[dict]:
         """
@@ -2880,7 +3693,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def change_capabilities(self, capability_change: dict) -> Optional[dict]:
         """
@@ -2919,7 +3732,7 @@ class Client:
             json=capability_change,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def add_role(self, role: dict) -> Optional[dict]:
         """
@@ -2974,7 +3787,7 @@ class Client:
             json=role,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def change_role(self, role: dict) -> Optional[dict]:
         """
@@ -3030,7 +3843,7 @@ class Client:
             json=role,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def get_available_roles(self) -> Optional[dict]:
         """
@@ -3051,7 +3864,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def add_user(self, username: str, password: str) -> Optional[dict]:
         """
@@ -3080,7 +3893,7 @@ class Client:
             json={"name": username, "password": password},
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def get_user(self, username: str) -> Optional[dict]:
         """
@@ -3106,7 +3919,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def get_users(self) -> Optional[dict]:
         """
@@ -3127,7 +3940,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def delete_user(self, username: str) -> Optional[dict]:
         """
@@ -3153,7 +3966,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def change_user_password(self, username: str, password: str) -> Optional[dict]:
         """
@@ -3182,7 +3995,7 @@ class Client:
             json={"name": username, "password": password},
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def get_database(self, dbid: str, team: Optional[str] = None) -> Optional[dict]:
         """
@@ -3212,7 +4025,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def has_database(self, dbid: str, team: Optional[str] = None) -> bool:
         """
@@ -3264,7 +4077,7 @@ class Client:
             headers=self._default_headers,
             auth=self._auth(),
         )
-        return json.loads(_finish_response(result))
+        return _finish_json(result)
 
     def list_databases(self) -> List[Dict]:
         """
@@ -3315,6 +4128,11 @@ class Client:
             return base + f"/branch/{self._branch}"
         return base
 
+    def _commits_url(self):
+        api_url = self._documents_url().split("/")
+        api_url = api_url[:-2]
+        return "/".join(api_url) + "/_commits"
+
     def _query_url(self):
         if self._db == "_system":
             return self._db_base("woql")
@@ -1 +1,4 @@
 from .Client import GraphType, Patch, Client  # noqa
+from .bulk_loader import BulkLoader  # noqa
+from .async_client import AsyncClient  # noqa
+from .document_cache import DocumentCache  # noqa
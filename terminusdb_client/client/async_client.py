@@ -0,0 +1,1547 @@
+"""async_client.py
+AsyncClient is the asyncio counterpart of Client, built on httpx"""
+
+import asyncio
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from importlib import import_module
+from typing import AsyncIterator, Iterable, List, Optional, Union
+
+from .. import json_codec
+from ..errors import DatabaseError, InterfaceError
+from ..woql_utils import (
+    _CHUNK_SIZE,
+    _StreamDecoder,
+    _finish_json,
+    _finish_response,
+    _result2stream,
+)
+from ..woqldataframe.woqlArrow import arrow_schema, to_record_batches
+from ..woqlquery.woql_query import WOQLQuery
+from .bulk_loader import BulkLoader
+from .Client import Client, GraphType, Patch, WoqlResult, _server_cache
+from .document_cache import _document_id
+from .http_pool import _stats
+
+
+def _httpx():
+    try:
+        return import_module("httpx")
+    except ImportError:
+        raise ImportError(
+            "Library 'httpx' is required for AsyncClient, install it as follows: python -m pip install -U httpx, or with the client: python -m pip install -U terminusdb[async]"
+        )
+
+
+async def _aiter_chunks(chunks):
+    """Chunks of a request body, each one produced on a worker thread
+
+    Building the chunks converts, encodes and compresses the documents, which
+    would block the event loop."""
+    chunks = iter(chunks)
+    while True:
+        chunk = await asyncio.to_thread(next, chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+async def _finish_async_response(response, get_version=False):
+    """Read the whole body (a no-op unless streamed) and finish as `_finish_response`"""
+    await response.aread()
+    return _finish_response(response, get_version)
+
+
+async def _finish_async_json(response, get_version=False):
+    """Read the whole body (a no-op unless streamed) and finish as `_finish_json`"""
+    await response.aread()
+    return _finish_json(response, get_version)
+
+
+class AsyncDocumentStream:
+    """Async iterator for streaming documents.
+
+    The async counterpart of `DocumentStream`: documents are decoded as the
+    response body arrives, and the connection is released once the stream is
+    exhausted or closed.
+
+    Examples
+    --------
+    >>> async with await client.get_all_documents() as documents:
+    ...     async for document in documents:
+    ...         print(document)
+    """
+
+    def __init__(self, response, chunk_size=None):
+        self.response = response
+        self.documents = self._decode(chunk_size or _CHUNK_SIZE)
+        self.closed = False
+
+    async def _decode(self, chunk_size):
+        decoder = _StreamDecoder()
+        async for chunk in self.response.aiter_bytes(chunk_size):
+            for document in decoder.feed(chunk):
+                yield document
+        for document in decoder.close():
+            yield document
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed:
+            raise StopAsyncIteration()
+        try:
+            return await self.documents.__anext__()
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self):
+        """Stop reading and release the connection."""
+        if not self.closed:
+            self.closed = True
+            await self.documents.aclose()
+            await self.response.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+
+class AsyncWoqlResult(WoqlResult):
+    """Async iterator for streaming WOQL results."""
+
+    def __init__(self, response, lines, preface):
+        self._set_preface(json_codec.loads(preface))
+        self.response = response
+        self.lines = lines
+
+    def __iter__(self):
+        raise TypeError("AsyncWoqlResult is iterated with `async for`.")
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            line = await self.lines.__anext__()
+        except StopAsyncIteration:
+            await self.aclose()
+            raise
+        try:
+            return self._check_error(json_codec.loads(line))
+        except StopIteration:
+            # the postscript ends the results
+            await self.aclose()
+            raise StopAsyncIteration() from None
+
+    async def aclose(self):
+        """Stop reading and release the connection."""
+        await self.response.aclose()
+
+
+class _PoolCounters:
+    """Requests sent and connections opened by host, counted with the trace extension of httpx"""
+
+    def __init__(self):
+        self.requests = {}
+        self.connections = {}
+
+    def count(self, url) -> dict:
+        """Count a request to `url`, return the extensions tracing its connection"""
+        port = url.port or (443 if url.scheme == "https" else 80)
+        host = f"{url.scheme}://{url.host}:{port}"
+        self.requests[host] = self.requests.get(host, 0) + 1
+
+        async def trace(event_name, info):
+            if event_name == "connection.connect_tcp.complete":
+                self.connections[host] = self.connections.get(host, 0) + 1
+
+        return {"trace": trace}
+
+    def stats(self) -> dict:
+        # httpx waits for a free connection without telling, and does not
+        # open connections over the limit: no waits or discards are counted
+        hosts = {
+            host: _stats(requests, self.connections.get(host, 0), 0, 0)
+            for host, requests in self.requests.items()
+        }
+        total = _stats(
+            sum(self.requests.values()), sum(self.connections.values()), 0, 0
+        )
+        total["hosts"] = hosts
+        return total
+
+
+class AsyncBulkLoader(BulkLoader):
+    """Load a stream of documents in batches with an AsyncClient, see `BulkLoader`.
+
+    The next batch is converted, encoded and compressed on a worker thread
+    while the current one is uploaded.
+
+    Examples
+    --------
+    >>> loader = AsyncBulkLoader(client, batch_size=5000)
+    >>> ids = await loader.load(document_generator())
+    """
+
+    async def load(self, documents: Iterable) -> list:
+        """Load all the documents, committing them batch by batch, see `BulkLoader.load`."""
+        self.client._check_connection()
+        documents = iter(documents)
+        seen = set()
+        captured = {}
+        result = []
+        loop = asyncio.get_running_loop()
+        last_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = loop.run_in_executor(
+                executor, self._prepare, documents, seen, captured
+            )
+            while True:
+                batch = await pending
+                if batch is None:
+                    break
+                pending = loop.run_in_executor(
+                    executor, self._prepare, documents, seen, captured
+                )
+                body, compressed, count, size, objects, captures, uploaded = batch
+                try:
+                    ids = await self._upload(body, compressed)
+                    self._set_ids(objects, ids)
+                finally:
+                    uploaded.set()
+                self._forget(captures, seen, captured)
+                result += ids
+                now = time.perf_counter()
+                self._report(count, size, now - last_time)
+                last_time = now
+        return result
+
+    async def _upload(self, body, compressed):
+        method, kwargs = self._upload_request(body, compressed)
+        response = await self.client._request(method, **kwargs)
+        result = await _finish_async_json(response)
+        self.client._documents_written(response, self.graph_type, result)
+        return result
+
+
+class AsyncClient(Client):
+    """Client for TerminusDB using asyncio.
+
+    It has the same constructor, properties and connection settings as
+    `Client`, and the same request building and result handling, but its
+    methods are coroutines sending requests with an `httpx.AsyncClient`.
+    Streamed documents and WOQL results are async iterators. `fork`, `copy`
+    and `pool_stats` send no request and are plain methods.
+
+    Requires the optional dependency `httpx`.
+
+    Examples
+    --------
+    >>> async with AsyncClient("http://127.0.0.1:6363") as client:
+    ...     await client.connect(db="example_db")
+    ...     async for document in await client.get_all_documents():
+    ...         print(document)
+    """
+
+    def __init__(self, server_url: str, *args, **kwargs) -> None:
+        _httpx()
+        super().__init__(server_url, *args, **kwargs)
+        # check of the server of a lazy connect, shared by the first requests
+        self._server_check = None
+        self._pool_counters = _PoolCounters()
+
+    def _new_session(self):
+        httpx = _httpx()
+        options = self._pool_options
+        limits = httpx.Limits(
+            max_connections=(
+                options["pool_maxsize"] if options["pool_block"] else None
+            ),
+            max_keepalive_connections=options["pool_maxsize"],
+        )
+        # httpx only retries failed connection attempts
+        transport = httpx.AsyncHTTPTransport(limits=limits, retries=options["retries"])
+        timeout = httpx.Timeout(
+            None, connect=options["connect_timeout"], read=options["read_timeout"]
+        )
+        return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    @staticmethod
+    def _params(params):
+        """Query parameters as httpx encodes them, with enums as their values"""
+        if params is None:
+            return None
+        return {
+            key: value.value if isinstance(value, Enum) else value
+            for key, value in params.items()
+            if value is not None
+        }
+
+    async def _request(self, method, url, **kwargs):
+        """Send a request, checking the server first after a lazy connect, see `_send`"""
+        if self._pending_check:
+            await self._lazy_server_check()
+        return await self._send(method, url, **kwargs)
+
+    async def _send(
+        self,
+        method,
+        url,
+        params=None,
+        data=None,
+        stream=False,
+        follow_redirects=False,
+        **kwargs,
+    ):
+        """Send a request, `data` can be bytes or an iterable of bytes chunks"""
+        if data is not None:
+            if not isinstance(data, bytes):
+                data = _aiter_chunks(data)
+            kwargs["content"] = data
+        request = self._session.build_request(
+            method, url, params=self._params(params), **kwargs
+        )
+        request.extensions.update(self._pool_counters.count(request.url))
+        return await self._session.send(
+            request,
+            auth=self._auth(),
+            stream=stream,
+            follow_redirects=follow_redirects,
+        )
+
+    def _lazy_check(self):
+        # the server is checked by the first request, see `_request`
+        pass
+
+    async def _lazy_server_check(self):
+        check = self._server_check
+        if check is None:
+            check = self._server_check = asyncio.ensure_future(self._check_server())
+        try:
+            await check
+        finally:
+            # after a failure, the next request checks again
+            if self._server_check is check and check.done():
+                self._server_check = None
+
+    async def connect(
+        self,
+        team: str = "admin",
+        db: Optional[str] = None,
+        remote_auth: Optional[dict] = None,
+        use_token: bool = False,
+        jwt_token: Optional[str] = None,
+        api_token: Optional[str] = None,
+        key: str = "root",
+        user: str = "admin",
+        branch: str = "main",
+        ref: Optional[str] = None,
+        repo: str = "local",
+        lazy: bool = False,
+        cache_ttl: Optional[float] = None,
+        **kwargs,
+    ) -> None:
+        """Connect to a Terminus server, see `Client.connect`.
+
+        With `lazy`, the server and the database are checked by the first request."""
+        self._set_connection(
+            team,
+            db,
+            remote_auth,
+            use_token,
+            jwt_token,
+            api_token,
+            key,
+            user,
+            branch,
+            ref,
+            repo,
+        )
+        self._session = self._new_session()
+        self._pool_counters = _PoolCounters()
+        self._owns_session = True
+        self._connected = True
+        self._lazy = lazy
+        self._cache_ttl = cache_ttl
+        self._author = self.user
+        self._server_check = None
+
+        if lazy:
+            self._pending_check = True
+        else:
+            await self._check_server()
+
+    async def _check_server(self):
+        """Check the server and the database connected to, raise InterfaceError if unavailable"""
+        info_key = self._server_cache_key()
+        db_key = info_key + (self.team, self.db)
+        try:
+            db_info = _server_cache.get(info_key)
+            if db_info is None:
+                db_info = await _finish_async_json(
+                    await self._send(
+                        "GET", self.api + "/info", headers=self._default_headers
+                    )
+                )
+                _server_cache.set(info_key, db_info, self._cache_ttl)
+            self._db_info = db_info
+        except Exception as error:
+            raise self._connect_error(error) from None
+        if self.db is not None and not _server_cache.get(db_key):
+            try:
+                await _finish_async_response(
+                    await self._send(
+                        "HEAD",
+                        self._db_url(),
+                        headers=self._default_headers,
+                        params={"exists": "true"},
+                    )
+                )
+            except DatabaseError:
+                raise InterfaceError(f"Connection fail, {self.db} does not exist.")
+            _server_cache.set(db_key, True, self._cache_ttl)
+        self._pending_check = False
+
+    async def close(self) -> None:
+        """Undo connect and close the connections."""
+        if self._connected and self._owns_session:
+            await self._session.aclose()
+        self._connected = False
+
+    async def info(self) -> dict:
+        """Get info of a TerminusDB database server, see `Client.info`."""
+        result = await self._request(
+            "GET", self.api + "/info", headers=self._default_headers
+        )
+        return await _finish_async_json(result)
+
+    def pool_stats(self) -> dict:
+        """Get the statistics of the connections of the client, see `Client.pool_stats`.
+
+        The requests and the new connections are counted, httpx does not tell
+        about waits for a free connection: `waits` and `discards` are 0."""
+        self._check_connection(check_db=False)
+        return self._pool_counters.stats()
+
+    async def ok(self) -> bool:
+        """Check whether the TerminusDB server is still OK, see `Client.ok`."""
+        if not self._connected:
+            return self._connected
+        req = await self._send(
+            "GET", self.api + "/ok", headers=self._default_headers, timeout=6
+        )
+        return req.status_code == 200
+
+    async def rollback(self, steps=1) -> None:
+        """Not implemented: open transactions are currently not supported, see `Client.rollback`."""
+        super().rollback(steps)
+
+    def copy(self) -> "AsyncClient":
+        """Create a deep copy of this client with its own connections, see `Client.copy`.
+
+        The document cache, if any, is shared with the copy."""
+        memo = {id(self._server_check): None}
+        if self._document_cache is not None:
+            memo[id(self._document_cache)] = self._document_cache
+        if self._connected:
+            memo[id(self._session)] = None
+        copied = copy.deepcopy(self, memo)
+        copied._pool_counters = _PoolCounters()
+        if self._connected:
+            copied._session = copied._new_session()
+            copied._owns_session = True
+        return copied
+
+    async def set_db(self, dbid: str, team: Optional[str] = None) -> str:
+        """Set the connection to another database, see `Client.set_db`."""
+        self._check_connection(check_db=False)
+
+        if team is None:
+            team = self.team
+
+        return await self.connect(
+            team=team,
+            db=dbid,
+            remote_auth=self._remote_auth_dict,
+            key=self._key,
+            user=self.user,
+            branch=self.branch,
+            ref=self.ref,
+            repo=self.repo,
+            lazy=self._lazy,
+            cache_ttl=self._cache_ttl,
+        )
+
+    async def _get_prefixes(self):
+        """Get the prefixes for a given database"""
+        self._check_connection()
+        result = await self._request(
+            "GET", self._db_base("prefixes"), headers=self._default_headers
+        )
+        result.raise_for_status()
+        return result.json()
+
+    async def _prefix_request(self, method, prefix_name, path="", **kwargs):
+        self._check_connection()
+        result = await self._request(
+            method,
+            self._prefix_url(prefix_name) + path,
+            headers=self._default_headers,
+            **kwargs,
+        )
+        result.raise_for_status()
+        return result.json()
+
+    async def get_prefix(self, prefix_name: str) -> str:
+        """Get a prefix from the database, see `Client.get_prefix`."""
+        result = await self._prefix_request("GET", prefix_name)
+        return result["api:prefix_uri"]
+
+    async def add_prefix(self, prefix_name: str, uri: str) -> dict:
+        """Add a new prefix mapping, see `Client.add_prefix`."""
+        return await self._prefix_request("POST", prefix_name, json={"uri": uri})
+
+    async def update_prefix(self, prefix_name: str, uri: str) -> dict:
+        """Update an existing prefix mapping, see `Client.update_prefix`."""
+        return await self._prefix_request("PUT", prefix_name, json={"uri": uri})
+
+    async def upsert_prefix(self, prefix_name: str, uri: str) -> dict:
+        """Create or update a prefix mapping, see `Client.upsert_prefix`."""
+        return await self._prefix_request(
+            "PUT", prefix_name, "?create=true", json={"uri": uri}
+        )
+
+    async def delete_prefix(self, prefix_name: str) -> dict:
+        """Delete a prefix mapping, see `Client.delete_prefix`."""
+        return await self._prefix_request("DELETE", prefix_name)
+
+    async def create_database(
+        self,
+        dbid: str,
+        team: Optional[str] = None,
+        label: Optional[str] = None,
+        description: Optional[str] = None,
+        prefixes: Optional[dict] = None,
+        include_schema: bool = True,
+    ) -> None:
+        """Create a TerminusDB database and connect to it, see `Client.create_database`."""
+        self._check_connection(check_db=False)
+        details = self._database_details(
+            dbid, label, description, prefixes, include_schema
+        )
+        if team is None:
+            team = self.team
+
+        self.team = team
+        self._connected = True
+        self.db = dbid
+
+        await _finish_async_response(
+            await self._request(
+                "POST", self._db_url(), headers=self._default_headers, json=details
+            )
+        )
+
+    async def delete_database(
+        self,
+        dbid: Optional[str] = None,
+        team: Optional[str] = None,
+        force: bool = False,
+    ) -> None:
+        """Delete a TerminusDB database, see `Client.delete_database`."""
+        self._check_connection(check_db=False)
+        payload = self._delete_database_params(dbid, team, force)
+        await _finish_async_response(
+            await self._request(
+                "DELETE", self._db_url(), headers=self._default_headers, params=payload
+            )
+        )
+        self._database_deleted()
+
+    async def get_triples(self, graph_type: GraphType) -> str:
+        """Retrieves the contents of the specified graph as triples encoded in turtle format, see `Client.get_triples`."""
+        self._check_connection()
+        result = await self._request(
+            "GET", self._triples_url(graph_type), headers=self._default_headers
+        )
+        return await _finish_async_json(result)
+
+    async def update_triples(
+        self, graph_type: GraphType, content: str, commit_msg: str
+    ) -> None:
+        """Updates the contents of the specified graph with the triples encoded in turtle format, see `Client.update_triples`."""
+        self._check_connection()
+        params = {
+            "commit_info": self._generate_commit(commit_msg),
+            "turtle": content,
+        }
+        response = await self._request(
+            "POST",
+            self._triples_url(graph_type),
+            headers=self._default_headers,
+            json=params,
+        )
+        result = await _finish_async_json(response)
+        self._documents_written(response, graph_type)
+        return result
+
+    async def insert_triples(
+        self, graph_type: GraphType, content: str, commit_msg: Optional[str] = None
+    ) -> None:
+        """Inserts into the specified graph with the triples encoded in turtle format, see `Client.insert_triples`."""
+        self._check_connection()
+        params = {"commit_info": self._generate_commit(commit_msg), "turtle": content}
+        response = await self._request(
+            "PUT",
+            self._triples_url(graph_type),
+            headers=self._default_headers,
+            json=params,
+        )
+        result = await _finish_async_json(response)
+        self._documents_written(response, graph_type)
+        return result
+
+    async def log(
+        self,
+        team: Optional[str] = None,
+        db: Optional[str] = None,
+        start: int = 0,
+        count: int = -1,
+    ):
+        """Get commit history of a database, see `Client.log`."""
+        self._check_connection(check_db=(not team or not db))
+        team = team if team else self.team
+        db = db if db else self.db
+        result = await self._request(
+            "GET",
+            f"{self.api}/log/{team}/{db}",
+            params={"start": start, "count": count},
+            headers=self._default_headers,
+        )
+        return self._parse_log(await _finish_async_json(result))
+
+    async def get_commit_history(self, max_history: int = 500) -> list:
+        """Get the whole commit history, see `Client.get_commit_history`."""
+        if max_history < 0:
+            raise ValueError("max_history needs to be non-negative.")
+        return await self.log(count=max_history)
+
+    async def get_document_history(
+        self,
+        doc_id: str,
+        team: Optional[str] = None,
+        db: Optional[str] = None,
+        start: int = 0,
+        count: int = 10,
+        created: bool = False,
+        updated: bool = False,
+    ) -> list:
+        """Get the commit history for a specific document, see `Client.get_document_history`."""
+        self._check_connection(check_db=(not team or not db))
+        team = team if team else self.team
+        db = db if db else self.db
+        result = await self._request(
+            "GET",
+            f"{self.api}/history/{team}/{db}",
+            params=self._document_history_params(
+                doc_id, start, count, created, updated
+            ),
+            headers=self._default_headers,
+        )
+        return self._parse_document_history(await _finish_async_json(result))
+
+    async def get_all_branches(self, get_data_version=False):
+        """Get all the branches available in the database."""
+        self._check_connection()
+        result = await self._request(
+            "GET",
+            self._commits_url(),
+            headers=self._default_headers,
+            params={"type": "Branch"},
+        )
+        if get_data_version:
+            result, version = await _finish_async_response(result, get_data_version)
+            return list(_result2stream(result)), version
+        return list(_result2stream(await _finish_async_response(result)))
+
+    async def query_document(
+        self,
+        document_template: dict,
+        graph_type: GraphType = GraphType.INSTANCE,
+        skip: int = 0,
+        count: Optional[int] = None,
+        as_list: bool = False,
+        get_data_version: bool = False,
+        chunk_size: Optional[int] = None,
+        **kwargs,
+    ) -> Union[AsyncDocumentStream, list, tuple]:
+        """Retrieves all documents that match a given document template, see `Client.query_document`.
+
+        Returns
+        -------
+        AsyncDocumentStream or list
+        """
+        self._check_connection()
+        headers = self._default_headers.copy()
+        headers["X-HTTP-Method-Override"] = "GET"
+        result = await self._request(
+            "POST",
+            self._documents_url(),
+            headers=headers,
+            json=self._query_document_payload(
+                document_template, graph_type, skip, count, kwargs
+            ),
+            stream=True,
+        )
+        return await self._document_stream(
+            result, as_list, get_data_version, chunk_size
+        )
+
+    async def get_document(
+        self,
+        iri_id: str,
+        graph_type: GraphType = GraphType.INSTANCE,
+        get_data_version: bool = False,
+        **kwargs,
+    ) -> dict:
+        """Retrieves the document of the iri_id, see `Client.get_document`."""
+        self._check_connection()
+        cache = self._document_cache
+        if cache is not None:
+            branch = self._cache_branch()
+            key = cache.key(iri_id, graph_type, self._document_flags(kwargs))
+            cached = cache.get(branch, key)
+            if cached is not None:
+                document = json_codec.loads(cached[0])
+                return (document, cached[1]) if get_data_version else document
+            generation = cache.generation(branch)
+
+        result = await self._request(
+            "GET",
+            self._documents_url(),
+            headers=self._default_headers,
+            params=self._get_document_payload(iri_id, graph_type, kwargs),
+        )
+        if cache is not None:
+            document, version = await _finish_async_json(result, True)
+            cache.put(branch, key, result.content, version, generation)
+            return (document, version) if get_data_version else document
+        if get_data_version:
+            return await _finish_async_json(result, get_data_version)
+        return await _finish_async_json(result)
+
+    async def get_documents(
+        self,
+        ids,
+        graph_type: GraphType = GraphType.INSTANCE,
+        batch_size: int = 1000,
+        workers: int = 1,
+        missing=None,
+        chunk_size: Optional[int] = None,
+        **kwargs,
+    ) -> list:
+        """Retrieves the documents of many ids in a few requests, see `Client.get_documents`.
+
+        Up to `workers` requests are sent concurrently.
+        """
+        self._check_connection()
+        if batch_size < 1:
+            raise ValueError("batch_size needs to be at least 1.")
+        ids = list(ids)
+        found, wanted = self._cached_documents(ids, graph_type, kwargs)
+        generation = self._cache_generation()
+        semaphore = asyncio.Semaphore(max(workers, 1))
+
+        async def fetch(batch):
+            async with semaphore:
+                return await self._get_document_batch(
+                    batch, graph_type, kwargs, chunk_size, generation
+                )
+
+        for batch_found in await asyncio.gather(
+            *(
+                fetch(wanted[start : start + batch_size])
+                for start in range(0, len(wanted), batch_size)
+            )
+        ):
+            found.update(batch_found)
+        return [found.get(_document_id(doc_id), missing) for doc_id in ids]
+
+    async def _get_document_batch(
+        self, ids, graph_type, kwargs, chunk_size, generation
+    ):
+        response = await self._request(
+            "POST",
+            self._documents_url(),
+            headers=self._get_documents_headers(),
+            json=self._get_documents_payload(ids, graph_type, kwargs),
+            stream=True,
+        )
+        try:
+            stream = await self._document_stream(response, chunk_size=chunk_size)
+        except DatabaseError as exception:
+            if not self._is_document_not_found(exception):
+                raise exception
+            if len(ids) == 1:
+                return {}
+            middle = len(ids) // 2
+            found = {}
+            for half in (ids[:middle], ids[middle:]):
+                found.update(
+                    await self._get_document_batch(
+                        half, graph_type, kwargs, chunk_size, generation
+                    )
+                )
+            return found
+        async with stream:
+            documents = [document async for document in stream]
+        return self._found_documents(
+            documents,
+            graph_type,
+            kwargs,
+            response.headers.get("Terminusdb-Data-Version"),
+            generation,
+        )
+
+    async def get_documents_by_type(
+        self,
+        doc_type: str,
+        graph_type: GraphType = GraphType.INSTANCE,
+        skip: int = 0,
+        count: Optional[int] = None,
+        as_list: bool = False,
+        get_data_version=False,
+        **kwargs,
+    ) -> Union[AsyncDocumentStream, list, tuple]:
+        """Retrieves the documents by type, see `Client.get_documents_by_type`."""
+        return await self.get_all_documents(
+            graph_type,
+            skip,
+            count,
+            as_list,
+            get_data_version,
+            doc_type=doc_type,
+            **kwargs,
+        )
+
+    async def get_all_documents(
+        self,
+        graph_type: GraphType = GraphType.INSTANCE,
+        skip: int = 0,
+        count: Optional[int] = None,
+        as_list: bool = False,
+        get_data_version: bool = False,
+        doc_type: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        **kwargs,
+    ) -> Union[AsyncDocumentStream, list, tuple]:
+        """Retrieves all avalibale the documents, see `Client.get_all_documents`.
+
+        Returns
+        -------
+        AsyncDocumentStream or list
+            Async iterator of dictionaries, or a list if `as_list`
+        """
+        self._check_connection()
+        result = await self._request(
+            "GET",
+            self._documents_url(),
+            headers=self._default_headers,
+            params=self._all_documents_payload(
+                graph_type, skip, count, doc_type, kwargs
+            ),
+            stream=True,
+        )
+        return await self._document_stream(
+            result, as_list, get_data_version, chunk_size
+        )
+
+    async def _document_stream(
+        self, result, as_list=False, get_data_version=False, chunk_size=None
+    ):
+        return_obj = AsyncDocumentStream(result, chunk_size)
+        if result.status_code != 200:
+            try:
+                await _finish_async_response(result)
+            finally:
+                # not an error, but the body has no documents either
+                await return_obj.aclose()
+        if as_list:
+            return_obj = [document async for document in return_obj]
+        if get_data_version:
+            return return_obj, result.headers.get("Terminusdb-Data-Version")
+        return return_obj
+
+    async def get_existing_classes(self):
+        """Get all the existing classes (only ids) in a database."""
+        all_existing_class = {}
+        async for item in await self.get_all_documents(graph_type="schema"):
+            if item.get("@id"):
+                all_existing_class[item["@id"]] = item
+        return all_existing_class
+
+    async def get_class_frame(self, class_name):
+        """Get the frame of the class of class_name, see `Client.get_class_frame`."""
+        self._check_connection()
+        result = await self._request(
+            "GET",
+            self._class_frame_url(),
+            headers=self._default_headers,
+            params={"type": class_name},
+        )
+        return await _finish_async_json(result)
+
+    async def export_arrow(self, doc_type: str, batch_size: int = 10000, **kwargs):
+        """Export the documents of a class as Arrow record batches, see `Client.export_arrow`.
+
+        Returns
+        -------
+        async iterator of pyarrow.RecordBatch
+            The batches are built as the documents are received.
+        """
+        self._check_connection()
+        if batch_size < 1:
+            raise ValueError("batch_size needs to be at least 1.")
+        all_existing_class = await self.get_existing_classes()
+        if doc_type not in all_existing_class:
+            raise InterfaceError(
+                f"{doc_type} not found in database ({self.db}) schema."
+            )
+        # fails early without pyarrow
+        arrow_schema(all_existing_class, doc_type)
+        documents = await self.get_documents_by_type(doc_type, **kwargs)
+        return self._record_batches(documents, all_existing_class, doc_type, batch_size)
+
+    @staticmethod
+    async def _record_batches(documents, all_existing_class, doc_type, batch_size):
+        chunk = []
+        async for document in documents:
+            chunk.append(document)
+            if len(chunk) == batch_size:
+                yield to_record_batches(
+                    chunk, all_existing_class, doc_type, batch_size
+                ).read_next_batch()
+                chunk = []
+        if chunk:
+            yield to_record_batches(
+                chunk, all_existing_class, doc_type, batch_size
+            ).read_next_batch()
+
+    async def insert_document(
+        self,
+        document,
+        graph_type: GraphType = GraphType.INSTANCE,
+        full_replace: bool = False,
+        commit_msg: Optional[str] = None,
+        last_data_version: Optional[str] = None,
+        compress: Union[str, int] = 1024,
+        raw_json: bool = False,
+        stream: bool = False,
+    ) -> None:
+        """Inserts the specified document(s), see `Client.insert_document`."""
+        self._check_connection()
+        params, headers = self._insert_params(
+            graph_type, full_replace, commit_msg, last_data_version, raw_json
+        )
+        # the documents are converted and compressed on worker threads, as the
+        # streamed bodies are in `_send`
+        new_doc, objects = await asyncio.to_thread(
+            self._prepare_insert, document, graph_type, full_replace, stream
+        )
+        if new_doc is None:
+            return
+
+        if stream:
+            body, objects = self._document_stream_body(new_doc, headers, compress)
+            body = {"data": body}
+        else:
+            body = await asyncio.to_thread(
+                self._document_body, new_doc, headers, compress
+            )
+        response = await self._request(
+            "POST", self._documents_url(), headers=headers, params=params, **body
+        )
+        result = await _finish_async_json(response)
+        self._documents_written(response, graph_type, None if full_replace else result)
+        self._set_backend_ids(objects, result)
+        return result
+
+    async def replace_document(
+        self,
+        document,
+        graph_type: GraphType = GraphType.INSTANCE,
+        commit_msg: Optional[str] = None,
+        last_data_version: Optional[str] = None,
+        compress: Union[str, int] = 1024,
+        create: bool = False,
+        raw_json: bool = False,
+        stream: bool = False,
+    ) -> dict:
+        """Updates the specified document(s), see `Client.replace_document`."""
+        self._check_connection()
+        params, headers = self._replace_params(
+            graph_type, commit_msg, last_data_version, create, raw_json
+        )
+
+        if stream:
+            body, objects = self._document_stream_body(
+                self._iter_convert_document(document, graph_type), headers, compress
+            )
+            body = {"data": body}
+        else:
+            new_doc, objects = await asyncio.to_thread(
+                self._convert_documents, document, graph_type
+            )
+            body = await asyncio.to_thread(
+                self._document_body, new_doc, headers, compress
+            )
+        response = await self._request(
+            "PUT", self._documents_url(), headers=headers, params=params, **body
+        )
+        result = await _finish_async_json(response)
+        self._documents_written(response, graph_type, result)
+        self._set_backend_ids(objects, result, "terminusdb:///data/")
+        return result
+
+    async def update_document(
+        self,
+        document,
+        graph_type: GraphType = GraphType.INSTANCE,
+        commit_msg: Optional[str] = None,
+        last_data_version: Optional[str] = None,
+        compress: Union[str, int] = 1024,
+        stream: bool = False,
+    ) -> None:
+        """Updates the specified document(s). Add the document if not existed."""
+        await self.replace_document(
+            document,
+            graph_type,
+            commit_msg,
+            last_data_version,
+            compress,
+            True,
+            stream=stream,
+        )
+
+    async def bulk_insert(
+        self,
+        documents: Iterable,
+        batch_size: int = 1000,
+        batch_bytes: Optional[int] = None,
+        graph_type: GraphType = GraphType.INSTANCE,
+        commit_msg: Optional[str] = None,
+        compress: Union[str, int] = 1024,
+        replace: bool = False,
+        create: bool = False,
+        raw_json: bool = False,
+        on_batch=None,
+    ) -> list:
+        """Load a stream of documents in batches, one commit per batch, see `Client.bulk_insert`."""
+        loader = AsyncBulkLoader(
+            self,
+            batch_size=batch_size,
+            batch_bytes=batch_bytes,
+            graph_type=graph_type,
+            commit_msg=commit_msg,
+            compress=compress,
+            replace=replace,
+            create=create,
+            raw_json=raw_json,
+            on_batch=on_batch,
+        )
+        return await loader.load(documents)
+
+    async def delete_document(
+        self,
+        document,
+        graph_type: GraphType = GraphType.INSTANCE,
+        commit_msg: Optional[str] = None,
+        last_data_version: Optional[str] = None,
+    ) -> None:
+        """Delete the specified document(s), see `Client.delete_document`."""
+        self._check_connection()
+        doc_id = self._document_ids(document)
+        params = self._generate_commit(commit_msg)
+        params["graph_type"] = graph_type
+
+        headers = self._default_headers.copy()
+        if last_data_version is not None:
+            headers["TerminusDB-Data-Version"] = last_data_version
+
+        response = await self._request(
+            "DELETE",
+            self._documents_url(),
+            headers=headers,
+            params=params,
+            json=doc_id,
+        )
+        await _finish_async_response(response)
+        self._documents_written(response, graph_type, doc_id)
+
+    async def has_doc(
+        self, doc_id: str, graph_type: GraphType = GraphType.INSTANCE
+    ) -> bool:
+        """Check if a certain document exist in a database."""
+        self._check_connection()
+        response = await self._request(
+            "GET",
+            self._documents_url(),
+            headers=self._default_headers,
+            json={"id": doc_id, "graph_type": graph_type},
+        )
+        try:
+            await _finish_async_response(response)
+            return True
+        except DatabaseError as exception:
+            if self._is_document_not_found(exception):
+                return False
+            raise exception
+
+    async def commit(self):
+        """Not implementated: open transactions currently not suportted, see `Client.commit`."""
+
+    async def query(
+        self,
+        woql_query: Union[dict, WOQLQuery],
+        commit_msg: Optional[str] = None,
+        get_data_version: bool = False,
+        last_data_version: Optional[str] = None,
+        streaming: bool = False,
+    ) -> Union[dict, str, AsyncWoqlResult]:
+        """Run a WOQL query, see `Client.query`.
+
+        Returns
+        -------
+        dict or AsyncWoqlResult
+            With `streaming`, an async iterator of the bindings.
+        """
+        self._check_connection()
+        query_obj, headers = self._query_request(
+            woql_query, commit_msg, last_data_version, streaming
+        )
+        generation = self._cache_generation()
+        response = await self._request(
+            "POST", self._query_url(), headers=headers, json=query_obj, stream=streaming
+        )
+
+        if streaming:
+            if response.status_code != 200:
+                try:
+                    await _finish_async_response(response)
+                finally:
+                    await response.aclose()
+            if self._document_cache is not None:
+                # the bindings do not tell whether the query wrote
+                self._documents_written(response)
+            lines = self._lines(response)
+            return AsyncWoqlResult(response, lines, await lines.__anext__())
+
+        if get_data_version or self._document_cache is not None:
+            result, version = await _finish_async_json(response, True)
+        else:
+            result, version = await _finish_async_json(response), None
+        if self._document_cache is not None:
+            if result.get("inserts") or result.get("deletes"):
+                self._documents_written(response)
+            else:
+                self._document_cache.observe(self._cache_branch(), version, generation)
+        return self._query_result(result, get_data_version, version)
+
+    @staticmethod
+    async def _lines(response) -> AsyncIterator[bytes]:
+        """Non-empty lines of the body, as bytes for the JSON codec"""
+        tail = b""
+        async for chunk in response.aiter_bytes():
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield line
+        if tail.strip():
+            yield tail
+
+    async def create_branch(self, new_branch_id: str, empty: bool = False) -> None:
+        """Create a branch starting from the current branch."""
+        self._check_connection()
+        await _finish_async_response(
+            await self._request(
+                "POST",
+                self._branch_url(new_branch_id),
+                headers=self._default_headers,
+                json=self._branch_source(empty),
+            )
+        )
+
+    async def delete_branch(self, branch_id: str) -> None:
+        """Delete a branch"""
+        self._check_connection()
+        await _finish_async_response(
+            await self._request(
+                "DELETE", self._branch_url(branch_id), headers=self._default_headers
+            )
+        )
+
+    async def pull(
+        self,
+        remote: str = "origin",
+        remote_branch: Optional[str] = None,
+        message: Optional[str] = None,
+        author: Optional[str] = None,
+    ) -> dict:
+        """Pull updates from a remote repository to the current database, see `Client.pull`."""
+        self._check_connection()
+        response = await self._request(
+            "POST",
+            self._pull_url(),
+            headers=self._default_headers,
+            json=self._pull_args(remote, remote_branch, message, author),
+        )
+        result = await _finish_async_json(response)
+        self._documents_written(response)
+        return result
+
+    async def fetch(
+        self,
+        remote_id: str,
+        remote_auth: Optional[dict] = None,
+    ) -> dict:
+        """Fetch the branch from a remote repo, see `Client.fetch`."""
+        self._check_connection()
+        result = await self._request(
+            "POST", self._fetch_url(remote_id), headers=self._default_headers
+        )
+        return await _finish_async_json(result)
+
+    async def push(
+        self,
+        remote: str = "origin",
+        remote_branch: Optional[str] = None,
+        message: Optional[str] = None,
+        author: Optional[str] = None,
+        remote_auth: Optional[dict] = None,
+    ) -> dict:
+        """Push changes from a branch to a remote repo, see `Client.push`."""
+        self._check_connection()
+        result = await self._request(
+            "POST",
+            self._push_url(),
+            headers=self._remote_headers(remote_auth),
+            json=self._push_args(remote, remote_branch, message, author),
+        )
+        return await _finish_async_json(result)
+
+    async def rebase(
+        self,
+        branch: Optional[str] = None,
+        commit: Optional[str] = None,
+        rebase_source: Optional[str] = None,
+        message: Optional[str] = None,
+        author: Optional[str] = None,
+    ) -> dict:
+        """Rebase the current branch, see `Client.rebase`."""
+        self._check_connection()
+        response = await self._request(
+            "POST",
+            self._rebase_url(),
+            headers=self._default_headers,
+            json=self._rebase_args(branch, commit, rebase_source, message, author),
+        )
+        result = await _finish_async_json(response)
+        self._documents_written(response)
+        return result
+
+    async def reset(
+        self, commit: Optional[str] = None, soft: bool = False, use_path: bool = False
+    ) -> None:
+        """Reset the current branch HEAD to the specified commit, see `Client.reset`."""
+        self._check_connection()
+        commit_path = self._reset_commit_path(commit, soft, use_path)
+        if commit_path is None:
+            return None
+
+        response = await self._request(
+            "POST",
+            self._reset_url(),
+            headers=self._default_headers,
+            json={"commit_descriptor": commit_path},
+        )
+        await _finish_async_response(response)
+        self._documents_written(response)
+
+    async def optimize(self, path: str) -> None:
+        """Optimize the specified path, see `Client.optimize`."""
+        self._check_connection()
+        await _finish_async_response(
+            await self._request(
+                "POST", self._optimize_url(path), headers=self._default_headers
+            )
+        )
+
+    async def squash(
+        self,
+        message: Optional[str] = None,
+        author: Optional[str] = None,
+        reset: bool = False,
+    ) -> str:
+        """Squash the current branch HEAD into a commit, see `Client.squash`."""
+        self._check_connection()
+        result = await self._request(
+            "POST",
+            self._squash_url(),
+            headers=self._default_headers,
+            json={"commit_info": self._generate_commit(message, author)},
+        )
+        commit_id = (await _finish_async_json(result)).get("api:commit")
+        self._documents_written(result)
+        if reset:
+            await self.reset(commit_id)
+        return commit_id
+
+    async def apply(
+        self, before_version, after_version, branch=None, message=None, author=None
+    ):
+        """Diff two different commits and apply changes on branch"""
+        self._check_connection()
+        branch = branch if branch else self.branch
+        response = await self._request(
+            "POST",
+            self._apply_url(branch=branch),
+            headers=self._default_headers,
+            json={
+                "commit_info": self._generate_commit(message, author),
+                "before_commit": before_version,
+                "after_commit": after_version,
+            },
+        )
+        result = await _finish_async_json(response)
+        self._documents_written(response, branch=branch)
+        return result
+
+    async def diff_object(self, before_object, after_object):
+        """Diff two different objects."""
+        self._check_connection(check_db=False)
+        result = await self._request(
+            "POST",
+            self._diff_url(),
+            headers=self._default_headers,
+            json={"before": before_object, "after": after_object},
+        )
+        return await _finish_async_json(result)
+
+    async def diff_version(self, before_version, after_version):
+        """Diff two different versions. Can either be a branch or a commit"""
+        self._check_connection(check_db=False)
+        result = await self._request(
+            "POST",
+            self._diff_url(),
+            headers=self._default_headers,
+            json={
+                "before_data_version": before_version,
+                "after_data_version": after_version,
+            },
+        )
+        return await _finish_async_json(result)
+
+    async def _post_public(self, url, request_dict):
+        """POST to `url` when connected, otherwise to the public API at the server url"""
+        if self._connected:
+            result = await self._request(
+                "POST", url, headers=self._default_headers, json=request_dict
+            )
+        else:
+            async with self._new_session() as session:
+                result = await session.post(
+                    self.server_url, headers=self._default_headers, json=request_dict
+                )
+        return await _finish_async_response(result)
+
+    async def diff(self, before, after, document_id: Union[str, None] = None):
+        """DEPRECATED
+
+        Perform diff on 2 set of document(s), result in a Patch object, see `Client.diff`.
+        """
+        request_dict = self._diff_request(before, after, document_id)
+        return Patch(json=await self._post_public(self._diff_url(), request_dict))
+
+    async def patch(self, before, patch: Patch):
+        """Apply the patch object to the before object and return an after object, see `Client.patch`."""
+        request_dict = {
+            "before": self._convert_diff_document(before),
+            "patch": patch.content,
+        }
+        return json_codec.loads(
+            await self._post_public(self._patch_url(), request_dict)
+        )
+
+    async def patch_resource(
+        self,
+        patch: Patch,
+        branch=None,
+        message=None,
+        author=None,
+        match_final_state=True,
+    ):
+        """Apply the patch object to the given resource, see `Client.patch_resource`."""
+        response = await self._request(
+            "POST",
+            self._branch_base("patch", branch),
+            headers=self._default_headers,
+            json=self._patch_resource_request(
+                patch, message, author, match_final_state
+            ),
+        )
+        result = await _finish_async_json(response)
+        self._documents_written(response, branch=branch)
+        return result
+
+    async def clonedb(
+        self,
+        clone_source: str,
+        newid: str,
+        description: Optional[str] = None,
+        remote_auth: Optional[dict] = None,
+    ) -> None:
+        """Clone a remote repository and create a local copy, see `Client.clonedb`."""
+        self._check_connection(check_db=False)
+        if description is None:
+            description = f"New database {newid}"
+        rc_args = {"remote_url": clone_source, "label": newid, "comment": description}
+
+        await _finish_async_response(
+            await self._request(
+                "POST",
+                self._clone_url(newid),
+                headers=self._remote_headers(remote_auth),
+                json=rc_args,
+            )
+        )
+
+    async def _admin_request(self, method, url, **kwargs):
+        """Request to the organization, user, role or database API"""
+        self._check_connection(check_db=False)
+        result = await self._request(
+            method, url, headers=self._default_headers, **kwargs
+        )
+        return await _finish_async_json(result)
+
+    async def create_organization(self, org: str) -> Optional[dict]:
+        """Add a new organization, see `Client.create_organization`."""
+        return await self._admin_request("POST", f"{self._organization_url()}/{org}")
+
+    async def get_organization_users(self, org: str) -> Optional[dict]:
+        """Returns a list of users in an organization, see `Client.get_organization_users`."""
+        return await self._admin_request(
+            "GET", f"{self._organization_url()}/{org}/users"
+        )
+
+    async def get_organization_user(self, org: str, username: str) -> Optional[dict]:
+        """Returns user info related to an organization, see `Client.get_organization_user`."""
+        return await self._admin_request(
+            "GET", f"{self._organization_url()}/{org}/users/{username}"
+        )
+
+    async def get_organization_user_databases(
+        self, org: str, username: str
+    ) -> Optional[dict]:
+        """Returns the databases available to a user of an organization, see `Client.get_organization_user_databases`."""
+        return await self._admin_request(
+            "GET", f"{self._organization_url()}/{org}/users/{username}/databases"
+        )
+
+    async def get_organizations(self) -> Optional[dict]:
+        """Returns a list of organizations in the database, see `Client.get_organizations`."""
+        return await self._admin_request("GET", self._organization_url())
+
+    async def get_organization(self, org: str) -> Optional[dict]:
+        """Returns a specific organization, see `Client.get_organization`."""
+        return await self._admin_request("GET", f"{self._organization_url()}/{org}")
+
+    async def delete_organization(self, org: str) -> Optional[dict]:
+        """Deletes a specific organization, see `Client.delete_organization`."""
+        return await self._admin_request("DELETE", f"{self._organization_url()}/{org}")
+
+    async def change_capabilities(self, capability_change: dict) -> Optional[dict]:
+        """Change the capabilities of a certain user, see `Client.change_capabilities`."""
+        return await self._admin_request(
+            "POST", self._capabilities_url(), json=capability_change
+        )
+
+    async def add_role(self, role: dict) -> Optional[dict]:
+        """Add a new role, see `Client.add_role`."""
+        return await self._admin_request("POST", self._roles_url(), json=role)
+
+    async def change_role(self, role: dict) -> Optional[dict]:
+        """Change the actions of a role, see `Client.change_role`."""
+        return await self._admin_request("PUT", self._roles_url(), json=role)
+
+    async def get_available_roles(self) -> Optional[dict]:
+        """Get the available roles for the current authenticated user, see `Client.get_available_roles`."""
+        return await self._admin_request("GET", self._roles_url())
+
+    async def add_user(self, username: str, password: str) -> Optional[dict]:
+        """Add a new user, see `Client.add_user`."""
+        return await self._admin_request(
+            "POST", self._users_url(), json={"name": username, "password": password}
+        )
+
+    async def get_user(self, username: str) -> Optional[dict]:
+        """Get a user, see `Client.get_user`."""
+        return await self._admin_request("GET", f"{self._users_url()}/{username}")
+
+    async def get_users(self) -> Optional[dict]:
+        """Get all users, see `Client.get_users`."""
+        return await self._admin_request("GET", self._users_url())
+
+    async def delete_user(self, username: str) -> Optional[dict]:
+        """Delete a user, see `Client.delete_user`."""
+        return await self._admin_request("DELETE", f"{self._users_url()}/{username}")
+
+    async def change_user_password(
+        self, username: str, password: str
+    ) -> Optional[dict]:
+        """Change the password of a user, see `Client.change_user_password`."""
+        return await self._admin_request(
+            "PUT", self._users_url(), json={"name": username, "password": password}
+        )
+
+    async def get_database(
+        self, dbid: str, team: Optional[str] = None
+    ) -> Optional[dict]:
+        """Returns metadata (id, organization, label, comment) about the requested database, see `Client.get_database`."""
+        team = team if team else self.team
+        return await self._admin_request(
+            "GET", f"{self.api}/db/{team}/{dbid}?verbose=true"
+        )
+
+    async def has_database(self, dbid: str, team: Optional[str] = None) -> bool:
+        """Check whether a database exists, see `Client.has_database`."""
+        self._check_connection(check_db=False)
+        team = team if team else self.team
+        r = await self._request(
+            "HEAD",
+            f"{self.api}/db/{team}/{dbid}",
+            headers=self._default_headers,
+            follow_redirects=True,
+        )
+        return r.status_code == 200
+
+    async def get_databases(self) -> List[dict]:
+        """Returns a list of database metadata records for all databases the user has access to, see `Client.get_databases`."""
+        return await self._admin_request("GET", self.api + "/")
+
+    async def list_databases(self) -> List[dict]:
+        """Returns a list of database ids for all databases the user has access to, see `Client.list_databases`."""
+        return [data["name"] for data in await self.get_databases()]
@@ -0,0 +1,239 @@
+"""bulk_loader.py
+Pipelined batch loading of documents into TerminusDB"""
+
+import gzip
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional, Union
+
+from .. import json_codec
+from ..woql_utils import _finish_json
+
+
+class BulkLoader:
+    """Load a stream of documents in batches, one commit per batch.
+
+    The input is split into batches bounded by the number of documents and,
+    optionally, by the size of their JSON encoding. While a batch is being
+    uploaded, the next one is converted, encoded and compressed on a worker
+    thread, so the network is not idle while JSON is encoded and the CPU is
+    not idle while the server commits.
+
+    A document and the unsaved objects it references always go in the same
+    batch. A document referencing objects of an earlier batch refers to them
+    by the ids given by the server: if that batch is still being uploaded, the
+    conversion of the document waits for its ids. Only the objects of the
+    batches in flight are tracked, the others are referenced by their ids.
+
+    Parameters
+    ----------
+    client : Client
+        Connected client used to load the documents.
+    batch_size : int
+        Maximum number of documents in a batch, default to be 1000.
+    batch_bytes : int, optional
+        Maximum size (in bytes) of the JSON encoding of a batch.
+    graph_type : GraphType
+        Graph type, either GraphType.INSTANCE or GraphType.SCHEMA.
+    commit_msg : str, optional
+        Commit message used for every batch.
+    compress : str or int
+        If it is an integer, batches larger than this (in bytes) are compressed with gzip. If it is `never` they are never compressed.
+    replace : bool
+        Replace the documents (as `replace_document`) instead of inserting them.
+    create : bool
+        With `replace`, create the documents that do not exist yet.
+    raw_json : bool
+        Load as raw json
+    on_batch : callable, optional
+        Called with the report of every batch once it is committed.
+
+    Attributes
+    ----------
+    reports : list of dict
+        One report per committed batch, with the number of `documents`, the
+        encoded `bytes`, the `seconds` since the previous batch was committed,
+        `docs_per_second` and `mb_per_second`.
+
+    Examples
+    --------
+    >>> loader = BulkLoader(client, batch_size=5000)
+    >>> ids = loader.load(document_generator())
+    >>> loader.reports[-1]["docs_per_second"]
+    """
+
+    def __init__(
+        self,
+        client,
+        batch_size: int = 1000,
+        batch_bytes: Optional[int] = None,
+        graph_type: str = "instance",
+        commit_msg: Optional[str] = None,
+        compress: Union[str, int] = 1024,
+        replace: bool = False,
+        create: bool = False,
+        raw_json: bool = False,
+        on_batch: Optional[Callable[[dict], None]] = None,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size needs to be at least 1.")
+        self.client = client
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.graph_type = graph_type
+        self.commit_msg = commit_msg
+        self.compress = compress
+        self.replace = replace
+        self.create = create
+        self.raw_json = raw_json
+        self.on_batch = on_batch
+        self.reports = []
+
+    def load(self, documents: Iterable) -> list:
+        """Load all the documents, committing them batch by batch.
+
+        Parameters
+        ----------
+        documents : iterable
+            Dicts or DocumentTemplate objects, can be a generator.
+
+        Returns
+        -------
+        list
+            ids of the loaded documents
+        """
+        self.client._check_connection()
+        documents = iter(documents)
+        # captures of the objects in the batches not uploaded yet
+        seen = set()
+        # capture -> event set once the ids of its batch are known
+        captured = {}
+        result = []
+        last_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(self._prepare, documents, seen, captured)
+            while True:
+                batch = pending.result()
+                if batch is None:
+                    break
+                # prepare batch N+1 while batch N is in flight
+                pending = executor.submit(self._prepare, documents, seen, captured)
+                body, compressed, count, size, objects, captures, uploaded = batch
+                try:
+                    ids = self._upload(body, compressed)
+                    self._set_ids(objects, ids)
+                finally:
+                    # also on failure, not to leave the next batch waiting
+                    uploaded.set()
+                self._forget(captures, seen, captured)
+                result += ids
+                now = time.perf_counter()
+                self._report(count, size, now - last_time)
+                last_time = now
+        return result
+
+    def _prepare(self, documents, seen, captured):
+        """Convert, encode and compress the next batch, None when exhausted"""
+        encoded = []
+        objects = {}
+        captures = set()
+        size = 0
+        uploaded = threading.Event()
+
+        def wait(capture, obj):
+            # objects of the batch in flight are referenced once they have ids
+            if hasattr(obj, "_backend_id"):
+                return True
+            event = captured.get(capture)
+            if event is None or event is uploaded:
+                return False
+            event.wait()
+            return hasattr(obj, "_backend_id")
+
+        for document in documents:
+            for item, item_dict in self.client._iter_convert_document(
+                [document], self.graph_type, seen, wait
+            ):
+                capture = getattr(item, "_capture", None)
+                if capture is not None:
+                    captures.add(capture)
+                if hasattr(item, "_obj_to_dict") and not hasattr(item, "_backend_id"):
+                    objects[len(encoded)] = weakref.ref(item)
+                    captured[capture] = uploaded
+                encoded.append(json_codec.dumps(item_dict))
+                size += len(encoded[-1]) + 1
+            if len(encoded) >= self.batch_size or (
+                self.batch_bytes is not None and size >= self.batch_bytes
+            ):
+                break
+        if not encoded:
+            return None
+        body = b"[" + b",".join(encoded) + b"]"
+        compressed = self.compress != "never" and len(body) > self.compress
+        if compressed:
+            body = gzip.compress(body)
+        return body, compressed, len(encoded), size, objects, captures, uploaded
+
+    @staticmethod
+    def _forget(captures, seen, captured):
+        """Stop tracking the objects of an uploaded batch, they have their ids"""
+        for capture in captures:
+            seen.discard(capture)
+            captured.pop(capture, None)
+
+    def _set_ids(self, objects, ids):
+        """Record the ids given by the server on the objects of a batch"""
+        prefix = "terminusdb:///data/" if self.replace else ""
+        for idx, ref in objects.items():
+            item = ref()
+            if item is not None:
+                item._backend_id = ids[idx][len(prefix) :]
+
+    def _upload(self, body, compressed):
+        method, kwargs = self._upload_request(body, compressed)
+        response = getattr(self.client._session, method.lower())(
+            auth=self.client._auth(), **kwargs
+        )
+        result = _finish_json(response)
+        self.client._documents_written(response, self.graph_type, result)
+        return result
+
+    def _upload_request(self, body, compressed):
+        """HTTP method and arguments of the request uploading a batch"""
+        client = self.client
+        params = client._generate_commit(self.commit_msg)
+        params["graph_type"] = self.graph_type
+        if self.replace:
+            params["create"] = "true" if self.create else "false"
+            method = "PUT"
+        else:
+            params["full_replace"] = "false"
+            method = "POST"
+        params["raw_json"] = "true" if self.raw_json else "false"
+
+        headers = client._default_headers.copy()
+        headers["Content-Type"] = "application/json"
+        if compressed:
+            headers["Content-Encoding"] = "gzip"
+        return method, {
+            "url": client._documents_url(),
+            "headers": headers,
+            "params": params,
+            "data": body,
+        }
+
+    def _report(self, count, size, seconds):
+        seconds = max(seconds, 1e-9)
+        report = {
+            "batch": len(self.reports),
+            "documents": count,
+            "bytes": size,
+            "seconds": seconds,
+            "docs_per_second": count / seconds,
+            "mb_per_second": size / seconds / 1e6,
+        }
+        self.reports.append(report)
+        if self.on_batch is not None:
+            self.on_batch(report)
@@ -0,0 +1,246 @@
+"""document_cache.py
+Client side cache of documents, aware of the data version of the branches"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+_DATA_PREFIX = "terminusdb:///data/"
+
+
+def _document_id(doc_id: str) -> str:
+    if doc_id.startswith(_DATA_PREFIX):
+        return doc_id[len(_DATA_PREFIX) :]
+    return doc_id
+
+
+def _graph_name(graph_type) -> str:
+    return str(getattr(graph_type, "value", graph_type))
+
+
+class DocumentCache:
+    """LRU cache of the documents retrieved with `Client.get_document`.
+
+    Entries are kept by branch (or commit), graph type, document id and
+    retrieving flags, as the encoded response, and evicted least recently
+    used first once there are more than `max_documents` of them or they take
+    more than `max_bytes`.
+
+    A branch entry is valid for the data version of the branch it was read
+    at: when a response of the server shows that the branch has moved on
+    (with the `TerminusDB-Data-Version` header), all the entries of the branch
+    are dropped. Documents written by the client are dropped without a round
+    trip, and the new data version of the branch is taken from the response
+    of the write. Documents read at a commit never change.
+
+    Data versions have no order, so a read is only cached if no write,
+    invalidation or new data version of its branch was seen while it was in
+    flight: take the `generation` of the branch before the request and give
+    it to `put`.
+
+    Changes made by other clients are only seen when a response shows the
+    new data version, use `ttl` to bound how long a document can be served
+    from the cache.
+
+    Parameters
+    ----------
+    max_documents : int
+        Maximum number of documents cached, default to be 10000.
+    max_bytes : int
+        Maximum size (in bytes) of the cached documents, default to be 64 MiB.
+    ttl : float, optional
+        Seconds for which an entry can be served, default to be no limit.
+
+    Examples
+    --------
+    >>> client = Client("http://127.0.0.1:6363", document_cache=DocumentCache())
+    >>> client.connect(db="example_db")
+    >>> client.get_document("Person/Jane")  # from the server
+    >>> client.get_document("Person/Jane")  # from the cache
+    >>> client.document_cache.stats()
+    """
+
+    def __init__(
+        self,
+        max_documents: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+    ):
+        self.max_documents = max_documents
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (branch, key) -> (content, version, time)
+        self._entries = OrderedDict()
+        # branch -> set of keys, for the invalidation by branch
+        self._branches = {}
+        # branch -> last data version seen
+        self._versions = {}
+        # branch -> count of the writes, invalidations and new data versions
+        self._generations = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(doc_id: str, graph_type, flags: Iterable = ()) -> tuple:
+        """Key of a document in a branch"""
+        return (_graph_name(graph_type), _document_id(doc_id)) + tuple(flags)
+
+    def get(self, branch: tuple, key: tuple):
+        """Get the cached (content, data version) of a document, None if not cached"""
+        with self._lock:
+            entry = self._entries.get((branch, key))
+            if entry is not None and self.ttl is not None:
+                if entry[2] + self.ttl < time.monotonic():
+                    self._remove((branch, key))
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((branch, key))
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def generation(self, branch: tuple) -> int:
+        """Generation of a branch, to take before reading documents to cache"""
+        with self._lock:
+            return self._generations.setdefault(branch, 0)
+
+    def put(
+        self,
+        branch: tuple,
+        key: tuple,
+        content: bytes,
+        version: Optional[str],
+        generation: Optional[int] = None,
+    ):
+        """Cache the encoded content of a document read at `version`.
+
+        With the `generation` of the branch taken before the read, the
+        document is not cached if the branch changed since."""
+        size = len(content)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if not self._current(branch, generation):
+                return
+            if version != self._versions.get(branch):
+                self._observe(branch, version)
+            self._remove((branch, key))
+            self._entries[(branch, key)] = (content, version, time.monotonic())
+            self._branches.setdefault(branch, set()).add(key)
+            self._size += size
+            while (
+                len(self._entries) > self.max_documents or self._size > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def observe(
+        self, branch: tuple, version: Optional[str], generation: Optional[int] = None
+    ):
+        """Record the data version of a branch seen in a response, dropping its entries if it moved.
+
+        With the `generation` of the branch taken before the request, the
+        version is ignored if the branch changed since."""
+        with self._lock:
+            if self._current(branch, generation):
+                self._observe(branch, version)
+
+    def _current(self, branch, generation):
+        return generation is None or generation == self._generations.get(branch, 0)
+
+    def _changed(self, branch):
+        self._generations[branch] = self._generations.get(branch, 0) + 1
+
+    def _observe(self, branch, version):
+        if version is None:
+            return
+        if self._versions.get(branch) != version:
+            self._drop(branch, None)
+            self._versions[branch] = version
+            self._changed(branch)
+
+    def written(
+        self,
+        branch: tuple,
+        graph_type,
+        ids: Optional[Iterable[str]] = None,
+        version: Optional[str] = None,
+    ):
+        """Drop the documents of a branch written by the client.
+
+        Parameters
+        ----------
+        branch : tuple
+            Branch written to.
+        graph_type : GraphType
+            Graph written to.
+        ids : iterable of str, optional
+            Ids of the documents written, all the documents of the branch if None.
+        version : str, optional
+            Data version of the branch after the write.
+        """
+        with self._lock:
+            if ids is None:
+                self._drop(branch, None)
+            else:
+                graph = _graph_name(graph_type)
+                self._drop(branch, {(graph, _document_id(doc_id)) for doc_id in ids})
+            if version is not None:
+                self._versions[branch] = version
+            self._changed(branch)
+
+    def invalidate(self, branch: Optional[tuple] = None):
+        """Drop all the entries of a branch, or all the entries if no branch is given.
+
+        A branch is given as a tuple starting with the team and the database,
+        so `(team, db)` drops all the entries of a database."""
+        with self._lock:
+            for cached in list(self._branches):
+                if branch is None or cached[: len(branch)] == branch:
+                    self._drop(cached, None)
+            for cached in list(self._versions):
+                if branch is None or cached[: len(branch)] == branch:
+                    del self._versions[cached]
+            for cached in self._generations:
+                if branch is None or cached[: len(branch)] == branch:
+                    self._changed(cached)
+
+    def clear(self):
+        """Drop all the entries"""
+        self.invalidate()
+
+    def stats(self) -> dict:
+        """Number of `documents`, their size in `bytes`, `hits`, `misses` and `evictions`"""
+        with self._lock:
+            return {
+                "documents": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _drop(self, branch, documents):
+        """Remove the entries of a branch, only of the (graph type, id) in `documents` if given"""
+        for key in list(self._branches.get(branch, ())):
+            if documents is None or key[:2] in documents:
+                self._remove((branch, key))
+
+    def _remove(self, entry_key):
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+            branch, key = entry_key
+            keys = self._branches.get(branch)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._branches[branch]
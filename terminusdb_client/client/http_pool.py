@@ -0,0 +1,178 @@
+"""http_pool.py
+Connection pooling, timeouts and retries for the requests session of Client"""
+
+import threading
+from typing import Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+# statuses worth retrying: the server (or a proxy in front of it) is
+# restarting or overloaded, the request was not processed
+RETRY_STATUSES = (502, 503, 504)
+_NO_RETRIES = Retry(0, read=False)
+
+
+class _PoolStatsMixin:
+    """Count the waits for a free connection and the discarded connections of a pool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.num_waits = 0
+        self.num_discards = 0
+
+    def _get_conn(self, timeout=None):
+        if self.block and self.pool is not None and self.pool.empty():
+            with self._stats_lock:
+                self.num_waits += 1
+        return super()._get_conn(timeout)
+
+    def _put_conn(self, conn):
+        if self.pool is not None and self.pool.full():
+            with self._stats_lock:
+                self.num_discards += 1
+        super()._put_conn(conn)
+
+
+class _StatsHTTPConnectionPool(_PoolStatsMixin, HTTPConnectionPool):
+    pass
+
+
+class _StatsHTTPSConnectionPool(_PoolStatsMixin, HTTPSConnectionPool):
+    pass
+
+
+class PoolAdapter(HTTPAdapter):
+    """HTTPAdapter with default timeouts, idempotent retries and pool statistics.
+
+    Parameters
+    ----------
+    pool_connections : int
+        Number of hosts to keep a connection pool for.
+    pool_maxsize : int
+        Maximum number of connections kept alive for each host.
+    pool_block : bool
+        If True, wait for a free connection when `pool_maxsize` connections to a host are in use, instead of opening (and later discarding) a new one.
+    connect_timeout : float, optional
+        Seconds to wait for a connection to the server, used when a request does not set a timeout.
+    read_timeout : float, optional
+        Seconds to wait for the server to send data, used when a request does not set a timeout.
+    retries : int
+        Number of retries on connection errors, read errors and 502/503/504 responses. Only idempotent requests (GET, HEAD, PUT, DELETE, OPTIONS, TRACE) are retried, and not the ones streaming their body from an iterator, which the first attempt consumes.
+    backoff_factor : float
+        Exponential backoff between retries, sleeping `backoff_factor * 2 ** (retry - 1)` seconds.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["timeout"]
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        retries: int = 0,
+        backoff_factor: float = 0.5,
+    ):
+        if connect_timeout is None and read_timeout is None:
+            self.timeout = None
+        else:
+            self.timeout = (connect_timeout, read_timeout)
+        if retries:
+            max_retries = Retry(
+                total=retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                raise_on_status=False,
+            )
+        else:
+            max_retries = 0
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=pool_block,
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _StatsHTTPConnectionPool,
+            "https": _StatsHTTPSConnectionPool,
+        }
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.timeout
+        if self.max_retries.total and _one_shot(request.body):
+            # no retries: a retry would send an exhausted body
+            return self._without_retries().send(request, timeout=timeout, **kwargs)
+        return super().send(request, timeout=timeout, **kwargs)
+
+    def _without_retries(self) -> HTTPAdapter:
+        """Adapter sending with the same pools and no retries, built on first use"""
+        adapter = self.__dict__.get("_no_retries")
+        if adapter is None:
+            adapter = self._no_retries = _SharedPoolAdapter(self)
+        return adapter
+
+    def pool_stats(self) -> dict:
+        """Statistics of the connection pools, in total and by host"""
+        pools = self.poolmanager.pools
+        hosts = {}
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            hosts[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = _stats(
+                pool.num_requests,
+                pool.num_connections,
+                getattr(pool, "num_waits", 0),
+                getattr(pool, "num_discards", 0),
+            )
+        total = _stats(
+            *(
+                sum(host[name] for host in hosts.values())
+                for name in ("requests", "connections", "waits", "discards")
+            )
+        )
+        total["hosts"] = hosts
+        return total
+
+
+class _SharedPoolAdapter(HTTPAdapter):
+    """HTTPAdapter without retries, using the connection pools of another adapter"""
+
+    def __init__(self, adapter: HTTPAdapter):
+        self._adapter = adapter
+        super().__init__(max_retries=_NO_RETRIES)
+        self.proxy_manager = adapter.proxy_manager
+
+    def init_poolmanager(self, *args, **kwargs):
+        # the pools are the ones of `_adapter`
+        pass
+
+    @property
+    def poolmanager(self):
+        return self._adapter.poolmanager
+
+
+def _one_shot(body) -> bool:
+    """Whether a request body is an iterator that can only be sent once (files are rewound)"""
+    return hasattr(body, "__next__") and not hasattr(body, "seek")
+
+
+def _stats(requests, connections, waits, discards):
+    reused = max(requests - connections, 0)
+    return {
+        "requests": requests,
+        "connections": connections,
+        "reused": reused,
+        "reuse_rate": reused / requests if requests else 0.0,
+        "waits": waits,
+        "discards": discards,
+    }
@@ -0,0 +1,165 @@
+"""json_codec.py
+JSON codecs used for the request and response bodies.
+
+The codec works with UTF-8 bytes: responses are decoded from
+`Response.content` without making a `str` first, and documents are encoded
+straight to the bytes sent. `orjson` is used when it is installed, otherwise
+the standard library `json` module.
+
+Examples
+--------
+>>> from terminusdb_client import json_codec
+>>> json_codec.set_codec("json")  # use the standard library
+>>> json_codec.get_codec().name
+'json'
+"""
+
+import dataclasses
+import datetime as dt
+import enum
+import json
+import re
+import uuid
+from importlib import import_module
+from typing import Union
+
+# 19 digits or more may not fit in 64 bits, a long number (not in a string) is
+# only looked for once a run of digits is found
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+_LONG_DIGITS = re.compile(r"\d{19}")
+_LONG_NUMBER = {
+    bytes: re.compile(rb"(?:^|[:\[,])\s*-?\d{19}"),
+    str: re.compile(r"(?:^|[:\[,])\s*-?\d{19}"),
+}
+
+
+def _long_number(data) -> bool:
+    """Whether JSON `data` may hold an integer over 64 bits"""
+    if isinstance(data, str):
+        return bool(_LONG_DIGITS.search(data) and _LONG_NUMBER[str].search(data))
+    data = bytes(data)
+    # much faster than a regular expression on each byte
+    if data.translate(_DIGITS_TO_ZERO).find(b"0" * 19) == -1:
+        return False
+    return bool(_LONG_NUMBER[bytes].search(data))
+
+
+def _default(obj):
+    """Encode the values orjson encodes natively, so that both codecs encode the same values"""
+    if isinstance(obj, (dt.datetime, dt.date, dt.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONCodec:
+    """Codec using the standard library `json` module."""
+
+    name = "json"
+
+    def __init__(self):
+        self._encoder = json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":"), default=_default
+        )
+
+    def loads(self, data: Union[bytes, str]):
+        """Decode a JSON document from bytes (UTF-8) or str"""
+        return json.loads(data)
+
+    def dumps(self, obj) -> bytes:
+        """Encode `obj` as UTF-8 JSON bytes"""
+        return self._encoder.encode(obj).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec using `orjson`, falling back to `json` for what orjson does not support (e.g. integers over 64 bits)."""
+
+    name = "orjson"
+
+    def __init__(self):
+        super().__init__()
+        self._orjson = import_module("orjson")
+        self._options = self._orjson.OPT_NON_STR_KEYS
+        # some versions of orjson turn integers over 64 bits into floats
+        # instead of failing, their numbers need to be checked first
+        try:
+            self._lossy = isinstance(self._orjson.loads(b"18446744073709551616"), float)
+        except self._orjson.JSONDecodeError:
+            self._lossy = False
+
+    def loads(self, data):
+        if self._lossy and _long_number(data):
+            return super().loads(data)
+        try:
+            return self._orjson.loads(data)
+        except self._orjson.JSONDecodeError:
+            # e.g. an integer over 64 bits
+            return super().loads(data)
+
+    def dumps(self, obj):
+        try:
+            return self._orjson.dumps(obj, option=self._options)
+        except TypeError:
+            return super().dumps(obj)
+
+
+_CODECS = {"json": JSONCodec, "orjson": OrjsonCodec}
+
+
+def _default_codec():
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return JSONCodec()
+
+
+_codec = _default_codec()
+
+
+def get_codec() -> JSONCodec:
+    """Get the codec in use."""
+    return _codec
+
+
+def set_codec(codec: Union[str, JSONCodec]) -> JSONCodec:
+    """Set the codec used by all the clients.
+
+    Parameters
+    ----------
+    codec : str or JSONCodec
+        "json", "orjson" or a codec object with `loads` (from bytes) and `dumps` (to bytes) methods.
+
+    Returns
+    -------
+    JSONCodec
+        The codec in use.
+    """
+    global _codec
+    if isinstance(codec, str):
+        if codec not in _CODECS:
+            raise ValueError(
+                f"Unknown JSON codec '{codec}', available codecs: {', '.join(_CODECS)}"
+            )
+        try:
+            codec = _CODECS[codec]()
+        except ImportError:
+            raise ImportError(
+                f"Library '{codec}' is required, install it as follows: python -m pip install -U {codec}, or with the client: python -m pip install -U terminusdb[{codec}]"
+            )
+    _codec = codec
+    return _codec
+
+
+def loads(data: Union[bytes, str]):
+    """Decode JSON with the codec in use"""
+    return _codec.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Encode JSON as UTF-8 bytes with the codec in use"""
+    return _codec.dumps(obj)
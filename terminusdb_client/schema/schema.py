@@ -1,10 +1,22 @@
+import datetime as dt
+import inspect
 import json
 import urllib.parse as urlparse
 import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
 from copy import copy, deepcopy
 from enum import Enum, EnumMeta, _EnumDict
 from io import StringIO, TextIOWrapper
-from typing import List, Optional, Set, Union
+from typing import (
+    ForwardRef,
+    List,
+    Optional,
+    Set,
+    Union,
+    get_args,
+    get_origin,
+)
 
 from numpydoc.docscrape import ClassDoc
 from typeguard import check_type, TypeCheckError
@@ -95,10 +107,68 @@ def _check_cycling(class_obj: "TerminusClass"):
                 raise RecursionError(f"Embbding {prop_type} cause recursions.")
 
 
+def _class_id(class_obj) -> str:
+    """Id of a class in the schema, without building its dictionary for classes of this module"""
+    if isinstance(class_obj, (TerminusClass, EnumMetaTemplate)):
+        return class_obj.__name__
+    return class_obj._to_dict().get("@id")
+
+
+def _is_required(prop_type) -> bool:
+    """Check if a property type needs a value, i.e. it is not Optional or a Set"""
+    try:  # check to let Optional pass
+        check_type(None, prop_type)
+    except (TypeError, TypeCheckError):
+        try:  # extra check to let Set pass
+            check_type(set(), prop_type)
+        except (TypeError, TypeCheckError):
+            return True
+    return False
+
+
+class _ClassDescriptor:
+    """Types of a document class, computed once instead of with `_to_dict` for every object.
+
+    Attributes
+    ----------
+    properties : dict
+        TerminusDB type (str or dict) of each property.
+    required : list
+        Properties that need a value.
+    """
+
+    __slots__ = ("properties", "required")
+
+    def __init__(self, class_obj: "TerminusClass"):
+        _check_cycling(class_obj)
+        self.properties = {
+            attr: wt.to_woql_type(attr_type)
+            for attr, attr_type in class_obj._annotations.items()
+        }
+        self.required = [
+            attr
+            for attr, attr_type in class_obj._annotations.items()
+            if _is_required(attr_type)
+        ]
+
+
+def _enum_member(enum_class, value):
+    """Member of an Enum class with the value, found in a map built once per class"""
+    members = enum_class.__dict__.get("_terminus_members")
+    if members is None:
+        members = {}
+        for item in enum_class.__members__.values():
+            members[item._value_] = item
+        enum_class._terminus_members = members
+    if value not in members:
+        raise ValueError(f"{value} is not a value of {enum_class.__name__}.")
+    return members[value]
+
+
 def _check_mismatch_type(prop, prop_value, prop_type):
     if hasattr(prop_type, "_to_dict"):
-        prop_value_id = prop_value.__class__._to_dict().get("@id")
-        prop_type_id = prop_type._to_dict().get("@id")
+        prop_value_id = _class_id(prop_value.__class__)
+        prop_type_id = _class_id(prop_type)
         if prop_value_id != prop_type_id:
             raise ValueError(
                 f"Property {prop} should be of type {prop_type_id} but got value of type {prop_value_id}"
@@ -120,22 +190,290 @@ def _check_mismatch_type(prop, prop_value, prop_type):
     return prop_value
 
 
+_VALIDATION_LEVELS = ("full", "fast", "off")
+_validation_level = ContextVar("terminusdb_validation_level", default="full")
+
+
+def get_validation_level() -> str:
+    """Get the level of the type validation done when a property of a document is set."""
+    return _validation_level.get()
+
+
+def _check_validation_level(level):
+    if level not in _VALIDATION_LEVELS:
+        raise ValueError(
+            f"Unknown validation level '{level}', available levels: {', '.join(_VALIDATION_LEVELS)}"
+        )
+
+
+def set_validation_level(level: str) -> str:
+    """Set the level of the type validation done when a property of a document is set.
+
+    The level is set for the current context: other threads and asyncio tasks started before keep their own level, new threads start at "full".
+
+    Parameters
+    ----------
+    level : str
+        "full" (default) checks the values against the types of the properties with typeguard, "fast" only checks the classes of the values with isinstance (not the items of lists and sets), "off" does not check nor convert the values, for trusted data.
+
+    Returns
+    -------
+    str
+        The previous level.
+    """
+    _check_validation_level(level)
+    previous = _validation_level.get()
+    _validation_level.set(level)
+    return previous
+
+
+@contextmanager
+def validation_level(level: str):
+    """Set the level of the type validation within a `with` block, see `set_validation_level`.
+
+    Only the code of the block, in the current thread or asyncio task, runs at this level.
+
+    Examples
+    --------
+    >>> with validation_level("off"):
+    ...     people = [Person(name=row["name"], age=row["age"]) for row in trusted_rows]
+    """
+    _check_validation_level(level)
+    reset_token = _validation_level.set(level)
+    try:
+        yield
+    finally:
+        _validation_level.reset(reset_token)
+
+
+def _cast_int(value):
+    try:
+        return int(value)
+    except ValueError:
+        raise TypeError(f"Unable to cast as int: {value}")
+
+
+def _runtime_classes(prop_type) -> Optional[tuple]:
+    """Classes that the values of a type are instances of, None if they cannot be checked with isinstance"""
+    while hasattr(prop_type, "__supertype__"):
+        prop_type = prop_type.__supertype__
+    origin = get_origin(prop_type)
+    if origin is Union:
+        classes = ()
+        for arg in get_args(prop_type):
+            if arg is not type(None):
+                arg_classes = _runtime_classes(arg)
+                if arg_classes is None:
+                    return None
+                classes += arg_classes
+        return classes
+    if origin is not None:
+        # Set, List etc, the items are not checked
+        return (origin,)
+    if prop_type is float:
+        return (int, float)
+    if isinstance(prop_type, type):
+        return (prop_type,)
+    # forward references
+    return None
+
+
+def _compile_validator(prop, prop_type, level):
+    """Function checking (and converting) the values of a property at a validation level"""
+    if prop_type is int:
+        return _cast_int
+    if hasattr(prop_type, "_to_dict"):
+        prop_type_id = _class_id(prop_type)
+        if level == "fast":
+
+            def validate(value):
+                if not isinstance(value, prop_type):
+                    raise ValueError(
+                        f"Property {prop} should be of type {prop_type_id} but got value of type {type(value).__name__}"
+                    )
+                return value
+
+        else:
+
+            def validate(value):
+                prop_value_id = _class_id(value.__class__)
+                if prop_value_id != prop_type_id:
+                    raise ValueError(
+                        f"Property {prop} should be of type {prop_type_id} but got value of type {prop_value_id}"
+                    )
+                return value
+
+        return validate
+    if level == "fast":
+        classes = _runtime_classes(prop_type)
+        if classes is None:
+            return lambda value: value
+
+        def validate(value):
+            if not isinstance(value, classes):
+                raise TypeError(
+                    f"Property {prop} should be of type {prop_type} but got value of type {type(value).__name__}"
+                )
+            return value
+
+        return validate
+
+    def validate(value):
+        _check_mismatch_type(prop, value, prop_type)
+        return value
+
+    return validate
+
+
 def _check_missing_prop(doc_obj: "DocumentTemplate"):
     """Helper function to check if the the document is missing properties (and if they are right types)"""
     class_obj = doc_obj.__class__
+    for prop in class_obj._get_descriptor().required:
+        if not hasattr(doc_obj, prop):
+            raise ValueError(f"{doc_obj} missing property: {prop}")
+        else:
+            prop_value = getattr(doc_obj, prop)
+            prop_type = class_obj._annotations[prop]
+            # a value of exactly the class of the property always matches
+            if prop_value.__class__ is not prop_type:
+                _check_mismatch_type(prop, prop_value, prop_type)
+            # raise TypeError(f"Property of {doc_obj} missing should be type {prop_type} but got {prop_value} which is {type(prop_value)}")
+
+
+_PLAIN_TYPES = frozenset((str, int, float, bool))
+_DATE_TYPES = frozenset((dt.datetime, dt.date, dt.time))
+
+
+def _value_to_dict(value, references):
+    """JSON value of a property, for the values without a specialized conversion"""
+    # object properties
+    if hasattr(value, "_embedded_rep"):
+        return _embedded_to_dict(value, references)
+    # handle list and set (set end up passing as list for jsonlize)
+    if isinstance(value, (list, set)):
+        return [_item_to_dict(item, references) for item in value]
+    # Enum and datatypes
+    if isinstance(value, Enum):
+        return str(value)
+    return wt.datetime_to_woql(value)
+
+
+def _item_to_dict(item, references):
+    """JSON value of an item of a list or set property"""
+    if hasattr(item, "_embedded_rep"):
+        return _embedded_to_dict(item, references)
+    if isinstance(item, Enum):
+        return str(item)
+    return item
+
+
+def _embedded_to_dict(obj: "DocumentTemplate", references: dict):
+    """JSON value of a document used as a property, objects without id are added to `references`"""
+    class_obj = obj.__class__
+    if hasattr(class_obj, "_subdocument"):
+        _check_missing_prop(obj)
+        return class_obj._get_serializer()(obj, references)
+    obj_id = obj._id
+    if obj_id:
+        return {"@id": obj_id, "@type": "@id"}
+    references[obj._capture] = obj
+    return {"@ref": obj._capture}
+
+
+def _serializer_kind(prop_type) -> str:
+    """Kind of the values of a type for the serializer: "plain", "date", "enum", "document", "collection" or "any" """
+    while hasattr(prop_type, "__supertype__"):
+        prop_type = prop_type.__supertype__
+    origin = get_origin(prop_type)
+    if origin is Union:
+        args = [arg for arg in get_args(prop_type) if arg is not type(None)]
+        return _serializer_kind(args[0]) if len(args) == 1 else "any"
+    if origin in (list, set):
+        return "collection"
+    if prop_type in _PLAIN_TYPES:
+        return "plain"
+    if prop_type in _DATE_TYPES:
+        return "date"
+    if isinstance(prop_type, type) and issubclass(prop_type, Enum):
+        return "enum"
+    if isinstance(prop_type, (str, ForwardRef, TerminusClass)):
+        return "document"
+    return "any"
+
+
+# expressions converting `value` (not None) of each kind, the guards fall back
+# to the generic conversion for values not of the type of the property
+_VALUE_CODE = {
+    "plain": "value if value.__class__ in _PLAIN_TYPES else _value_to_dict(value, references)",
+    "date": "value.isoformat() if value.__class__ in _DATE_TYPES else _value_to_dict(value, references)",
+    "enum": "str(value) if isinstance(value, Enum) else _value_to_dict(value, references)",
+    "document": "_embedded_to_dict(value, references) if isinstance(value, DocumentTemplate) else _value_to_dict(value, references)",
+    "any": "_value_to_dict(value, references)",
+}
+# expressions converting an `item` of a list or set, datatypes are kept as they are
+_ITEM_CODE = {
+    "plain": "item if item.__class__ in _PLAIN_TYPES else _item_to_dict(item, references)",
+    "enum": "str(item) if isinstance(item, Enum) else _item_to_dict(item, references)",
+    "document": "_embedded_to_dict(item, references) if isinstance(item, DocumentTemplate) else _item_to_dict(item, references)",
+}
+
+
+def _compile_serializer(class_obj: "TerminusClass"):
+    """Generate the function turning the objects of a class into dicts.
+
+    The function is specialized for the types of the properties, so the
+    conversion of each value is picked once for the class instead of for every
+    value. It takes the object and the dict of references to fill, and returns
+    the dict of the object.
+    """
+    lines = [
+        "def serialize(obj, references):",
+        f"    result = {{'@type': {str(class_obj)!r}}}",
+        "    obj_id = obj._id",
+        "    if obj_id:",
+        "        result['@id'] = obj_id",
+    ]
+    if not hasattr(class_obj, "_subdocument"):
+        lines += ["    else:", "        result['@capture'] = obj._capture"]
     for prop, prop_type in class_obj._annotations.items():
-        try:  # check to let Optional pass
-            check_type(None, prop_type)
-        except (TypeError, TypeCheckError):
-            try:  # extra check to let Set pass
-                check_type(set(), prop_type)
-            except (TypeError, TypeCheckError):
-                if not hasattr(doc_obj, prop):
-                    raise ValueError(f"{doc_obj} missing property: {prop}")
-                else:
-                    prop_value = getattr(doc_obj, prop)
-                    _check_mismatch_type(prop, prop_value, prop_type)
-                    # raise TypeError(f"Property of {doc_obj} missing should be type {prop_type} but got {prop_value} which is {type(prop_value)}")
+        kind = _serializer_kind(prop_type)
+        if kind == "collection":
+            item_types = get_args(prop_type) or (None,)
+            item_code = _ITEM_CODE.get(
+                _serializer_kind(item_types[0]), "_item_to_dict(item, references)"
+            )
+            code = f"[{item_code} for item in value] if isinstance(value, (list, set)) else _value_to_dict(value, references)"
+        else:
+            code = _VALUE_CODE[kind]
+        lines += [
+            f"    value = getattr(obj, {prop!r}, None)",
+            "    if value is not None:",
+            f"        result[{prop!r}] = {code}",
+        ]
+    lines.append("    return result")
+    namespace = {
+        "_PLAIN_TYPES": _PLAIN_TYPES,
+        "_DATE_TYPES": _DATE_TYPES,
+        "Enum": Enum,
+        "DocumentTemplate": DocumentTemplate,
+        "_value_to_dict": _value_to_dict,
+        "_item_to_dict": _item_to_dict,
+        "_embedded_to_dict": _embedded_to_dict,
+    }
+    exec("\n".join(lines), namespace)  # noqa: S102
+    return namespace["serialize"]
+
+
+def _index_object(obj: "DocumentTemplate", old_id: Optional[str]):
+    """Move an object in the identity map of its class after its id changed"""
+    identity = obj.__class__._identity
+    new_id = obj._id
+    if new_id == old_id:
+        return
+    if old_id is not None and identity.get(old_id) is obj:
+        del identity[old_id]
+    if new_id is not None:
+        identity[new_id] = obj
 
 
 def _check_and_fix_custom_id(class_name, custom_id):
@@ -179,7 +517,11 @@ class TerminusClass(type):
 
         # _abstract should not be inherited
         cls._abstract = nmspc.get("_abstract")
-        cls._instances = set()
+        cls._instances = weakref.WeakSet()
+        # id -> object, entries go away with the objects
+        cls._identity = weakref.WeakValueDictionary()
+        # (validation level, property) -> validator
+        cls._validators = {}
 
         def init(obj, *args, **kwargs):
             if abstract:
@@ -204,7 +546,7 @@ class TerminusClass(type):
                 obj._backend_id = kwargs.get("_backend_id")
             obj._isinstance = True
             obj._annotations = cls._annotations
-            obj._instances.add(weakref.ref(obj))
+            obj._instances.add(obj)
 
             obj._capture = f"{name}{id(cls)}/{cls._capture_order}"
             cls._capture_order += 1
@@ -219,15 +561,33 @@ class TerminusClass(type):
         # super().__init__(name, bases, nmspc)
         globals()[name] = cls
 
+    def _get_descriptor(cls) -> _ClassDescriptor:
+        """Descriptor of the types of the class, built on first use"""
+        descriptor = cls.__dict__.get("_descriptor")
+        if descriptor is None:
+            descriptor = _ClassDescriptor(cls)
+            cls._descriptor = descriptor
+        return descriptor
+
+    def _get_validator(cls, prop, level):
+        """Validator of a property at a validation level, compiled on first use"""
+        validator = cls._validators.get((level, prop))
+        if validator is None:
+            validator = _compile_validator(prop, cls._annotations.get(prop), level)
+            cls._validators[(level, prop)] = validator
+        return validator
+
+    def _get_serializer(cls):
+        """Serializer of the objects of the class, generated on first use"""
+        serializer = cls.__dict__.get("_serializer")
+        if serializer is None:
+            serializer = _compile_serializer(cls)
+            cls._serializer = serializer
+        return serializer
+
     def get_instances(cls):
-        dead = set()
-        for ref in cls._instances:
-            obj = ref()
-            if obj is not None:
-                yield obj
-            else:
-                dead.add(ref)
-        cls._instances -= dead
+        # a copy, objects can be created while iterating
+        yield from list(cls._instances)
 
     def __repr__(cls):
         return cls.__name__
@@ -239,24 +599,23 @@ class DocumentTemplate(metaclass=TerminusClass):
 
     def __setattr__(self, name, value):
         if name[0] != "_" and value is not None:
-            correct_type = self._annotations.get(name)
-            if correct_type is int:
-                try:
-                    value = int(value)
-                except ValueError:
-                    raise TypeError(f"Unable to cast as int: {value}")
-            _check_mismatch_type(name, value, correct_type)
+            level = _validation_level.get()
+            if level != "off":
+                value = self.__class__._get_validator(name, level)(value)
         if (
-            self._id
-            and hasattr(self, "_key")
-            and hasattr(self._key, "_keys")
-            and name in self._key._keys
+            name in getattr(getattr(self, "_key", None), "_keys", ())
+            and self._id
             and value != getattr(self, name)
         ):
             raise ValueError(
                 f"{name} has been used to generate the id, hence cannot be changed."
             )
-        super().__setattr__(name, value)
+        if name in ("_backend_id", "_custom_id"):
+            old_id = self._id
+            super().__setattr__(name, value)
+            _index_object(self, old_id)
+        else:
+            super().__setattr__(name, value)
 
     @classmethod
     def _to_dict(cls, skip_checking=False):
@@ -331,58 +690,8 @@ class DocumentTemplate(metaclass=TerminusClass):
     def _obj_to_dict(self, skip_checking=False):
         if not skip_checking:
             _check_missing_prop(self)
-        result = {"@type": str(self.__class__)}
-        if hasattr(self, "_id") and self._id:
-            result["@id"] = self._id
-        elif not hasattr(self, "_subdocument"):
-            result["@capture"] = self._capture
-
         references = {}
-        for item in self._annotations.keys():
-            if hasattr(self, item):
-                the_item = eval(f"self.{item}")  # noqa: S307
-                if the_item is not None:
-                    # object properties
-                    if hasattr(the_item, "_embedded_rep"):
-                        ref_obj = the_item._embedded_rep()
-                        if "@ref" in ref_obj:
-                            references[ref_obj["@ref"]] = the_item
-                        elif "@id" in ref_obj:
-                            pass
-                        else:
-                            (sub_item, refs) = ref_obj
-                            references = {**references, **refs}
-                            ref_obj = sub_item
-                        result[item] = ref_obj
-                    # handle list and set (set end up passing as list for jsonlize)
-                    elif isinstance(the_item, (list, set)):
-                        new_item = []
-                        for sub_item in the_item:
-                            # inner is object properties
-                            if hasattr(sub_item, "_embedded_rep"):
-                                ref_obj = sub_item._embedded_rep()
-                                if "@ref" in ref_obj:
-                                    references[ref_obj["@ref"]] = sub_item
-                                elif "@id" in ref_obj:
-                                    pass
-                                else:
-                                    (sub_item, refs) = ref_obj
-                                    references = {**references, **refs}
-                                    ref_obj = sub_item
-                                new_item.append(ref_obj)
-                            # inner is Enum
-                            elif isinstance(sub_item, Enum):
-                                new_item.append(str(sub_item))
-                            # inner is datatypes
-                            else:
-                                new_item.append(sub_item)
-                        result[item] = new_item
-                    # Enum and datatypes
-                    else:
-                        if isinstance(the_item, Enum):
-                            result[item] = str(the_item)
-                        else:
-                            result[item] = wt.datetime_to_woql(the_item)
+        result = self.__class__._get_serializer()(self, references)
         return (result, references)
 
 
@@ -637,15 +946,15 @@ class Schema:
                 f"{obj_type} is not in current schema. (Received {obj_dict})"
             )
         type_class = self.object.get(obj_type)
-        type_dict = type_class._to_dict()
+        properties = type_class._get_descriptor().properties
         params = {}
 
         def create_obj(type_class, obj_id, params):
-            for obj in type_class.get_instances():
-                if obj._id == obj_id:
-                    for key, value in params.items():
-                        setattr(obj, key, value)
-                    return obj
+            obj = type_class._identity.get(obj_id)
+            if obj is not None:
+                for key, value in params.items():
+                    setattr(obj, key, value)
+                return obj
             params["_backend_id"] = obj_id
             new_obj = type_class.__new__(type_class)
             new_obj.__init__(new_obj, **params)
@@ -690,17 +999,13 @@ class Schema:
                 if isinstance(value_class, TerminusClass):
                     return create_obj(value_class, value, {})
                 else:
-                    the_key = None
-                    for key, item in value_class.__members__.items():
-                        if item._value_ == value:
-                            the_key = key
-                    return eval(f"value_class.{the_key}")  # noqa: S307
+                    return _enum_member(value_class, value)
             else:
-                raise ValueError(f"Schema {type_dict} is not correct.")
+                raise ValueError(f"Schema {type_class._to_dict()} is not correct.")
 
         for key, value in obj_dict.items():
             if key[0] != "@":
-                params[key] = convert_if_object(type_dict[key], value)
+                params[key] = convert_if_object(properties[key], value)
             elif key == "@id":
                 # params["_id"] = value
                 obj_id = value
@@ -737,6 +1042,8 @@ class Schema:
     ):
         """Commit the schema to database
 
+        With an `AsyncClient`, returns a coroutine to be awaited.
+
         Parameters
         ----------
         client: Client
@@ -746,12 +1053,10 @@ class Schema:
         full_replace : bool
             Does the commit fully wiped out the old shcema graph. Default to be False.
         """
+        if inspect.iscoroutinefunction(client._get_prefixes):
+            return self._async_commit(client, commit_msg, full_replace)
         if self.context["@schema"] is None or self.context["@base"] is None:
-            prefixes = client._get_prefixes()
-            if self.context["@schema"] is None:
-                self.schema_ref = prefixes["@schema"]
-            if self.context["@base"] is None:
-                self.base_ref = prefixes["@base"]
+            self._set_prefixes(client._get_prefixes())
         if commit_msg is None:
             commit_msg = "Schema object insert/ update by Python client."
         if full_replace:
@@ -768,6 +1073,33 @@ class Schema:
                 graph_type=GraphType.SCHEMA,
             )
 
+    async def _async_commit(self, client, commit_msg, full_replace):
+        """`commit` with an `AsyncClient`"""
+        if self.context["@schema"] is None or self.context["@base"] is None:
+            self._set_prefixes(await client._get_prefixes())
+        if commit_msg is None:
+            commit_msg = "Schema object insert/ update by Python client."
+        if full_replace:
+            await client.insert_document(
+                self,
+                commit_msg=commit_msg,
+                graph_type=GraphType.SCHEMA,
+                full_replace=True,
+            )
+        else:
+            await client.update_document(
+                self,
+                commit_msg=commit_msg,
+                graph_type=GraphType.SCHEMA,
+            )
+
+    def _set_prefixes(self, prefixes):
+        """Use the prefixes of the database for the ones not set"""
+        if self.context["@schema"] is None:
+            self.schema_ref = prefixes["@schema"]
+        if self.context["@base"] is None:
+            self.base_ref = prefixes["@base"]
+
     def from_db(self, client: Client, select: Optional[List[str]] = None):
         """Load classes in the database schema into schema
 
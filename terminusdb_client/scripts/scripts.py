@@ -1,10 +1,15 @@
 import builtins
 import datetime as dt
 import enum
+import io
 import json
 import os
+import queue
 import shutil
 import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
 from importlib import import_module
 
 import click
@@ -14,8 +19,10 @@ from tqdm import tqdm
 
 from .. import woql_type as wt
 from ..client.Client import Client
+from ..client.bulk_loader import BulkLoader
 from ..errors import InterfaceError
-from ..woqldataframe.woqlDataframe import result_to_df
+from ..woqldataframe.woqlArrow import _import_pyarrow, parquet_to_documents
+from ..woqldataframe.woqlDataframe import result_to_df_chunks
 from ..woqlschema.woql_schema import WOQLSchema
 
 
@@ -66,6 +73,310 @@ def _df_to_schema(
     return class_dict
 
 
+def _csv_column(col):
+    """Name of the property of a CSV column"""
+    return col.lower().replace(" ", "_").replace(".", "_")
+
+
+def _df_to_documents(
+    class_name, df, embedded=None, id_col=None, na_mode=None, keys=None
+):
+    """Convert the rows of a pandas DataFrame to TerminusDB documents.
+
+    Missing values, ids and embedded references are computed a column at a
+    time, only the documents themselves are built row by row.
+
+    Args:
+        class_name: Name of the schema class of the documents
+        df: pandas DataFrame with the renamed columns
+        embedded: List of column names to treat as embedded references
+        id_col: Column name to use as document ID
+        na_mode: NA handling mode ('error', 'skip', or 'optional')
+        keys: List of column names to use as keys
+
+    Returns:
+        list: documents of the rows
+    """
+    if keys is None:
+        keys = []
+    if embedded is None:
+        embedded = []
+
+    columns = list(df.columns)
+    missing = df.isna() if na_mode == "optional" else None
+    if missing is not None:
+        for key in keys:
+            if key in missing.columns and missing[key].any():
+                row = df[missing[key]].iloc[0].to_dict()
+                raise RuntimeError(
+                    f"{key} is used as a key but missing in {row}. Cannot import CSV."
+                )
+    if id_col and (
+        id_col not in columns or (missing is not None and missing[id_col].any())
+    ):
+        raise RuntimeError(f"id {id_col} is missing in the CSV. Cannot import CSV.")
+
+    values = []
+    for col in columns:
+        if col in embedded:
+            refs = (class_name + "/" + df[col].astype(str)).tolist()
+            values.append([{"@type": "@id", "@id": ref} for ref in refs])
+        else:
+            values.append(df[col].tolist())
+    if id_col:
+        ids = (class_name + "/" + df[id_col].astype(str)).tolist()
+    elif keys:
+        ids = ["_".join(keys)] * len(df)
+    elif na_mode == "optional":
+        ids = None
+    else:
+        ids = ["_".join(columns)] * len(df)
+
+    # only the columns with missing values are checked in each row
+    partial = []
+    if missing is not None:
+        partial = [col for col in columns if missing[col].any()]
+    present = (~missing[partial]).to_numpy() if partial else None
+
+    documents = []
+    for index, row in enumerate(zip(*values)):
+        document = dict(zip(columns, row))
+        if partial:
+            for col, keep in zip(partial, present[index]):
+                if not keep:
+                    del document[col]
+        document["@type"] = class_name
+        if ids is not None:
+            document["@id"] = ids[index]
+        documents.append(document)
+    return documents
+
+
+def _transform_chunk(class_name, df, embedded, id_col, na_mode, keys):
+    """Documents of a chunk of CSV and the seconds taken, run in the transform workers"""
+    start = time.perf_counter()
+    documents = _df_to_documents(class_name, df, embedded, id_col, na_mode, keys)
+    return documents, time.perf_counter() - start
+
+
+class _Throughput:
+    """Rows processed and seconds spent by each stage of the import"""
+
+    def __init__(self, stages):
+        self._lock = threading.Lock()
+        self.rows = dict.fromkeys(stages, 0)
+        self.seconds = dict.fromkeys(stages, 0.0)
+
+    def add(self, stage, rows, seconds):
+        with self._lock:
+            self.rows[stage] += rows
+            self.seconds[stage] += seconds
+
+    def __str__(self):
+        with self._lock:
+            rates = []
+            for stage, rows in self.rows.items():
+                seconds = self.seconds[stage]
+                rate = rows / seconds if seconds else 0
+                rates.append(f"{stage} {rate:,.0f} rows/s")
+            return ", ".join(rates)
+
+
+def _import_pipeline(chunks, prepare, upload, workers=0, inflight=2):
+    """Read, transform and upload chunks of CSV concurrently.
+
+    The chunks are read and prepared in the calling thread, turned into
+    documents by a pool of `workers` processes (in the calling thread if 0)
+    and uploaded in order by another thread. At most `inflight` chunks are
+    waiting to be uploaded, so reading is held back by a slow server.
+
+    Args:
+        chunks: iterable of DataFrames read from the CSV
+        prepare: function of a DataFrame, returning the arguments of `_transform_chunk`
+        upload: function of the index of a chunk and its documents, uploading them
+        workers: number of transform processes
+        inflight: maximum number of chunks between reading and uploading
+
+    Returns:
+        _Throughput: rows per second of the read, transform and upload stages
+    """
+    throughput = _Throughput(("read", "transform", "upload"))
+    pending = queue.Queue(maxsize=inflight)
+    failure = []
+
+    def uploader():
+        with tqdm(unit=" chunks") as progress:
+            while True:
+                item = pending.get()
+                if item is None:
+                    return
+                index, future = item
+                if failure:
+                    # keep draining so that the reader is never blocked
+                    future.cancel()
+                    continue
+                try:
+                    documents, seconds = future.result()
+                    throughput.add("transform", len(documents), seconds)
+                    start = time.perf_counter()
+                    upload(index, documents)
+                    throughput.add(
+                        "upload", len(documents), time.perf_counter() - start
+                    )
+                except Exception as error:
+                    failure.append(error)
+                    continue
+                progress.update()
+                progress.set_postfix_str(str(throughput))
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    thread = threading.Thread(target=uploader, daemon=True)
+    thread.start()
+    try:
+        chunks = iter(chunks)
+        index = 0
+        while not failure:
+            start = time.perf_counter()
+            df = next(chunks, None)
+            if df is None:
+                break
+            throughput.add("read", len(df), time.perf_counter() - start)
+            args = prepare(df)
+            if executor is None:
+                future = Future()
+                future.set_result(_transform_chunk(*args))
+            else:
+                future = executor.submit(_transform_chunk, *args)
+            pending.put((index, future))
+            index += 1
+    finally:
+        pending.put(None)
+        thread.join()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    if failure:
+        raise failure[0]
+    return throughput
+
+
+# bytes of the CSV file scanned for the ends of the records at a time
+_CSV_BLOCK_SIZE = 1 << 20
+
+
+def _csv_record(csv_file):
+    """Read the bytes of the next record of a CSV file, empty at the end of the file"""
+    record = csv_file.readline()
+    # an odd number of quotes means a quoted field goes on in the next line
+    while record.count(b'"') % 2:
+        line = csv_file.readline()
+        if not line:
+            break
+        record += line
+    return record
+
+
+def _read_csv_chunks(pd, np, csv_file, chunksize, offset=0, **kwargs):
+    """Read a CSV file into DataFrames of `chunksize` records.
+
+    The ends of the records (the line breaks outside quoted fields) are found
+    with numpy on large blocks of the file, and each chunk is parsed once by
+    pandas with the header of the file. Each DataFrame is given with the byte
+    offset of the end of its records, which can be used as `offset` to read
+    the rest of the file later without parsing the records before it.
+
+    Args:
+        pd: pandas module reference
+        np: numpy module reference
+        csv_file: path of the CSV file
+        chunksize: number of records of the DataFrames
+        offset: byte offset to start reading records from, 0 for the first record
+        kwargs: options of pandas.read_csv (e.g. sep, dtype)
+
+    Returns:
+        iterable of (DataFrame, offset) tuples
+    """
+
+    def parse(data):
+        return pd.read_csv(io.BytesIO(header + data), **kwargs)
+
+    with open(csv_file, "rb") as csv:
+        header = _csv_record(csv)
+        if offset:
+            csv.seek(offset)
+        else:
+            offset = csv.tell()
+        pending = b""
+        records = 0
+        quoted = False
+        while True:
+            block = csv.read(_CSV_BLOCK_SIZE)
+            if not block:
+                break
+            data = np.frombuffer(block, dtype=np.uint8)
+            # parity of the quotes up to each byte, odd within a quoted field
+            parity = (np.cumsum(data == ord('"')) + quoted) % 2
+            ends = np.flatnonzero((data == ord("\n")) & (parity == 0))
+            quoted = bool(parity[-1])
+            start = 0
+            for index in range(chunksize - records - 1, len(ends), chunksize):
+                end = int(ends[index]) + 1
+                chunk = pending + block[start:end]
+                pending = b""
+                start = end
+                offset += len(chunk)
+                yield parse(chunk), offset
+            records = (records + len(ends)) % chunksize
+            pending += block[start:]
+        if pending.strip():
+            yield parse(pending), offset + len(pending)
+
+
+def _branch_head(client):
+    """Last commit of the branch of the client, None if there is none yet"""
+    try:
+        return client._get_current_commit()
+    except IndexError:
+        return None
+
+
+def _check_checkpoint(saved, progress):
+    """Check an import is resumed with the CSV file and the options it was started with"""
+    if saved["csv_file"] != progress["csv_file"]:
+        raise InterfaceError(
+            f"The checkpoint is of the import of {saved['csv_file']}, not {progress['csv_file']}."
+        )
+    if saved["chunksize"] != progress["chunksize"]:
+        raise InterfaceError(
+            f"The import was started with --chunksize {saved['chunksize']}, it needs to be resumed with the same chunksize."
+        )
+    options = saved.get("options", {})
+    changed = [
+        name
+        for name, value in progress["options"].items()
+        if options.get(name) != value
+    ]
+    if changed:
+        raise InterfaceError(
+            f"The import was started with other {', '.join(changed)} options, it needs to be resumed with the same options."
+        )
+
+
+def _load_checkpoint(filename):
+    """Load the checkpoint of an import, None if there is none"""
+    if not os.path.exists(filename):
+        return None
+    with open(filename) as file:
+        return json.load(file)
+
+
+def _save_checkpoint(filename, checkpoint):
+    """Replace the checkpoint of an import, never leaving a partly written file"""
+    temporary = filename + ".tmp"
+    with open(temporary, "w") as file:
+        json.dump(checkpoint, file, indent=2)
+    os.replace(temporary, filename)
+
+
 @click.group()
 def tdbpy():
     pass
@@ -466,9 +777,45 @@ def deletedb():
     show_default=True,
     help="Specify separator character in the CSV",
 )
+@click.option(
+    "--workers",
+    default=0,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Number of processes turning the chunks into documents, 0 to do it while reading",
+)
+@click.option(
+    "--inflight",
+    default=2,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of chunks read but not uploaded yet",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue an import from its checkpoint, skipping the chunks already committed. The import is resumed with the same CSV file and options. A chunk is taken as committed if the branch moved on since the checkpoint, do not commit to the branch while an import is stopped",
+)
+@click.option(
+    "--checkpoint",
+    help="Checkpoint file written after each committed chunk, default to be the CSV file name with '.checkpoint'",
+)
 # @click.option('--header ', default=',', show_default=True)
 def importcsv(
-    csv_file, keys, class_name, chunksize, schema, na, id_, embedded, message, sep
+    csv_file,
+    keys,
+    class_name,
+    chunksize,
+    schema,
+    na,
+    id_,
+    embedded,
+    message,
+    sep,
+    workers,
+    inflight,
+    resume,
+    checkpoint,
 ):
     """Import CSV file into pandas DataFrame then into TerminusDB, with read_csv() options.
     Options like chunksize, sep etc"""
@@ -552,82 +899,116 @@ def importcsv(
         #     class_dict["@key"] = {"@type": "Random"}
         return class_dict
 
-    with pd.read_csv(csv_file, sep=sep, chunksize=chunksize, dtype=dtype) as reader:
-        for df in tqdm(reader):
-            if any(df.isna().any()) and na == "error":
-                raise RuntimeError(
-                    f"{df}\nThere is NA in the data and cannot be automatically load in. Use --na options to remove all records with NA or make properties optional to accept missing data."
-                )
-            elif na == "skip":
-                df.dropna(inplace=True)
-            for col in df.columns:
-                converted_col = col.lower().replace(" ", "_").replace(".", "_")
-                df.rename(columns={col: converted_col}, inplace=True)
-            if not has_schema:
-                class_dict = _df_to_schema(class_name, df)
-                if message is None:
-                    schema_msg = f"Schema object insert/ update with {csv_file} by Python client."
-                else:
-                    schema_msg = message + " (schema update)"
-                client.update_document(
-                    class_dict,
-                    commit_msg=schema_msg,
-                    graph_type="schema",
-                )
-                click.echo(
-                    f"\nSchema object {class_name} created with {csv_file} being imported into database."
-                )
-                _sync(client)
-                has_schema = True
-
-            obj_list = df.to_dict(orient="records")
-            for item in obj_list:
-                # handle missing items
-                if na == "optional":
-                    bad_key = []
-                    for key, value in item.items():
-                        if pd.isna(value):
-                            if key in keys:
-                                raise RuntimeError(
-                                    f"{key} is used as a key but missing in {item}. Cannot import CSV."
-                                )
-                            bad_key.append(key)
-                    for key in bad_key:
-                        item.pop(key)
-                # handle embedded items
-                if embedded:
-                    new_items = {}
-                    for key, value in item.items():
-                        if key in embedded:
-                            new_items[key] = {
-                                "@type": "@id",
-                                "@id": class_name + "/" + str(value),
-                            }
-                    item.update(new_items)
-                # adding type
-                item["@type"] = class_name
-                # adding ids
-                if id_:
-                    if id_ in item:
-                        item_id = class_name + "/" + str(item[id_])
-                    else:
-                        raise RuntimeError(
-                            f"id {id} is missing in {item}. Cannot import CSV."
-                        )
-                elif keys:
-                    item_id = "_".join(list(keys))
-                elif na == "optional":
-                    item_id = None
-                else:
-                    item_id = "_".join(list(df.columns))
-                if item_id:
-                    item["@id"] = item_id
+    if message is None:
+        commit_msg = f"Documents created with {csv_file} update by Python client."
+    else:
+        commit_msg = message
+
+    def prepare(df):
+        nonlocal has_schema
+        if any(df.isna().any()) and na == "error":
+            raise RuntimeError(
+                f"{df}\nThere is NA in the data and cannot be automatically load in. Use --na options to remove all records with NA or make properties optional to accept missing data."
+            )
+        elif na == "skip":
+            df.dropna(inplace=True)
+        df.rename(columns=_csv_column, inplace=True)
+        if not has_schema:
+            class_dict = _df_to_schema(class_name, df)
             if message is None:
-                message = f"Documents created with {csv_file} update by Python client."
+                schema_msg = (
+                    f"Schema object insert/ update with {csv_file} by Python client."
+                )
+            else:
+                schema_msg = message + " (schema update)"
             client.update_document(
-                obj_list,
-                commit_msg=message,
+                class_dict,
+                commit_msg=schema_msg,
+                graph_type="schema",
+            )
+            click.echo(
+                f"\nSchema object {class_name} created with {csv_file} being imported into database."
+            )
+            _sync(client)
+            has_schema = True
+        return class_name, df, embedded, id_, na, keys
+
+    if checkpoint is None:
+        checkpoint = csv_file + ".checkpoint"
+    progress = {
+        "csv_file": csv_file,
+        "chunksize": chunksize,
+        "options": {
+            "classname": class_name,
+            "keys": list(keys),
+            "na": na,
+            "id": id_,
+            "embedded": list(embedded),
+            "sep": sep,
+        },
+        "chunk": 0,
+        "offset": 0,
+        "rows": 0,
+        # last commit of the branch before the chunk being uploaded
+        "commit": None,
+        # chunk being uploaded, committed if the branch moved on from "commit"
+        "pending": None,
+    }
+    if resume:
+        saved = _load_checkpoint(checkpoint)
+        if saved is None:
+            raise InterfaceError(f"No checkpoint {checkpoint} to resume the import.")
+        _check_checkpoint(saved, progress)
+        if saved["offset"] > os.path.getsize(csv_file):
+            raise InterfaceError(f"{csv_file} is shorter than in the checkpoint.")
+        head = _branch_head(client)
+        progress.update(saved)
+        if progress["pending"] is not None and head != progress["commit"]:
+            # stopped after the commit of the chunk, before the checkpoint
+            pending = progress["pending"]
+            progress.update(
+                chunk=progress["chunk"] + 1,
+                offset=pending["offset"],
+                rows=progress["rows"] + pending["rows"],
+                commit=head,
+                pending=None,
+            )
+            _save_checkpoint(checkpoint, progress)
+        elif head != progress["commit"]:
+            click.echo(
+                f"Warning: the last commit is {head}, not {progress['commit']} of the checkpoint, check the data committed after it."
             )
+        click.echo(
+            f"Resuming the import of {csv_file} after chunk {progress['chunk']} ({progress['rows']} records)."
+        )
+    else:
+        progress["commit"] = _branch_head(client)
+
+    # byte offset of the end of each chunk read
+    ends = []
+
+    def chunks():
+        for df, end in _read_csv_chunks(
+            pd, np, csv_file, chunksize, progress["offset"], sep=sep, dtype=dtype
+        ):
+            ends.append(end)
+            yield df
+
+    def upload(index, documents):
+        progress["pending"] = {"offset": ends[index], "rows": len(documents)}
+        _save_checkpoint(checkpoint, progress)
+        client.update_document(documents, commit_msg=commit_msg)
+        progress["chunk"] += 1
+        progress["offset"] = ends[index]
+        progress["rows"] += len(documents)
+        progress["commit"] = _branch_head(client)
+        progress["pending"] = None
+        _save_checkpoint(checkpoint, progress)
+
+    throughput = _import_pipeline(chunks(), prepare, upload, workers, inflight)
+    # the import is complete, nothing to resume
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
     if id_:
         key_type = "specified"
     elif na == "optional" and not keys:
@@ -637,6 +1018,28 @@ def importcsv(
     click.echo(
         f"Records in {csv_file} inserted as type {class_name} into database with {key_type} ids."
     )
+    click.echo(f"Throughput: {throughput}")
+
+
+def _echo_documents(documents, ndjson=False):
+    """Print documents as they arrive, as an indented JSON list or as NDJSON (one per line)"""
+    if ndjson:
+        for document in documents:
+            click.echo(json.dumps(document))
+        return
+    empty = True
+    for document in documents:
+        text = json.dumps(document, indent=4).replace("\n", "\n    ")
+        click.echo(("[\n    " if empty else ",\n    ") + text, nl=False)
+        empty = False
+    click.echo("[]" if empty else "\n]")
+
+
+def _write_csv_chunks(chunks, filename):
+    """Write DataFrames to a CSV file one after the other, with the header of the first one"""
+    with open(filename, "w", newline="") as csv_file:
+        for index, df in enumerate(chunks):
+            df.to_csv(csv_file, index=False, header=index == 0)
 
 
 @click.command()
@@ -652,12 +1055,24 @@ def importcsv(
     show_default=True,
     help="Specify the depth of the embedding operation. When maximum is hit, the values will be kept as object ids",
 )
+@click.option(
+    "--workers",
+    default=1,
+    show_default=True,
+    help="Number of requests sent in parallel to get the objects to embed",
+)
+@click.option(
+    "--chunksize",
+    default=10000,
+    show_default=True,
+    help="Number of documents converted and written to the CSV file at a time",
+)
 @click.option(
     "--filename",
     help="File name if the exported file, if not specify it will use the name of the class e.g. 'ClassName.csv'",
 )
 # @click.option('--header ', default=',', show_default=True)
-def exportcsv(class_obj, keepid, maxdep, filename=None):
+def exportcsv(class_obj, keepid, maxdep, workers=1, chunksize=10000, filename=None):
     """Export all documents in a TerminusDB class into a flatten CSV file."""
     settings = _load_settings()
     status = _load_settings(".TDB", check=[])
@@ -665,15 +1080,80 @@ def exportcsv(class_obj, keepid, maxdep, filename=None):
     settings["database"]
     client, msg = _connect(settings, new_db=False)
     all_records = client.get_documents_by_type(class_obj)
-    df = result_to_df(all_records, keepid, maxdep, client)
     if filename is None:
         filename = class_obj + ".csv"
-    df.to_csv(filename, index=False)
+    _write_csv_chunks(
+        result_to_df_chunks(all_records, chunksize, keepid, maxdep, client, workers),
+        filename,
+    )
     click.echo(
         f"CSV file {filename} created with {class_obj} from database {client.db}."
     )
 
 
+@click.command()
+@click.argument("class_obj")
+@click.option(
+    "--batchsize",
+    default=10000,
+    show_default=True,
+    help="Number of documents in a row group of the Parquet file",
+)
+@click.option(
+    "--filename",
+    help="File name if the exported file, if not specify it will use the name of the class e.g. 'ClassName.parquet'",
+)
+def exportparquet(class_obj, batchsize, filename=None):
+    """Export all documents in a TerminusDB class into a typed Parquet file."""
+    pq = _import_pyarrow("pyarrow.parquet")
+    settings = _load_settings()
+    status = _load_settings(".TDB", check=[])
+    settings.update(status)
+    client, msg = _connect(settings, new_db=False)
+    batches = client.export_arrow(class_obj, batch_size=batchsize)
+    if filename is None:
+        filename = class_obj + ".parquet"
+    with pq.ParquetWriter(filename, batches.schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+    click.echo(
+        f"Parquet file {filename} created with {class_obj} from database {client.db}."
+    )
+
+
+@click.command()
+@click.argument("parquet_file")
+@click.option(
+    "--classname",
+    "class_name",
+    help="Class of the documents, needed if the file was not exported with exportparquet",
+)
+@click.option(
+    "--batchsize",
+    default=1000,
+    show_default=True,
+    help="Number of documents committed at a time",
+)
+@click.option(
+    "-m",
+    "--message",
+    help="Commit message for the import",
+)
+def importparquet(parquet_file, class_name, batchsize, message):
+    """Import the documents in a Parquet file into TerminusDB, one row group at a time."""
+    settings = _load_settings()
+    status = _load_settings(".TDB", check=[])
+    settings.update(status)
+    client, msg = _connect(settings, new_db=False)
+    if message is None:
+        message = f"Documents imported from {parquet_file} by Python client."
+    loader = BulkLoader(client, batch_size=batchsize, commit_msg=message)
+    ids = loader.load(parquet_to_documents(parquet_file, class_name))
+    click.echo(
+        f"{len(ids)} documents in {parquet_file} inserted into database {client.db}."
+    )
+
+
 @click.command()
 @click.option(
     "-s", "--schema", is_flag=True, help="Specify if getting schema object instead"
@@ -706,10 +1186,18 @@ def exportcsv(class_obj, keepid, maxdep, filename=None):
     help="Option for export: specify the depth of the embedding operation",
 )
 @click.option("--filename", help="Option for export: file name if the exported file")
-def alldocs(schema, type_, query, head, export, keepid, maxdep, filename=None):
+@click.option(
+    "--ndjson",
+    is_flag=True,
+    help="Print one document per line instead of a JSON list",
+)
+def alldocs(
+    schema, type_, query, head, export, keepid, maxdep, filename=None, ndjson=False
+):
     """Get all documents in the database, use --schema to specify schema, --type to select type and -q to make queries (e.g. -q date=2021-07-01)
 
     If using --type and not --schema, can export using -e with options: --keepid, --maxdep and --filename
+    The documents are printed as they are received, use --ndjson to have one document per line.
     """
     settings = _load_settings()
     status = _load_settings(".TDB", check=[])
@@ -721,15 +1209,12 @@ def alldocs(schema, type_, query, head, export, keepid, maxdep, filename=None):
                 json.dumps(client.get_document(type_, graph_type="schema"), indent=4)
             )
         else:
-            click.echo(
-                json.dumps(
-                    list(client.get_all_documents(graph_type="schema", count=head)),
-                    indent=4,
-                )
+            _echo_documents(
+                client.get_all_documents(graph_type="schema", count=head), ndjson
             )
     elif type_:
         if not query:
-            result = list(client.get_documents_by_type(type_, count=head))
+            result = client.get_documents_by_type(type_, count=head)
         else:
             schema_dict = client.get_document(type_, graph_type="schema")
             # check if it got inherited props
@@ -763,19 +1248,23 @@ def alldocs(schema, type_, query, head, export, keepid, maxdep, filename=None):
                 else:
                     pair[1] = pair[1]  # don't quote in query
                 query_dict[pair[0]] = pair[1]
-            result = list(client.query_document(query_dict, optimize=True, count=head))
+            result = client.query_document(query_dict, optimize=True, count=head)
         if export:
-            df = result_to_df(result, keepid, maxdep, client)
             if filename is None:
                 filename = type_ + ".csv"
-            df.to_csv(filename, index=False)
+            _write_csv_chunks(
+                result_to_df_chunks(
+                    result, keepid=keepid, max_embed_dep=maxdep, client=client
+                ),
+                filename,
+            )
             click.echo(
                 f"CSV file {filename} created with {type_} from database {client.db}."
             )
         else:
-            click.echo(json.dumps(result, indent=4))
+            _echo_documents(result, ndjson)
     else:
-        click.echo(json.dumps(list(client.get_all_documents(count=head)), indent=4))
+        _echo_documents(client.get_all_documents(count=head), ndjson)
 
 
 @click.command()
@@ -981,6 +1470,8 @@ tdbpy.add_command(commit)
 tdbpy.add_command(deletedb)
 tdbpy.add_command(importcsv)
 tdbpy.add_command(exportcsv)
+tdbpy.add_command(exportparquet)
+tdbpy.add_command(importparquet)
 tdbpy.add_command(alldocs)
 tdbpy.add_command(branch)
 tdbpy.add_command(checkout)
@@ -97,6 +97,7 @@ class MockResponse:
         self.json_data = json_data
         self.status_code = status_code
         self.text = text
+        self.content = text.encode("utf-8")
 
     def json(self):
         return self.json_data
@@ -1,6 +1,9 @@
 # import sys
 # sys.path.append('client')
+import gzip
+import json
 import unittest.mock as mock
+from typing import Optional
 
 import pytest
 import random
@@ -8,11 +11,12 @@ import requests
 
 
 from terminusdb_client.client import Client, GraphType
+from terminusdb_client.client.Client import _server_cache
 from terminusdb_client.errors import InterfaceError
-from terminusdb_client.woqlschema import WOQLSchema
+from terminusdb_client.woqlschema import DocumentTemplate, WOQLSchema
 
 from ..__version__ import __version__
-from .conftest import mocked_request_insert_delete, mocked_request_success
+from .conftest import MockResponse, mocked_request_insert_delete, mocked_request_success
 from .woqljson.woqlStarJson import WoqlStar
 
 
@@ -725,3 +729,306 @@ def test_get_document_history_with_created_updated(mocked_get, mocked_head):
         "user-agent": f"terminusdb-client-python/{__version__}"
     }
     assert last_call[1]["auth"] == ("admin", "root")
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+def test_get_all_documents_streams_body(mocked_get, mocked_head):
+    client = Client("http://localhost:6363", user="admin", key="root", team="admin")
+    client.connect(db="myDBName")
+    response = mock.Mock(status_code=200)
+    response.iter_content.return_value = iter([b'{"@id": "A/1"}\n{"@id"', b': "A/2"}'])
+    client._session.get.side_effect = None
+    client._session.get.return_value = response
+
+    result = client.get_all_documents(doc_type="A")
+
+    last_call = client._session.get.call_args_list[-1]
+    assert last_call[1]["stream"] is True
+    assert last_call[1]["params"] == {"graph_type": "instance", "type": "A"}
+    assert list(result) == [{"@id": "A/1"}, {"@id": "A/2"}]
+    response.close.assert_called_once()
+
+
+def _documents_server(existing):
+    """Mocked document endpoint returning the `existing` documents of the ids asked"""
+    not_found = {"api:error": {"@type": "api:DocumentNotFound"}}
+
+    def post(*args, **kwargs):
+        ids = kwargs["json"]["ids"]
+        if any(doc_id not in existing for doc_id in ids):
+            return mock.Mock(
+                status_code=404,
+                text=json.dumps(not_found),
+                headers={"content-type": "application/json"},
+                json=mock.Mock(return_value=not_found),
+            )
+        response = mock.Mock(status_code=200, headers={})
+        body = "\n".join(json.dumps({"@id": doc_id}) for doc_id in ids)
+        response.iter_content.return_value = iter([body.encode()])
+        return response
+
+    return post
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "post")
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+def test_get_documents(mocked_get, mocked_post, mocked_head):
+    client = Client("http://localhost:6363", user="admin", key="root", team="admin")
+    client.connect(db="myDBName")
+    mocked_post.side_effect = _documents_server({"A/1", "A/3", "terminusdb:///data/A/2"})
+
+    ids = ["A/3", "A/1", "A/3", "terminusdb:///data/A/2"]
+    result = client.get_documents(ids, batch_size=2, prefixed=True)
+    assert result == [
+        {"@id": "A/3"},
+        {"@id": "A/1"},
+        {"@id": "A/3"},
+        {"@id": "terminusdb:///data/A/2"},
+    ]
+    assert mocked_post.call_count == 2
+    call = mocked_post.call_args_list[0]
+    assert call[1]["headers"]["X-HTTP-Method-Override"] == "GET"
+    assert call[1]["stream"] is True
+    assert call[1]["json"] == {
+        "ids": ["A/3", "A/1"],
+        "graph_type": "instance",
+        "as_list": False,
+        "prefixed": True,
+    }
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "post")
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+def test_get_documents_missing(mocked_get, mocked_post, mocked_head):
+    client = Client("http://localhost:6363", user="admin", key="root", team="admin")
+    client.connect(db="myDBName")
+    mocked_post.side_effect = _documents_server({"A/1", "A/2", "A/4"})
+    missing = object()
+
+    ids = ["A/1", "A/2", "A/3", "A/4"]
+    result = client.get_documents(ids, workers=2, batch_size=4, missing=missing)
+    assert result == [{"@id": "A/1"}, {"@id": "A/2"}, missing, {"@id": "A/4"}]
+    # one failed batch, then halves and quarters to find A/3
+    assert mocked_post.call_count == 5
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+def test_get_all_documents_close_early(mocked_get, mocked_head):
+    client = Client("http://localhost:6363", user="admin", key="root", team="admin")
+    client.connect(db="myDBName")
+    response = mock.Mock(status_code=200)
+    response.iter_content.return_value = iter([b'{"@id": "A/1"}\n{"@id": "A/2"}'])
+    client._session.get.side_effect = None
+    client._session.get.return_value = response
+
+    with client.get_all_documents(chunk_size=16) as result:
+        assert next(result) == {"@id": "A/1"}
+
+    response.iter_content.assert_called_once_with(chunk_size=16)
+    response.close.assert_called_once()
+    assert list(result) == []
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "post")
+def test_insert_document_stream(mocked_post, mocked_get, mocked_head, test_schema):
+    client = Client("http://localhost:6363", user="admin", key="root", team="admin")
+    client.connect(db="myDBName")
+    bodies = []
+
+    def consume_body(*args, **kwargs):
+        bodies.append(gzip.decompress(b"".join(kwargs["data"])))
+        return mock.Mock(
+            status_code=200, content=b'["Country/uk", "Coordinate/1", "A/1"]'
+        )
+
+    mocked_post.side_effect = consume_body
+    Coordinate = test_schema.object.get("Coordinate")
+    Country = test_schema.object.get("Country")
+    corner = Coordinate(x=1.0, y=2.0)
+    uk = Country(name="uk", perimeter=[corner])
+
+    def documents():
+        yield uk
+        yield corner
+        yield {"@id": "A/1", "@type": "A"}
+
+    result = client.insert_document(documents(), stream=True)
+
+    assert result == ["Country/uk", "Coordinate/1", "A/1"]
+    sent = json.loads(bodies[0])
+    assert [doc["@type"] for doc in sent] == ["Country", "Coordinate", "A"]
+    assert sent[0]["perimeter"] == [{"@ref": corner._capture}]
+    assert sent[1]["@capture"] == corner._capture
+    assert corner._backend_id == "Coordinate/1"
+    headers = mocked_post.call_args[1]["headers"]
+    assert headers["Content-Encoding"] == "gzip"
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "post")
+def test_insert_document_skipped_context(
+    mocked_post, mocked_get, mocked_head, test_schema
+):
+    client = Client("http://localhost:6363", user="admin", key="root", team="admin")
+    client.connect(db="myDBName")
+    mocked_post.return_value = mock.Mock(
+        status_code=200,
+        content=b'["Country/uk", "Coordinate/1"]',
+    )
+    Coordinate = test_schema.object.get("Coordinate")
+    Country = test_schema.object.get("Country")
+    corner = Coordinate(x=1.0, y=2.0)
+    uk = Country(name="uk", perimeter=[corner])
+    context = {"@type": "@context", "@base": "terminusdb:///data/"}
+
+    with pytest.warns(UserWarning):
+        client.insert_document([context, uk], compress="never")
+
+    assert [doc["@type"] for doc in mocked_post.call_args[1]["json"]] == [
+        "Country",
+        "Coordinate",
+    ]
+    assert uk._backend_id == "Country/uk"
+    assert corner._backend_id == "Coordinate/1"
+
+
+def test_convert_documents_reentrant(test_schema):
+    client = Client("http://localhost:6363")
+    Coordinate = test_schema.object.get("Coordinate")
+    Country = test_schema.object.get("Country")
+    inner = Country(name="fr", perimeter=[Coordinate(x=3.0, y=4.0)])
+    corner = Coordinate(x=1.0, y=2.0)
+    uk = Country(name="uk", perimeter=[corner])
+    de = Country(name="de", perimeter=[])
+    nested = []
+    obj_to_dict = Country._obj_to_dict
+
+    def convert_other(self):
+        # another conversion on the same client, as from another thread
+        if self is de and not nested:
+            nested.append(client._convert_documents(inner, "instance"))
+        return obj_to_dict(self)
+
+    expected_doc, expected_objects = client._convert_documents([uk, de], "instance")
+    with mock.patch.object(Country, "_obj_to_dict", convert_other):
+        new_doc, objects = client._convert_documents([uk, de], "instance")
+
+    assert new_doc == expected_doc
+    assert objects == expected_objects
+    assert corner in objects.values()
+    inner_doc, inner_objects = nested[0]
+    assert [doc.get("name") for doc in inner_doc if "name" in doc] == ["fr"]
+    assert corner not in inner_objects.values()
+
+
+def test_convert_documents_graph(test_schema):
+    client = Client("http://localhost:6363")
+    Coordinate = test_schema.object.get("Coordinate")
+    Country = test_schema.object.get("Country")
+    corner = Coordinate(x=1.0, y=2.0)
+    origin = Coordinate(x=0.0, y=0.0)
+    uk = Country(name="uk", perimeter=[corner, origin])
+    de = Country(name="de", perimeter=[corner])
+    new_doc, objects = client._convert_documents([uk, de, corner], "instance")
+    # each object once, after the first object referencing it
+    assert [doc["@capture"] for doc in new_doc] == [
+        uk._capture,
+        corner._capture,
+        origin._capture,
+        de._capture,
+    ]
+    assert objects == {0: uk, 1: corner, 2: origin, 3: de}
+
+    class Node(DocumentTemplate):
+        next: Optional["Node"]
+
+    head = None
+    for _ in range(5000):
+        head = Node(next=head)
+    new_doc, objects = client._convert_documents(head, "instance")
+    assert len(new_doc) == 5000
+    assert new_doc[0]["@capture"] == head._capture
+    assert new_doc[1]["@capture"] == head.next._capture
+    assert objects[0] is head
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+def test_fork(mocked_get, mocked_head):
+    client = Client("http://localhost:6363")
+    client.connect(db="myDBName", key="root", user="admin", ref="abc")
+    calls = mocked_get.call_count
+
+    dev = client.fork(branch="dev")
+    other = client.fork(team="other", db="otherDB")
+
+    assert mocked_get.call_count == calls
+    assert dev._session is client._session
+    assert dev._auth() == client._auth()
+    assert dev.branch == "dev" and dev.ref is None
+    assert dev._documents_url().endswith("/admin/myDBName/local/branch/dev")
+    assert other._db_url().endswith("/other/otherDB")
+    assert other.ref == "abc"
+    assert client.branch == "main" and client.db == "myDBName"
+    dev.close()
+    assert client._connected
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+def test_lazy_connect(mocked_get, mocked_head):
+    client = Client("http://localhost:6363")
+    client.connect(db="myDBName", lazy=True)
+    assert not mocked_get.called and not mocked_head.called
+
+    client.get_class_frame("Person")
+    client.get_class_frame("Person")
+
+    assert mocked_head.call_count == 1
+    # info, then the two frames
+    assert mocked_get.call_count == 3
+    assert mocked_get.call_args_list[0][0][0] == "http://localhost:6363/api/info"
+
+
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "head")
+def test_lazy_connect_fail(mocked_head, mocked_get):
+    mocked_head.return_value = MockResponse("", None, 404)
+    client = Client("http://localhost:6363")
+    client.connect(db="myDBName", lazy=True)
+
+    with pytest.raises(InterfaceError) as error:
+        client.get_class_frame("Person")
+    assert "myDBName does not exist" in str(error.value.message)
+    # checked again on the next request
+    with pytest.raises(InterfaceError):
+        client.get_class_frame("Person")
+    assert mocked_head.call_count == 2
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+def test_connect_cache_ttl(mocked_get, mocked_head):
+    try:
+        for _ in range(3):
+            Client("http://localhost:6363").connect(db="myDBName", cache_ttl=60)
+        assert mocked_get.call_count == 1
+        assert mocked_head.call_count == 1
+
+        # other credentials are not served from the cache
+        Client("http://localhost:6363").connect(db="myDBName", key="other", cache_ttl=60)
+        assert mocked_get.call_count == 2
+
+        with mock.patch("time.monotonic", return_value=1e12):
+            Client("http://localhost:6363").connect(db="myDBName", cache_ttl=60)
+        assert mocked_get.call_count == 3
+        assert mocked_head.call_count == 3
+    finally:
+        _server_cache.clear()
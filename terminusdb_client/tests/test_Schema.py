@@ -1,4 +1,7 @@
+import asyncio
 import datetime as dt
+import gc
+import threading
 import unittest.mock as mock
 from typing import Set
 from unittest.mock import ANY
@@ -12,6 +15,9 @@ from terminusdb_client.schema.schema import (
     EnumTemplate,
     Schema,
     _check_cycling,
+    get_validation_level,
+    set_validation_level,
+    validation_level,
 )
 
 from ..__version__ import __version__
@@ -121,6 +127,80 @@ def test_type_check():
         test_obj.age = "not a number"
 
 
+def test_validation_level(test_schema):
+    my_schema = test_schema
+    Employee = my_schema.object.get("Employee")
+    assert get_validation_level() == "full"
+    obj = TypeCheck()
+    obj.age = "42"
+    assert obj.age == 42
+    with pytest.raises(TypeError):
+        obj.age = "not a number"
+    employee = Employee()
+    with pytest.raises(ValueError):
+        employee.address_of = TypeCheck()
+
+    with validation_level("fast"):
+        obj.age = "7"
+        assert obj.age == 7
+        with pytest.raises(TypeError):
+            obj.name = 123
+        with pytest.raises(ValueError):
+            employee.address_of = TypeCheck()
+        employee.contact_number = "123"
+        with pytest.raises(TypeError):
+            employee.contact_number = 123
+        # only the container is checked
+        employee.friend_of = {1}
+        with pytest.raises(TypeError):
+            employee.friend_of = ["Person/1"]
+
+    with validation_level("off"):
+        obj.age = "not a number"
+        assert obj.age == "not a number"
+    assert get_validation_level() == "full"
+    with pytest.raises(ValueError):
+        set_validation_level("some")
+
+
+def test_validation_level_scope():
+    checked = TypeCheck()
+    trusted = TypeCheck()
+    entered = threading.Event()
+    done = threading.Event()
+    errors = []
+
+    def load_trusted():
+        with validation_level("off"):
+            entered.set()
+            trusted.age = "not a number"
+            done.wait(5)
+
+    thread = threading.Thread(target=load_trusted)
+    thread.start()
+    entered.wait(5)
+    # the block of the other thread does not turn off the checks of this one
+    assert get_validation_level() == "full"
+    try:
+        checked.age = "not a number"
+    except TypeError as error:
+        errors.append(error)
+    done.set()
+    thread.join(5)
+    assert trusted.age == "not a number"
+    assert len(errors) == 1
+
+    async def task(level):
+        with validation_level(level):
+            await asyncio.sleep(0)
+            return get_validation_level()
+
+    async def run():
+        return await asyncio.gather(task("off"), task("fast"), task("full"))
+
+    assert asyncio.run(run()) == ["off", "fast", "full"]
+
+
 def test_inheritance(test_schema):
     my_schema = test_schema
     Person = my_schema.object.get("Person")
@@ -175,6 +255,42 @@ def test_import_objects(test_schema):
     assert (return_objs[0]._obj_to_dict())[0] == cheuk_dict
 
 
+def test_construct_object_descriptor(test_schema):
+    my_schema = test_schema
+    Employee = my_schema.object.get("Employee")
+    descriptor = Employee._get_descriptor()
+    assert descriptor is Employee._get_descriptor()
+    assert descriptor.properties["member_of"] == "Team"
+    assert descriptor.properties["contact_number"] == {
+        "@type": "Optional",
+        "@class": "xsd:string",
+    }
+    assert "contact_number" not in descriptor.required
+    assert "name" in descriptor.required
+    with mock.patch("terminusdb_client.schema.schema.ClassDoc") as mocked_doc:
+        employee = my_schema.import_objects(
+            {
+                "@id": "Employee/descriptor",
+                "@type": "Employee",
+                "name": "Jane",
+                "member_of": "Information Technology",
+                "permisstion": ["Admin", "Read"],
+            }
+        )
+        employee._obj_to_dict(skip_checking=True)
+    # the docstrings are not parsed to hydrate or serialize objects
+    mocked_doc.assert_not_called()
+    assert employee.member_of is my_schema.object["Team"].IT
+    assert employee.permisstion == {
+        my_schema.object["Role"].Admin,
+        my_schema.object["Role"].Read,
+    }
+    with pytest.raises(ValueError):
+        my_schema.import_objects(
+            {"@id": "Employee/wrong", "@type": "Employee", "member_of": "Sales"}
+        )
+
+
 def test_get_instances(test_schema):
     my_schema = test_schema
     Person = my_schema.object.get("Person")
@@ -186,6 +302,31 @@ def test_get_instances(test_schema):
     assert len(list(Person.get_instances())) == 2
 
 
+def test_identity_map(test_schema):
+    my_schema = test_schema
+    Person = my_schema.object.get("Person")
+    jane = Person(name="Jane", age=30, friend_of=set(), _id="jane")
+    assert Person._identity["Person/jane"] is jane
+    jane._backend_id = "Person/jane_backend"
+    assert "Person/jane" not in Person._identity
+    assert Person._identity["Person/jane_backend"] is jane
+
+    # hydrating a document updates the object with the same id
+    same = my_schema.import_objects(
+        {"@id": "Person/jane_backend", "@type": "Person", "name": "Janet"}
+    )
+    assert same is jane
+    assert jane.name == "Janet"
+
+    friend = {"@id": "Person/jim", "@type": "Person", "friend_of": ["Person/jim"]}
+    jim = my_schema.import_objects(friend)
+    assert jim.friend_of == {jim}
+
+    del jane, same
+    gc.collect()
+    assert "Person/jane_backend" not in Person._identity
+
+
 def test_embedded_object(test_schema):
     my_schema = test_schema
     Person = my_schema.object.get("Person")
@@ -282,6 +423,55 @@ def test_id_and_capture(test_schema):
     }
 
 
+def test_obj_to_dict_serializer(test_schema):
+    my_schema = test_schema
+    Employee = my_schema.object.get("Employee")
+    Address = my_schema.object.get("Address")
+    Country = my_schema.object.get("Country")
+    Team = my_schema.object.get("Team")
+    Role = my_schema.object.get("Role")
+    ireland = Country(name="Republic of Ireland", perimeter=[])
+    boss = Employee(_id="boss", name="Boss", age=50)
+    jane = Employee(
+        name="Jane",
+        age=30,
+        friend_of={boss},
+        address_of=Address(street="test", postal_code="A12 345", country=ireland),
+        managed_by=boss,
+        member_of=Team.IT,
+        permisstion={Role.Admin},
+    )
+    jane_dict, references = jane._obj_to_dict()
+    assert Employee._get_serializer() is Employee._get_serializer()
+    assert jane_dict == {
+        "@type": "Employee",
+        "@capture": jane._capture,
+        "name": "Jane",
+        "age": 30,
+        "friend_of": [{"@id": "Employee/boss", "@type": "@id"}],
+        "address_of": {
+            "@type": "Address",
+            "street": "test",
+            "postal_code": "A12 345",
+            "country": {"@ref": ireland._capture},
+        },
+        "managed_by": {"@id": "Employee/boss", "@type": "@id"},
+        "member_of": "Information Technology",
+        "permisstion": ["Admin"],
+    }
+    assert references == {ireland._capture: ireland}
+
+    # values not of the type of the property are converted as before
+    with validation_level("off"):
+        jane.name = Team.Marketing
+        jane.age = dt.date(2000, 1, 1)
+        jane.friend_of = boss
+    jane_dict, _ = jane._obj_to_dict(skip_checking=True)
+    assert jane_dict["name"] == "Marketing"
+    assert jane_dict["age"] == "2000-01-01"
+    assert jane_dict["friend_of"] == {"@id": "Employee/boss", "@type": "@id"}
+
+
 def test_add_enum_class():
     new_schema = Schema()
     my_enum = new_schema.add_enum_class("MyEnum", ["item1", "item2"])
@@ -0,0 +1,461 @@
+"""Tests for client/async_client.py module."""
+
+import asyncio
+import gzip
+import json
+import threading
+import unittest.mock as mock
+
+import pytest
+
+from terminusdb_client.errors import DatabaseError, InterfaceError
+
+httpx = pytest.importorskip("httpx")
+
+from terminusdb_client.client import AsyncClient, DocumentCache  # noqa: E402
+
+INFO = {"@type": "api:InfoResponse", "api:status": "api:success"}
+
+
+def _client(handler):
+    """AsyncClient sending its requests to `handler`, records them in `requests`"""
+    requests = []
+
+    def record(request):
+        requests.append(request)
+        return handler(request)
+
+    transport = httpx.MockTransport(record)
+    client = AsyncClient("http://localhost:6363")
+    client._new_session = lambda: httpx.AsyncClient(transport=transport)
+    return client, requests
+
+
+def _default(request):
+    if request.url.path == "/api/info":
+        return httpx.Response(200, json=INFO)
+    return httpx.Response(200, text="")
+
+
+def test_connect():
+    client, requests = _client(_default)
+
+    async def run():
+        await client.connect(db="myDBName", key="root", user="admin")
+        await client.close()
+
+    asyncio.run(run())
+    assert client._db_info == INFO
+    assert requests[0].headers["Authorization"].startswith("Basic ")
+    assert requests[1].method == "HEAD"
+    assert requests[1].url.path == "/api/db/admin/myDBName"
+    assert requests[1].url.params["exists"] == "true"
+    assert not client._connected
+
+
+def test_connect_fail():
+    client, _ = _client(lambda request: httpx.Response(500, text="down"))
+    with pytest.raises(InterfaceError):
+        asyncio.run(client.connect())
+
+
+def test_get_all_documents_stream():
+    body = b'{"@id": "A/1"}\n{"@id": "A/2"}\n{"@id": "A/3"}'
+
+    def handler(request):
+        if request.url.path.startswith("/api/document"):
+            return httpx.Response(
+                200, content=body, headers={"Terminusdb-Data-Version": "branch:1"}
+            )
+        return _default(request)
+
+    client, requests = _client(handler)
+
+    async def run():
+        async with client:
+            await client.connect(db="myDBName")
+            documents = []
+            async for document in await client.get_all_documents(chunk_size=4):
+                documents.append(document)
+            as_list, version = await client.get_documents_by_type(
+                "A", as_list=True, get_data_version=True
+            )
+            return documents, as_list, version
+
+    documents, as_list, version = asyncio.run(run())
+    assert documents == [{"@id": "A/1"}, {"@id": "A/2"}, {"@id": "A/3"}]
+    assert as_list == documents
+    assert version == "branch:1"
+    params = requests[-1].url.params
+    assert params["graph_type"] == "instance"
+    assert params["type"] == "A"
+
+
+def test_get_all_documents_error():
+    error = {"api:message": "nope"}
+
+    def handler(request):
+        if request.url.path.startswith("/api/document"):
+            return httpx.Response(400, json=error)
+        return _default(request)
+
+    client, _ = _client(handler)
+
+    async def run():
+        await client.connect(db="myDBName")
+        await client.get_all_documents()
+
+    with pytest.raises(DatabaseError) as excinfo:
+        asyncio.run(run())
+    assert excinfo.value.error_obj == error
+
+
+def test_insert_document_stream():
+    bodies = []
+
+    def handler(request):
+        if request.url.path.startswith("/api/document"):
+            docs = json.loads(gzip.decompress(request.read()))
+            bodies.append(docs)
+            return httpx.Response(200, json=[doc["@id"] for doc in docs])
+        return _default(request)
+
+    client, requests = _client(handler)
+    documents = ({"@id": f"A/{i}", "@type": "A"} for i in range(3))
+
+    async def run():
+        await client.connect(db="myDBName")
+        return await client.insert_document(documents, stream=True)
+
+    assert asyncio.run(run()) == ["A/0", "A/1", "A/2"]
+    assert len(bodies[0]) == 3
+    assert requests[-1].headers["Content-Encoding"] == "gzip"
+    assert requests[-1].url.params["full_replace"] == "false"
+
+
+def test_query_streaming():
+    lines = [
+        {"@type": "PrefaceRecord", "names": ["X"]},
+        {"@type": "Binding", "X": "A/1"},
+        {"@type": "Binding", "X": "A/2"},
+        {"@type": "PostscriptRecord"},
+    ]
+
+    def handler(request):
+        if request.url.path.startswith("/api/woql"):
+            body = "\n".join(json.dumps(line) for line in lines)
+            return httpx.Response(200, text=body)
+        return _default(request)
+
+    client, requests = _client(handler)
+
+    async def run():
+        await client.connect(db="myDBName")
+        result = await client.query({"@type": "True"}, streaming=True)
+        return result, [binding async for binding in result]
+
+    result, bindings = asyncio.run(run())
+    assert result.variable_names() == ["X"]
+    assert [binding["X"] for binding in bindings] == ["A/1", "A/2"]
+    assert json.loads(requests[-1].read())["streaming"] is True
+
+
+def test_log_and_branches():
+    def handler(request):
+        if request.url.path.startswith("/api/log"):
+            return httpx.Response(
+                200,
+                json=[{"identifier": "abc", "timestamp": 1660919664.9129035}],
+            )
+        if request.url.path.startswith("/api/document"):
+            return httpx.Response(200, text='{"@id": "Branch/main"}')
+        return _default(request)
+
+    client, requests = _client(handler)
+
+    async def run():
+        await client.connect(db="myDBName")
+        return await client.log(count=1), await client.get_all_branches()
+
+    log, branches = asyncio.run(run())
+    assert log[0]["commit"] == "abc"
+    assert branches == [{"@id": "Branch/main"}]
+    assert requests[-1].url.path == "/api/document/admin/myDBName/local/_commits"
+
+
+def test_query_streaming_without_postscript():
+    def handler(request):
+        if request.url.path.startswith("/api/woql"):
+            body = json.dumps({"@type": "PrefaceRecord", "names": ["X"]})
+            return httpx.Response(200, text=body + "\n" + '{"@type": "Binding"}')
+        return _default(request)
+
+    client, _ = _client(handler)
+
+    async def run():
+        await client.connect(db="myDBName")
+        result = await client.query({"@type": "True"}, streaming=True)
+        return result, [binding async for binding in result]
+
+    result, bindings = asyncio.run(run())
+    assert bindings == [{"@type": "Binding"}]
+    assert result.response.is_closed
+
+
+def test_connect_lazy():
+    client, requests = _client(_default)
+
+    async def run():
+        await client.connect(db="myDBName", lazy=True)
+        checked = len(requests)
+        await client.get_all_branches()
+        return checked
+
+    assert asyncio.run(run()) == 0
+    assert [request.method for request in requests] == ["GET", "HEAD", "GET"]
+    assert requests[0].url.path == "/api/info"
+
+
+def test_database_admin():
+    def handler(request):
+        if request.url.path == "/api/":
+            return httpx.Response(200, json=[{"name": "db1"}, {"name": "db2"}])
+        if request.method == "HEAD" and request.url.path == "/api/db/admin/db3":
+            return httpx.Response(404)
+        return _default(request)
+
+    client, requests = _client(handler)
+
+    async def run():
+        await client.connect()
+        await client.create_database("myDBName", label="My DB")
+        created = json.loads(requests[-1].read())
+        await client.delete_database("myDBName", team="admin", force=True)
+        return (
+            created,
+            await client.list_databases(),
+            await client.has_database("db1"),
+            await client.has_database("db3"),
+        )
+
+    created, databases, has_db1, has_db3 = asyncio.run(run())
+    assert created["label"] == "My DB"
+    assert requests[1].method == "POST"
+    assert requests[1].url.path == "/api/db/admin/myDBName"
+    assert requests[2].method == "DELETE"
+    assert requests[2].url.params["force"] == "true"
+    assert client.db is None
+    assert databases == ["db1", "db2"]
+    assert has_db1 and not has_db3
+
+
+def test_pull_push():
+    def handler(request):
+        if request.url.path.startswith(("/api/pull", "/api/push")):
+            return httpx.Response(200, json={"api:status": "api:success"})
+        return _default(request)
+
+    client, requests = _client(handler)
+
+    async def run():
+        await client.connect(db="myDBName", user="admin")
+        await client.pull()
+        await client.push(remote_auth={"type": "token", "key": "secret"})
+
+    asyncio.run(run())
+    pulled = json.loads(requests[-2].read())
+    assert pulled["remote"] == "origin"
+    assert pulled["remote_branch"] == "main"
+    assert pulled["author"] == "admin"
+    assert requests[-1].url.path == "/api/push/admin/myDBName/local/branch/main"
+    assert requests[-1].headers["Authorization-Remote"] == "Token secret"
+
+
+def test_bulk_insert():
+    def handler(request):
+        if request.url.path.startswith("/api/document"):
+            docs = json.loads(request.read())
+            return httpx.Response(200, json=[doc["@id"] for doc in docs])
+        return _default(request)
+
+    client, requests = _client(handler)
+    documents = [{"@type": "A", "@id": f"A/{i}"} for i in range(5)]
+
+    async def run():
+        await client.connect(db="myDBName")
+        return await client.bulk_insert(documents, batch_size=2, compress="never")
+
+    ids = asyncio.run(run())
+    assert ids == [f"A/{i}" for i in range(5)]
+    assert [request.method for request in requests[2:]] == ["POST"] * 3
+
+
+def test_pool_stats_and_copy():
+    client, requests = _client(_default)
+
+    async def run():
+        await client.connect(db="myDBName")
+        await client.get_all_branches()
+        clone = client.copy()
+        await clone.get_all_branches()
+        return client.pool_stats(), clone.pool_stats(), clone
+
+    stats, clone_stats, clone = asyncio.run(run())
+    assert stats["requests"] == 3
+    assert stats["hosts"]["http://localhost:6363"]["requests"] == 3
+    assert clone_stats["requests"] == 1
+    assert clone is not client
+    assert clone._session is not client._session
+    assert not hasattr(AsyncClient, "_not_supported")
+
+
+@mock.patch("terminusdb_client.client.async_client.import_module")
+def test_missing_httpx(mocked_import):
+    mocked_import.side_effect = ImportError()
+    with pytest.raises(ImportError) as excinfo:
+        AsyncClient("http://localhost:6363")
+    assert "httpx" in str(excinfo.value)
+    assert "terminusdb[async]" in str(excinfo.value)
+
+
+def test_fork_close_keeps_session():
+    client, requests = _client(_default)
+
+    async def run():
+        await client.connect(db="myDBName")
+        forked = client.fork(branch="dev")
+        await forked.close()
+        return await client.info()
+
+    assert asyncio.run(run()) == INFO
+
+
+def test_get_document_cache():
+    def handler(request):
+        if request.url.path.startswith("/api/document"):
+            if request.method == "DELETE":
+                return httpx.Response(
+                    200, text="", headers={"Terminusdb-Data-Version": "branch:2"}
+                )
+            return httpx.Response(
+                200,
+                json={"@id": "A/1"},
+                headers={"Terminusdb-Data-Version": "branch:1"},
+            )
+        return _default(request)
+
+    client, requests = _client(handler)
+    client._document_cache = DocumentCache()
+
+    async def run():
+        await client.connect(db="myDBName")
+        first = await client.get_document("A/1")
+        second = await client.get_document("A/1", get_data_version=True)
+        await client.delete_document("A/1")
+        await client.get_document("A/1")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == {"@id": "A/1"}
+    assert second == ({"@id": "A/1"}, "branch:1")
+    assert [request.method for request in requests[2:]] == ["GET", "DELETE", "GET"]
+
+
+def test_get_documents():
+    existing = {"A/1", "A/3"}
+
+    def handler(request):
+        if request.url.path.startswith("/api/document"):
+            ids = json.loads(request.read())["ids"]
+            if any(doc_id not in existing for doc_id in ids):
+                error = {"api:error": {"@type": "api:DocumentNotFound"}}
+                return httpx.Response(404, json=error)
+            body = "\n".join(json.dumps({"@id": doc_id}) for doc_id in ids)
+            return httpx.Response(200, text=body)
+        return _default(request)
+
+    client, requests = _client(handler)
+
+    async def run():
+        await client.connect(db="myDBName")
+        return await client.get_documents(
+            ["A/3", "A/2", "A/1"], batch_size=2, workers=2
+        )
+
+    assert asyncio.run(run()) == [{"@id": "A/3"}, None, {"@id": "A/1"}]
+    assert requests[2].headers["X-HTTP-Method-Override"] == "GET"
+
+
+def test_get_all_documents_not_ok():
+    def handler(request):
+        if request.url.path.startswith("/api/document"):
+            return httpx.Response(302, content=b'{"@id": "A/1"}')
+        return _default(request)
+
+    client, _ = _client(handler)
+
+    async def run():
+        await client.connect(db="myDBName")
+        return await client.get_all_documents(as_list=True)
+
+    # not an error, but the body is not a stream of documents
+    assert asyncio.run(run()) == []
+
+
+def test_insert_document_stream_off_loop():
+    threads = []
+
+    def handler(request):
+        if request.url.path.startswith("/api/document"):
+            docs = json.loads(gzip.decompress(request.read()))
+            return httpx.Response(200, json=[doc["@id"] for doc in docs])
+        return _default(request)
+
+    def documents():
+        for i in range(3):
+            threads.append(threading.get_ident())
+            yield {"@id": f"A/{i}", "@type": "A"}
+
+    client, _ = _client(handler)
+
+    async def run():
+        await client.connect(db="myDBName")
+        loop_thread = threading.get_ident()
+        await client.insert_document(documents(), stream=True)
+        return loop_thread
+
+    loop_thread = asyncio.run(run())
+    assert len(threads) == 3
+    assert loop_thread not in threads
+
+
+def test_schema_commit():
+    from terminusdb_client.woqlschema import DocumentTemplate, WOQLSchema
+
+    prefixes = {"@base": "terminusdb:///data/", "@schema": "terminusdb:///schema#"}
+
+    def handler(request):
+        if request.url.path == "/api/prefixes/admin/myDBName":
+            return httpx.Response(200, json=prefixes)
+        if request.url.path.startswith("/api/document"):
+            return httpx.Response(200, json=["Pet"])
+        return _default(request)
+
+    client, requests = _client(handler)
+    schema = WOQLSchema()
+
+    class Pet(DocumentTemplate):
+        _schema = schema
+        name: str
+
+    async def run():
+        await client.connect(db="myDBName")
+        await schema.commit(client, "add Pet")
+
+    asyncio.run(run())
+    assert schema.context["@schema"] == prefixes["@schema"]
+    assert requests[-1].method == "PUT"
+    assert requests[-1].url.params["graph_type"] == "schema"
+    body = json.loads(requests[-1].read())
+    assert body[0]["@base"] == prefixes["@base"]
+    assert body[1]["@id"] == "Pet"
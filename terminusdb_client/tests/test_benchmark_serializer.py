@@ -0,0 +1,130 @@
+"""Benchmark of the conversion of DocumentTemplate objects to dicts.
+
+Skipped unless TERMINUSDB_BENCHMARK is set, run it with
+
+    TERMINUSDB_BENCHMARK=1 python -m pytest -s terminusdb_client/tests/test_benchmark_serializer.py
+
+or as a script with `python -m terminusdb_client.tests.test_benchmark_serializer`.
+"""
+
+import datetime as dt
+import os
+import time
+from typing import List, Optional, Set
+
+import pytest
+
+from terminusdb_client.woqlschema import DocumentTemplate, EnumTemplate
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("TERMINUSDB_BENCHMARK"), reason="TERMINUSDB_BENCHMARK not set"
+)
+
+NUMBER = 5000
+REPEAT = 3
+
+
+class Colour(EnumTemplate):
+    red = ()
+    blue = ()
+
+
+class Flat(DocumentTemplate):
+    name: str
+    age: int
+    score: float
+    active: bool
+    born: dt.date
+    colour: Colour
+    note: Optional[str]
+
+
+class Address(DocumentTemplate):
+    _subdocument = []
+    street: str
+    city: str
+    postcode: Optional[str]
+
+
+class Nested(DocumentTemplate):
+    name: str
+    home: Address
+    work: Optional[Address]
+    friend: Optional[Flat]
+
+
+class Tagged(DocumentTemplate):
+    name: str
+    tags: List[str]
+    scores: Set[int]
+    colours: List[Colour]
+    friends: Set[Flat]
+
+
+def _friend():
+    return Flat(
+        _id="friend",
+        name="friend",
+        age=1,
+        score=1.0,
+        active=True,
+        born=dt.date(2000, 1, 1),
+        colour=Colour.red,
+    )
+
+
+def _flat(i, friend):
+    return Flat(
+        name=f"flat {i}",
+        age=i,
+        score=1.5,
+        active=True,
+        born=dt.date(2000, 1, 1),
+        colour=Colour.blue,
+    )
+
+
+def _nested(i, friend):
+    return Nested(
+        name=f"nested {i}",
+        home=Address(street="Main", city="Town"),
+        work=Address(street="High", city="City", postcode="AB1"),
+        friend=friend,
+    )
+
+
+def _tagged(i, friend):
+    return Tagged(
+        name=f"tagged {i}",
+        tags=[f"tag {j}" for j in range(20)],
+        scores=set(range(20)),
+        colours=[Colour.red, Colour.blue] * 5,
+        friends={friend},
+    )
+
+
+def objects_per_second(make, number=NUMBER, repeat=REPEAT):
+    """Best rate of `_obj_to_dict` over `repeat` runs on `number` objects made by `make`"""
+    friend = _friend()
+    objects = [make(i, friend) for i in range(number)]
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for obj in objects:
+            obj._obj_to_dict()
+        best = max(best, number / (time.perf_counter() - start))
+    return best
+
+
+@pytest.mark.parametrize(
+    "label, make", [("flat", _flat), ("nested", _nested), ("list-heavy", _tagged)]
+)
+def test_obj_to_dict_rate(label, make):
+    rate = objects_per_second(make)
+    print(f"{label}: {rate:,.0f} objects/s")
+    assert rate > 0
+
+
+if __name__ == "__main__":
+    for label, make in [("flat", _flat), ("nested", _nested), ("list-heavy", _tagged)]:
+        print(f"{label}: {objects_per_second(make):,.0f} objects/s")
@@ -0,0 +1,162 @@
+"""Tests for client/bulk_loader.py module."""
+
+import gzip
+import json
+import time
+import unittest.mock as mock
+
+import pytest
+import requests
+
+from terminusdb_client.client import BulkLoader, Client
+
+from .conftest import MockResponse, mocked_request_success
+
+
+def _mocked_upload(bodies):
+    def upload(*args, **kwargs):
+        body = kwargs["data"]
+        if kwargs["headers"].get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        docs = json.loads(body)
+        bodies.append(docs)
+        return MockResponse(json.dumps([doc["@id"] for doc in docs]), None, 200)
+
+    return upload
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "post")
+def test_bulk_insert_batches(mocked_post, mocked_get, mocked_head):
+    client = Client("http://localhost:6363")
+    client.connect(db="myDBName")
+    bodies = []
+    mocked_post.side_effect = _mocked_upload(bodies)
+    reports = []
+    documents = ({"@id": f"A/{i}", "@type": "A"} for i in range(25))
+
+    result = client.bulk_insert(
+        documents, batch_size=10, compress=200, on_batch=reports.append
+    )
+
+    assert result == [f"A/{i}" for i in range(25)]
+    assert [len(body) for body in bodies] == [10, 10, 5]
+    assert [report["documents"] for report in reports] == [10, 10, 5]
+    assert all(report["docs_per_second"] > 0 for report in reports)
+    params = mocked_post.call_args[1]["params"]
+    assert params["full_replace"] == "false"
+    # only the batches over the compress threshold are gzipped
+    first_headers = mocked_post.call_args_list[0][1]["headers"]
+    assert first_headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in mocked_post.call_args[1]["headers"]
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "put")
+def test_bulk_replace_batch_bytes(mocked_put, mocked_get, mocked_head):
+    client = Client("http://localhost:6363")
+    client.connect(db="myDBName")
+    bodies = []
+    mocked_put.side_effect = _mocked_upload(bodies)
+    documents = [{"@id": f"A/{i}", "@type": "A"} for i in range(4)]
+
+    loader = BulkLoader(
+        client, batch_bytes=50, replace=True, create=True, compress="never"
+    )
+    loader.load(documents)
+
+    assert [len(body) for body in bodies] == [2, 2]
+    params = mocked_put.call_args[1]["params"]
+    assert params["create"] == "true"
+    assert "Content-Encoding" not in mocked_put.call_args[1]["headers"]
+    assert len(loader.reports) == 2
+
+
+def _references(value, refs, captures):
+    """Collect the @ref and @capture of a document and its subdocuments"""
+    if isinstance(value, dict):
+        if "@ref" in value:
+            refs.add(value["@ref"])
+        if "@capture" in value:
+            captures.add(value["@capture"])
+        for item in value.values():
+            _references(item, refs, captures)
+    elif isinstance(value, list):
+        for item in value:
+            _references(item, refs, captures)
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "post")
+def test_bulk_insert_keeps_references_together(
+    mocked_post, mocked_get, mocked_head, test_schema
+):
+    client = Client("http://localhost:6363")
+    client.connect(db="myDBName")
+    bodies = []
+
+    def upload(*args, **kwargs):
+        # slow enough for the next batch to be prepared meanwhile
+        time.sleep(0.1)
+        docs = json.loads(kwargs["data"])
+        bodies.append(docs)
+        ids = [f"{doc['@type']}/{len(bodies)}_{i}" for i, doc in enumerate(docs)]
+        return MockResponse(json.dumps(ids), None, 200)
+
+    mocked_post.side_effect = upload
+    Coordinate = test_schema.object.get("Coordinate")
+    Country = test_schema.object.get("Country")
+    corner = Coordinate(x=1.0, y=2.0)
+    countries = [Country(name="a", perimeter=[corner]), Country(name="b")]
+    countries[1].perimeter = [corner]
+
+    client.bulk_insert(countries, batch_size=1, compress="never")
+
+    assert [[doc["@type"] for doc in body] for body in bodies] == [
+        ["Country", "Coordinate"],
+        ["Country"],
+    ]
+    for body in bodies:
+        refs, captures = set(), set()
+        _references(body, refs, captures)
+        assert refs <= captures
+    # the object of the first batch is referenced by its id
+    assert corner._backend_id == "Coordinate/1_1"
+    assert bodies[1][0]["perimeter"] == [{"@id": "Coordinate/1_1", "@type": "@id"}]
+
+
+def test_bulk_loader_batch_size():
+    with pytest.raises(ValueError):
+        BulkLoader(mock.Mock(), batch_size=0)
+
+
+def test_bulk_loader_forgets_uploaded_batches(test_schema):
+    client = mock.Mock(spec=Client)
+    client._iter_convert_document = lambda *args: Client._iter_convert_document(
+        client, *args
+    )
+    Coordinate = test_schema.object.get("Coordinate")
+    Country = test_schema.object.get("Country")
+    corner = Coordinate(x=1.0, y=2.0)
+    documents = iter(
+        [Country(name="a", perimeter=[corner]), Country(name="b", perimeter=[corner])]
+    )
+    loader = BulkLoader(client, batch_size=1, compress="never")
+    seen, captured = set(), {}
+
+    body, _, _, _, objects, captures, uploaded = loader._prepare(
+        documents, seen, captured
+    )
+    assert corner._capture in seen and corner._capture in captured
+    loader._set_ids(objects, ["Country/a", "Coordinate/1"])
+    uploaded.set()
+    loader._forget(captures, seen, captured)
+    assert not seen and not captured
+
+    # the object of the uploaded batch is referenced by id, without waiting
+    body = loader._prepare(documents, seen, captured)[0]
+    assert json.loads(body)[0]["perimeter"] == [{"@id": "Coordinate/1", "@type": "@id"}]
+    assert len(json.loads(body)) == 1
@@ -0,0 +1,216 @@
+"""Tests for client/document_cache.py module."""
+
+import json
+import threading
+import unittest.mock as mock
+
+import requests
+
+from terminusdb_client.client import Client, DocumentCache, GraphType
+
+from .conftest import mocked_request_success
+
+BRANCH = ("admin", "db", "local", "branch", "main")
+OTHER = ("admin", "db", "local", "branch", "dev")
+
+
+def _key(doc_id, graph_type=GraphType.INSTANCE):
+    return DocumentCache.key(doc_id, graph_type)
+
+
+def test_get_put():
+    cache = DocumentCache()
+    assert cache.get(BRANCH, _key("Person/1")) is None
+    cache.put(BRANCH, _key("Person/1"), b'{"@id": "Person/1"}', "branch:1")
+    assert cache.get(BRANCH, _key("Person/1")) == (b'{"@id": "Person/1"}', "branch:1")
+    assert cache.get(OTHER, _key("Person/1")) is None
+    assert cache.get(BRANCH, _key("Person/1", GraphType.SCHEMA)) is None
+    # the data prefix is not part of the key
+    assert cache.get(BRANCH, _key("terminusdb:///data/Person/1")) is not None
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 3
+    assert stats["documents"] == 1
+
+
+def test_lru_eviction():
+    cache = DocumentCache(max_documents=2)
+    cache.put(BRANCH, _key("A/1"), b"1", None)
+    cache.put(BRANCH, _key("A/2"), b"2", None)
+    cache.get(BRANCH, _key("A/1"))
+    cache.put(BRANCH, _key("A/3"), b"3", None)
+    assert cache.get(BRANCH, _key("A/2")) is None
+    assert cache.get(BRANCH, _key("A/1")) is not None
+    assert cache.stats()["evictions"] == 1
+
+    cache = DocumentCache(max_bytes=10)
+    cache.put(BRANCH, _key("A/1"), b"12345", None)
+    cache.put(BRANCH, _key("A/2"), b"123456", None)
+    assert len(cache) == 1
+    assert cache.stats()["bytes"] == 6
+    cache.put(BRANCH, _key("A/3"), b"12345678901", None)
+    assert cache.get(BRANCH, _key("A/3")) is None
+
+
+def test_ttl():
+    cache = DocumentCache(ttl=10)
+    with mock.patch("time.monotonic", return_value=100):
+        cache.put(BRANCH, _key("A/1"), b"1", None)
+    with mock.patch("time.monotonic", return_value=105):
+        assert cache.get(BRANCH, _key("A/1")) is not None
+    with mock.patch("time.monotonic", return_value=111):
+        assert cache.get(BRANCH, _key("A/1")) is None
+    assert len(cache) == 0
+
+
+def test_version_change():
+    cache = DocumentCache()
+    cache.put(BRANCH, _key("A/1"), b"1", "branch:1")
+    cache.put(OTHER, _key("A/1"), b"1", "branch:7")
+    cache.observe(BRANCH, "branch:1")
+    assert cache.get(BRANCH, _key("A/1")) is not None
+    cache.observe(BRANCH, "branch:2")
+    assert cache.get(BRANCH, _key("A/1")) is None
+    assert cache.get(OTHER, _key("A/1")) is not None
+    cache.put(BRANCH, _key("A/2"), b"2", "branch:3")
+    assert cache.get(BRANCH, _key("A/2")) is not None
+
+
+def test_written_and_invalidate():
+    cache = DocumentCache()
+    cache.put(BRANCH, _key("A/1"), b"1", "branch:1")
+    cache.put(BRANCH, _key("A/2"), b"2", "branch:1")
+    cache.put(OTHER, _key("A/1"), b"1", "branch:1")
+    cache.written(BRANCH, GraphType.INSTANCE, ["terminusdb:///data/A/1"], "branch:2")
+    assert cache.get(BRANCH, _key("A/1")) is None
+    assert cache.get(BRANCH, _key("A/2")) is not None
+    # the new version comes from our own write, A/2 is still valid
+    cache.observe(BRANCH, "branch:2")
+    assert cache.get(BRANCH, _key("A/2")) is not None
+    cache.written(BRANCH, GraphType.INSTANCE)
+    assert cache.get(BRANCH, _key("A/2")) is None
+    cache.invalidate(("admin", "db"))
+    assert len(cache) == 0
+
+
+def test_stale_put():
+    cache = DocumentCache()
+    cache.put(BRANCH, _key("A/2"), b"2", "branch:1")
+    generation = cache.generation(BRANCH)
+    cache.written(BRANCH, GraphType.INSTANCE, ["A/1"], "branch:2")
+    # read before the write, neither cached nor taken as the branch version
+    cache.put(BRANCH, _key("A/1"), b"old", "branch:1", generation)
+    cache.observe(BRANCH, "branch:1", generation)
+    assert cache.get(BRANCH, _key("A/1")) is None
+    assert cache.get(BRANCH, _key("A/2")) is not None
+
+    generation = cache.generation(OTHER)
+    cache.invalidate(("admin", "db"))
+    cache.put(OTHER, _key("A/1"), b"old", "branch:1", generation)
+    assert len(cache) == 0
+    generation = cache.generation(BRANCH)
+    cache.put(BRANCH, _key("A/1"), b"1", "branch:2", generation)
+    assert cache.get(BRANCH, _key("A/1")) is not None
+
+
+def test_client_copy_shares_cache():
+    cache = DocumentCache()
+    client = Client("http://localhost:6363", document_cache=cache)
+    clone = client.copy()
+    assert clone is not client
+    assert clone.document_cache is cache
+
+
+def _response(body, version):
+    return mock.Mock(
+        status_code=200,
+        content=json.dumps(body).encode(),
+        headers={"Terminusdb-Data-Version": version},
+    )
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+def test_client_get_document(mocked_get, mocked_head):
+    cache = DocumentCache()
+    client = Client("http://localhost:6363", document_cache=cache)
+    client.connect(user="admin", key="root", team="admin", db="myDBName")
+    mocked_get.reset_mock()
+    assert client.document_cache is cache
+
+    mocked_get.side_effect = [_response({"@id": "Person/1"}, "branch:1")]
+    assert client.get_document("Person/1") == {"@id": "Person/1"}
+    assert client.get_document("Person/1", get_data_version=True) == (
+        {"@id": "Person/1"},
+        "branch:1",
+    )
+    assert mocked_get.call_count == 1
+
+    # other flags, other entry
+    mocked_get.side_effect = [_response({"@id": "Person/1"}, "branch:1")]
+    client.get_document("Person/1", prefixed=False)
+    assert mocked_get.call_count == 2
+    assert cache.stats()["documents"] == 2
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "post")
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+def test_client_invalidation(mocked_get, mocked_post, mocked_head):
+    client = Client("http://localhost:6363", document_cache=DocumentCache())
+    client.connect(user="admin", key="root", team="admin", db="myDBName")
+    mocked_get.reset_mock()
+    mocked_get.side_effect = [
+        _response({"@id": "Person/1"}, "branch:1"),
+        _response({"@id": "Person/2"}, "branch:1"),
+        _response({"@id": "Person/1", "name": "new"}, "branch:2"),
+    ]
+    client.get_document("Person/1")
+    client.get_document("Person/2")
+
+    mocked_post.return_value = _response(["terminusdb:///data/Person/1"], "branch:2")
+    client.insert_document({"@id": "Person/1", "@type": "Person"})
+    assert client.get_document("Person/1") == {"@id": "Person/1", "name": "new"}
+    # not written, still cached at the new version
+    assert client.get_document("Person/2") == {"@id": "Person/2"}
+    assert mocked_get.call_count == 3
+
+    # a query reading at a new version drops the branch
+    mocked_post.return_value = _response({"bindings": []}, "branch:3")
+    client.query({"@type": "True"})
+    assert len(client.document_cache) == 0
+
+
+@mock.patch.object(requests.Session, "head", side_effect=mocked_request_success)
+@mock.patch.object(requests.Session, "post")
+@mock.patch.object(requests.Session, "get", side_effect=mocked_request_success)
+def test_client_read_during_write(mocked_get, mocked_post, mocked_head):
+    client = Client("http://localhost:6363", document_cache=DocumentCache())
+    client.connect(user="admin", key="root", team="admin", db="myDBName")
+    reading = threading.Event()
+    written = threading.Event()
+
+    def get(*args, params=None, **kwargs):
+        if params["id"] == "Person/2":
+            return _response({"@id": "Person/2"}, "branch:1")
+        if not reading.is_set():
+            # the read reaches the server before the write, returns after it
+            reading.set()
+            written.wait(5)
+            return _response({"@id": "Person/1"}, "branch:1")
+        return _response({"@id": "Person/1", "name": "new"}, "branch:2")
+
+    mocked_get.side_effect = get
+    client.get_document("Person/2")
+    reader = threading.Thread(target=client.get_document, args=("Person/1",))
+    reader.start()
+    reading.wait(5)
+    mocked_post.return_value = _response(["terminusdb:///data/Person/1"], "branch:2")
+    client.insert_document({"@id": "Person/1", "@type": "Person", "name": "new"})
+    written.set()
+    reader.join(5)
+
+    assert client.get_document("Person/1") == {"@id": "Person/1", "name": "new"}
+    # the stale read did not roll the branch back to branch:1
+    assert client.get_document("Person/2") == {"@id": "Person/2"}
+    assert mocked_get.call_count == 4
@@ -0,0 +1,148 @@
+"""Tests for client/http_pool.py module."""
+
+import threading
+import unittest.mock as mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from terminusdb_client.client import Client
+from terminusdb_client.client.http_pool import PoolAdapter
+from terminusdb_client.errors import DatabaseError, InterfaceError
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"@type": "api:InfoResponse"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class _UnavailableHandler(_Handler):
+    """Answers 503 to the writes, recording their (chunked) bodies"""
+
+    bodies = []
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_PUT(self):
+        body = b""
+        while True:
+            size = int(self.rfile.readline().strip(), 16)
+            chunk = self.rfile.read(size + 2)[:size]
+            if not size:
+                break
+            body += chunk
+        self.bodies.append(body)
+        body = b'{"api:status": "api:failure", "api:message": "unavailable"}'
+        self.send_response(503)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_client_session_options():
+    client = Client(
+        "http://localhost:6363",
+        pool_maxsize=64,
+        connect_timeout=3,
+        read_timeout=30,
+        retries=4,
+        backoff_factor=0.1,
+    )
+    adapter = client._new_session().get_adapter("http://localhost:6363/api")
+    assert isinstance(adapter, PoolAdapter)
+    assert adapter._pool_maxsize == 64
+    assert adapter.timeout == (3, 30)
+    assert adapter.max_retries.total == 4
+    assert adapter.max_retries.backoff_factor == 0.1
+    assert 503 in adapter.max_retries.status_forcelist
+    assert "POST" not in adapter.max_retries.allowed_methods
+
+
+def test_adapter_defaults():
+    adapter = PoolAdapter()
+    assert adapter.timeout is None
+    assert adapter.max_retries.total == 0
+
+
+@mock.patch.object(HTTPAdapter, "send")
+def test_adapter_default_timeout(mocked_send):
+    adapter = PoolAdapter(connect_timeout=1, read_timeout=5)
+    request = requests.Request("GET", "http://localhost:6363").prepare()
+    adapter.send(request)
+    assert mocked_send.call_args[1]["timeout"] == (1, 5)
+    adapter.send(request, timeout=2)
+    assert mocked_send.call_args[1]["timeout"] == 2
+
+
+def test_pool_stats(server):
+    client = Client(server)
+    client.connect()
+    for _ in range(3):
+        client.info()
+
+    stats = client.pool_stats()
+    # connect made one request too
+    assert stats["requests"] == 4
+    assert stats["connections"] == 1
+    assert stats["reused"] == 3
+    assert stats["reuse_rate"] == 0.75
+    assert stats["discards"] == 0
+    assert list(stats["hosts"]) == [server]
+
+
+def test_pool_stats_not_connected():
+    with pytest.raises(InterfaceError):
+        Client("http://localhost:6363").pool_stats()
+
+
+def test_streamed_body_not_retried():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _UnavailableHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = Client(
+            f"http://127.0.0.1:{httpd.server_address[1]}",
+            retries=3,
+            backoff_factor=0,
+        )
+        client.connect(db="myDBName")
+        adapter = client._session.get_adapter(client.api)
+        sent = adapter.pool_stats()["requests"]
+        documents = ({"@type": "Person", "@id": f"Person/{i}"} for i in range(3))
+        with pytest.raises(DatabaseError):
+            client.replace_document(documents, compress="never", stream=True)
+        # sent with the pools of the adapter, by an adapter built once
+        assert adapter.pool_stats()["requests"] == sent + 1
+        assert adapter._without_retries() is adapter._without_retries()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    # a retry would have sent the exhausted generator again, with no documents
+    assert len(_UnavailableHandler.bodies) == 1
+    assert _UnavailableHandler.bodies[0].count(b"Person/") == 3
@@ -0,0 +1,100 @@
+"""Tests for json_codec.py module."""
+
+import dataclasses
+import datetime as dt
+import enum
+import unittest.mock as mock
+import uuid
+
+import pytest
+
+from terminusdb_client import json_codec
+from terminusdb_client.client import GraphType
+
+
+@pytest.fixture(params=["json", "orjson"])
+def codec(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    previous = json_codec.get_codec()
+    yield json_codec.set_codec(request.param)
+    json_codec.set_codec(previous)
+
+
+def test_round_trip(codec):
+    doc = {"@id": "Person/José", "@type": "Person", "age": 3, "tags": ["a", None]}
+    encoded = json_codec.dumps(doc)
+    assert isinstance(encoded, bytes)
+    assert "José".encode("utf-8") in encoded
+    assert json_codec.loads(encoded) == doc
+    assert json_codec.loads(encoded.decode("utf-8")) == doc
+
+
+def test_big_integers(codec):
+    big = 2**70
+    assert json_codec.loads(json_codec.dumps({"n": big})) == {"n": big}
+    assert json_codec.loads(b'{"n": 123456789012345678901234567890}') == {
+        "n": 123456789012345678901234567890
+    }
+
+
+def test_long_digits_in_strings(codec):
+    doc = {"@id": "Person/12345678901234567890", "hash": "1234567890123456789012"}
+    encoded = json_codec.dumps(doc)
+    # not taken for a long number, decoded by orjson
+    assert not json_codec._long_number(encoded)
+    assert json_codec.loads(encoded) == doc
+
+
+def test_same_values_encoded(codec):
+    class Colour(enum.Enum):
+        red = "red"
+
+    @dataclasses.dataclass
+    class Point:
+        x: int
+
+    key = uuid.UUID("12345678-1234-5678-1234-567812345678")
+    doc = {
+        "joined": dt.datetime(2021, 3, 4, 5, 6, 7, 8, tzinfo=dt.timezone.utc),
+        "born": dt.date(1990, 1, 2),
+        "key": key,
+        "colour": Colour.red,
+        "point": Point(1),
+    }
+    assert json_codec.loads(json_codec.dumps(doc)) == {
+        "joined": "2021-03-04T05:06:07.000008+00:00",
+        "born": "1990-01-02",
+        "key": "12345678-1234-5678-1234-567812345678",
+        "colour": "red",
+        "point": {"x": 1},
+    }
+    with pytest.raises(TypeError):
+        json_codec.dumps({"tags": {"a"}})
+
+
+def test_enum(codec):
+    assert json_codec.loads(json_codec.dumps({"graph_type": GraphType.SCHEMA})) == {
+        "graph_type": "schema"
+    }
+
+
+def test_invalid_json(codec):
+    with pytest.raises(ValueError):
+        json_codec.loads(b'{"@id": ')
+
+
+def test_set_codec():
+    previous = json_codec.get_codec()
+    try:
+        with pytest.raises(ValueError):
+            json_codec.set_codec("nope")
+        custom = json_codec.JSONCodec()
+        assert json_codec.set_codec(custom) is custom
+        assert json_codec.get_codec() is custom
+        with mock.patch.object(json_codec, "import_module", side_effect=ImportError):
+            with pytest.raises(ImportError) as excinfo:
+                json_codec.set_codec("orjson")
+        assert "terminusdb[orjson]" in str(excinfo.value)
+    finally:
+        json_codec.set_codec(previous)
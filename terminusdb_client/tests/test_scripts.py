@@ -1,10 +1,12 @@
 import json
 import os
 from unittest.mock import MagicMock, patch, mock_open
+
+import pytest
 from click.testing import CliRunner
 
 from ..scripts import scripts
-from ..scripts.scripts import _df_to_schema
+from ..scripts.scripts import _df_to_documents, _df_to_schema, _import_pipeline
 from ..errors import InterfaceError
 
 
@@ -181,6 +183,87 @@ def test_df_to_schema_all_options():
     assert result["department"]["@class"] == "Employee"
 
 
+def test_df_to_documents():
+    """Test documents built column-wise from a DataFrame"""
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame(
+        {
+            "name": ["John", "Jane"],
+            "age": [30, None],
+            "id": ["1", "2"],
+            "friend": ["2", None],
+        }
+    )
+    result = _df_to_documents(
+        "Person", df, embedded=["friend"], id_col="id", na_mode="optional"
+    )
+    assert result == [
+        {
+            "name": "John",
+            "age": 30.0,
+            "id": "1",
+            "friend": {"@type": "@id", "@id": "Person/2"},
+            "@type": "Person",
+            "@id": "Person/1",
+        },
+        {"name": "Jane", "id": "2", "@type": "Person", "@id": "Person/2"},
+    ]
+    # generated ids are left to the schema
+    assert "@id" not in _df_to_documents("Person", df, na_mode="optional")[0]
+    with pytest.raises(RuntimeError):
+        _df_to_documents("Person", df, na_mode="optional", keys=["age"])
+    with pytest.raises(RuntimeError):
+        _df_to_documents("Person", df, id_col="missing")
+
+
+def test_import_pipeline():
+    """Test chunks are transformed and uploaded in order"""
+    pd = pytest.importorskip("pandas")
+    chunks = [pd.DataFrame({"name": [f"P{i}", f"Q{i}"]}) for i in range(5)]
+    uploaded = []
+
+    def prepare(df):
+        return "Person", df, [], None, "error", []
+
+    throughput = _import_pipeline(
+        chunks,
+        prepare,
+        lambda index, documents: uploaded.append((index, documents)),
+        inflight=1,
+    )
+    assert [index for index, _ in uploaded] == [0, 1, 2, 3, 4]
+    assert uploaded[3][1][1] == {
+        "name": "Q3",
+        "@type": "Person",
+        "@id": "name",
+    }
+    assert throughput.rows == {"read": 10, "transform": 10, "upload": 10}
+    assert "upload" in str(throughput)
+
+
+def test_import_pipeline_upload_error():
+    """Test an upload error stops the reading"""
+    pd = pytest.importorskip("pandas")
+    read = []
+
+    def chunks():
+        for i in range(10):
+            read.append(i)
+            yield pd.DataFrame({"name": [f"P{i}"]})
+
+    def upload(index, documents):
+        raise InterfaceError("server down")
+
+    with pytest.raises(InterfaceError):
+        _import_pipeline(
+            chunks(),
+            lambda df: ("Person", df, [], None, "error", []),
+            upload,
+            inflight=1,
+        )
+    assert len(read) < 10
+
+
 # ============================================================================
 # CLI tests
 # ============================================================================
@@ -508,6 +591,36 @@ def test_alldocs_no_type():
 
             assert result.exit_code == 0
             mock_client.get_all_documents.assert_called_with(count=None)
+            assert result.output == (
+                json.dumps([{"@id": "doc1", "@type": "Person"}], indent=4) + "\n"
+            )
+
+
+def test_alldocs_ndjson():
+    """Test alldocs command printing one document per line"""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        with open("config.json", "w") as f:
+            json.dump({"endpoint": "http://127.0.0.1:6363/", "database": "test"}, f)
+        with open(".TDB", "w") as f:
+            json.dump({"branch": "main", "ref": None}, f)
+
+        mock_client = MagicMock()
+        mock_client.get_documents_by_type.return_value = iter(
+            [{"@id": "doc1", "@type": "Person"}, {"@id": "doc2", "@type": "Person"}]
+        )
+
+        with patch(
+            "terminusdb_client.scripts.scripts._connect",
+            return_value=(mock_client, "Connected"),
+        ):
+            result = runner.invoke(
+                scripts.tdbpy, ["alldocs", "--type", "Person", "--ndjson"]
+            )
+
+            assert result.exit_code == 0
+            lines = result.output.splitlines()
+            assert [json.loads(line)["@id"] for line in lines] == ["doc1", "doc2"]
 
 
 def test_alldocs_with_head():
@@ -712,6 +825,7 @@ def test_log_command():
 
 def test_importcsv_with_id_and_keys():
     """Test importcsv with id and keys options"""
+    pytest.importorskip("pandas")
     runner = CliRunner()
     with runner.isolated_filesystem():
         # Create a simple CSV file
@@ -727,55 +841,134 @@ def test_importcsv_with_id_and_keys():
             json.dump({"branch": "main", "ref": None}, f)
 
         mock_client = MagicMock()
-        mock_client.get_existing_classes.return_value = []
-        mock_client.insert_schema = MagicMock()
+        mock_client.get_existing_classes.return_value = ["Test"]
         mock_client.update_document = MagicMock()
+        mock_client._get_current_commit.return_value = "abc123"
 
-        mock_df = MagicMock()
-        mock_df.isna.return_value.any.return_value = False
-        mock_df.columns = ["Name", "Age", "ID"]
-        mock_df.dtypes = {"Name": "object", "Age": "int64", "ID": "int64"}
-        mock_df.to_dict.return_value = [{"Name": "John", "Age": 30, "ID": 1}]
+        with patch(
+            "terminusdb_client.scripts.scripts._connect",
+            return_value=(mock_client, "Connected"),
+        ):
+            result = runner.invoke(
+                scripts.tdbpy,
+                [
+                    "importcsv",
+                    "test.csv",
+                    "Age",
+                    "ID",  # keys
+                    "--id",
+                    "ID",
+                    "--na",
+                    "optional",
+                ],
+            )
+
+            assert result.exit_code == 0
+            assert "specified ids" in result.output
+            documents = mock_client.update_document.call_args[0][0]
+            assert documents[1] == {
+                "name": "Jane",
+                "age": 25,
+                "id": "2",
+                "@type": "Test",
+                "@id": "Test/2",
+            }
+            # the checkpoint is removed once the import is complete
+            assert not os.path.exists("test.csv.checkpoint")
+
+
+def test_importcsv_resume():
+    """Test importcsv resumes after the last committed chunk"""
+    pytest.importorskip("pandas")
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        with open("test.csv", "w") as f:
+            f.write('Name,Note\nJohn,"a\nb"\nJane,c\nJim,d\nJoe,e\n')
+        with open("config.json", "w") as f:
+            json.dump({"endpoint": "http://127.0.0.1:6363/", "database": "test"}, f)
+        with open(".TDB", "w") as f:
+            json.dump({"branch": "main", "ref": None}, f)
+
+        mock_client = MagicMock()
+        mock_client.get_existing_classes.return_value = ["Test"]
+        mock_client._get_current_commit.side_effect = ["c0", "c1"]
+        # the server fails on the second chunk
+        mock_client.update_document.side_effect = [None, InterfaceError("down")]
+
+        args = ["importcsv", "test.csv", "--chunksize", "2"]
+        with patch(
+            "terminusdb_client.scripts.scripts._connect",
+            return_value=(mock_client, "Connected"),
+        ):
+            result = runner.invoke(scripts.tdbpy, args)
+            assert result.exit_code != 0
+            with open("test.csv.checkpoint") as f:
+                checkpoint = json.load(f)
+            assert checkpoint["chunk"] == 1
+            assert checkpoint["rows"] == 2
+            assert checkpoint["offset"] == len('Name,Note\nJohn,"a\nb"\nJane,c\n')
+            assert checkpoint["commit"] == "c1"
+            assert checkpoint["pending"]["rows"] == 2
+
+            # resumed with other options
+            result = runner.invoke(scripts.tdbpy, args + ["--resume", "--sep", ";"])
+            assert result.exit_code != 0
+            assert "sep" in str(result.exception)
 
-        mock_reader = MagicMock()
-        mock_reader.__iter__.return_value = iter([mock_df])
+            mock_client.update_document.reset_mock()
+            mock_client.update_document.side_effect = None
+            mock_client._get_current_commit.side_effect = ["c1", "c3"]
+            result = runner.invoke(scripts.tdbpy, args + ["--resume"])
+            assert result.exit_code == 0
+            assert "after chunk 1 (2 records)" in result.output
+            assert "Warning" not in result.output
+            documents = mock_client.update_document.call_args[0][0]
+            assert [document["name"] for document in documents] == ["Jim", "Joe"]
+            assert mock_client.update_document.call_count == 1
+            assert not os.path.exists("test.csv.checkpoint")
+
+            result = runner.invoke(scripts.tdbpy, args + ["--resume"])
+            assert result.exit_code != 0
 
+
+def test_importcsv_resume_after_commit():
+    """Test importcsv does not import again a chunk committed before its checkpoint"""
+    pytest.importorskip("pandas")
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        with open("test.csv", "w") as f:
+            f.write("Name,Note\nJohn,a\nJane,c\nJim,d\n")
+        with open("config.json", "w") as f:
+            json.dump({"endpoint": "http://127.0.0.1:6363/", "database": "test"}, f)
+        with open(".TDB", "w") as f:
+            json.dump({"branch": "main", "ref": None}, f)
+
+        mock_client = MagicMock()
+        mock_client.get_existing_classes.return_value = ["Test"]
+        # the new branch has no commit, the client stops after the first commit
+        mock_client._get_current_commit.side_effect = [
+            IndexError(),
+            InterfaceError("down"),
+        ]
+
+        args = ["importcsv", "test.csv", "--chunksize", "2"]
         with patch(
             "terminusdb_client.scripts.scripts._connect",
             return_value=(mock_client, "Connected"),
         ):
-            with patch("pandas.read_csv", return_value=mock_reader):
-                with patch(
-                    "terminusdb_client.scripts.scripts.import_module"
-                ) as mock_import:
-                    mock_pd = MagicMock()
-                    mock_pd.read_csv.return_value = mock_reader
-                    mock_np = MagicMock()
-                    mock_np.sctypeDict.items.return_value = [
-                        ("int64", int),
-                        ("object", str),
-                    ]
-                    mock_import.side_effect = lambda name: {
-                        "pandas": mock_pd,
-                        "numpy": mock_np,
-                    }[name]
-
-                    result = runner.invoke(
-                        scripts.tdbpy,
-                        [
-                            "importcsv",
-                            "test.csv",
-                            "Age",
-                            "ID",  # keys
-                            "--id",
-                            "ID",
-                            "--na",
-                            "optional",
-                        ],
-                    )
-
-                    assert result.exit_code == 0
-                    assert "specified ids" in result.output
+            result = runner.invoke(scripts.tdbpy, args)
+            assert result.exit_code != 0
+            assert mock_client.update_document.call_count == 1
+
+            mock_client.update_document.reset_mock()
+            mock_client._get_current_commit.side_effect = ["c1", "c2"]
+            result = runner.invoke(scripts.tdbpy, args + ["--resume"])
+            assert result.exit_code == 0
+            assert "after chunk 1 (2 records)" in result.output
+            assert "Warning" not in result.output
+            documents = mock_client.update_document.call_args[0][0]
+            assert [document["name"] for document in documents] == ["Jim"]
+            assert mock_client.update_document.call_count == 1
 
 
 def test_branch_list():
@@ -858,11 +1051,11 @@ def test_query_with_export():
             return_value=(mock_client, "Connected"),
         ):
             with patch(
-                "terminusdb_client.scripts.scripts.result_to_df"
-            ) as mock_result_to_df:
+                "terminusdb_client.scripts.scripts.result_to_df_chunks"
+            ) as mock_result_to_df_chunks:
                 mock_df = MagicMock()
                 mock_df.to_csv = MagicMock()
-                mock_result_to_df.return_value = mock_df
+                mock_result_to_df_chunks.return_value = iter([mock_df, mock_df])
 
                 result = runner.invoke(
                     scripts.tdbpy,
@@ -877,7 +1070,12 @@ def test_query_with_export():
                 )
 
                 assert result.exit_code == 0
-                mock_df.to_csv.assert_called_once_with("output.csv", index=False)
+                # chunks are appended to the file, with the header once
+                assert mock_df.to_csv.call_count == 2
+                first, second = mock_df.to_csv.call_args_list
+                assert first[1] == {"index": False, "header": True}
+                assert second[1] == {"index": False, "header": False}
+                assert first[0][0].name == "output.csv"
 
 
 def test_query_with_type_conversion():
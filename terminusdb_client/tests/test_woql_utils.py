@@ -6,13 +6,16 @@ import pytest
 
 from terminusdb_client.woql_utils import (
     _result2stream,
+    _chunks2stream,
     _args_as_payload,
+    _finish_document_stream,
     _finish_response,
     _clean_list,
     _clean_dict,
     _dt_list,
     _dt_dict,
 )
+from terminusdb_client import json_codec
 from terminusdb_client.errors import DatabaseError
 
 
@@ -44,6 +47,64 @@ def test_result2stream_empty():
     assert len(stream) == 0
 
 
+def test_result2stream_leading_whitespace():
+    """Test _result2stream skips whitespace before the first object."""
+    result = '\n {"a": 1}\n'
+    stream = list(_result2stream(result))
+
+    assert stream == [{"a": 1}]
+
+
+def test_chunks2stream_split_documents():
+    """Test _chunks2stream decodes documents split across chunks."""
+    body = '{"a": 1}\n{"b": "caf\u00e9"}\n[1, 2]\n12\n34'.encode("utf-8")
+    for size in (1, 2, 5, len(body)):
+        chunks = [body[i : i + size] for i in range(0, len(body), size)]
+        stream = list(_chunks2stream(chunks))
+
+        assert stream == [{"a": 1}, {"b": "caf\u00e9"}, [1, 2], 12, 34]
+
+
+def test_chunks2stream_is_lazy():
+    """Test _chunks2stream yields a document before later chunks are read."""
+
+    def chunks():
+        yield b'{"a": 1}\n{"b"'
+        raise AssertionError("read too far")
+
+    stream = _chunks2stream(chunks())
+
+    assert next(stream) == {"a": 1}
+
+
+def test_chunks2stream_uses_codec():
+    """Test _chunks2stream decodes each line from its bytes with the codec in use."""
+    decoded = []
+
+    class RecordingCodec(json_codec.JSONCodec):
+        def loads(self, data):
+            decoded.append(data)
+            return super().loads(data)
+
+    previous = json_codec.get_codec()
+    json_codec.set_codec(RecordingCodec())
+    try:
+        chunks = [b'{"a": 1}\n{"b"', b': 2}\n{"c":\n 3}\n{"d": 4}']
+        stream = list(_chunks2stream(chunks))
+    finally:
+        json_codec.set_codec(previous)
+
+    assert stream == [{"a": 1}, {"b": 2}, {"c": 3}, {"d": 4}]
+    assert b'{"a": 1}' in decoded
+    assert b'{"b": 2}' in decoded
+
+
+def test_chunks2stream_malformed():
+    """Test _chunks2stream raises on malformed trailing data."""
+    with pytest.raises(ValueError):
+        list(_chunks2stream([b'{"a": 1}\n{"b": ']))
+
+
 def test_args_as_payload_filters_none():
     """Test _args_as_payload filters out None values."""
     args = {"a": 1, "b": None, "c": "test"}
@@ -100,6 +161,30 @@ def test_finish_response_streaming():
     mock_response.iter_lines.assert_called_once()
 
 
+def test_finish_document_stream():
+    """Test _finish_document_stream decodes the body from iter_content."""
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.iter_content.return_value = iter([b'{"a": 1}\n{"b', b'": 2}'])
+    mock_response.headers = {"Terminusdb-Data-Version": "v1.0"}
+
+    stream, version = _finish_document_stream(mock_response, get_version=True)
+
+    assert list(stream) == [{"a": 1}, {"b": 2}]
+    assert version == "v1.0"
+
+
+def test_finish_document_stream_error():
+    """Test _finish_document_stream raises DatabaseError on error status."""
+    mock_response = Mock()
+    mock_response.status_code = 404
+    mock_response.text = "error"
+    mock_response.headers = {"content-type": "text/plain"}
+
+    with pytest.raises(DatabaseError):
+        _finish_document_stream(mock_response)
+
+
 def test_finish_response_error():
     """Test _finish_response raises DatabaseError on error status."""
     mock_response = Mock()
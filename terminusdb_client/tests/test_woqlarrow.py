@@ -0,0 +1,195 @@
+"""Tests for woqldataframe/woqlArrow.py module."""
+
+import datetime as dt
+import unittest.mock as mock
+
+import pytest
+
+from terminusdb_client.errors import InterfaceError
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from terminusdb_client.client import Client  # noqa: E402
+from terminusdb_client.woqldataframe import (  # noqa: E402
+    arrow_schema,
+    parquet_to_documents,
+    to_record_batches,
+)
+
+SCHEMA = {
+    "Person": {
+        "@id": "Person",
+        "@type": "Class",
+        "name": "xsd:string",
+        "age": {"@type": "Optional", "@class": "xsd:integer"},
+        "height": "xsd:decimal",
+        "active": "xsd:boolean",
+        "born": "xsd:date",
+        "joined": "xsd:dateTime",
+        "nicknames": {"@type": "Set", "@class": "xsd:string"},
+        "address": "Address",
+        "friend": {"@type": "Optional", "@class": "Person"},
+        "extra": "sys:JSON",
+    },
+    "Address": {
+        "@id": "Address",
+        "@type": "Class",
+        "@subdocument": [],
+        "street": "xsd:string",
+        "number": "xsd:integer",
+    },
+}
+
+DOCUMENTS = [
+    {
+        "@id": "Person/1",
+        "@type": "Person",
+        "name": "Jane",
+        "age": 30,
+        "height": "1.70",
+        "active": True,
+        "born": "1990-01-02",
+        "joined": "2021-03-04T05:06:07Z",
+        "nicknames": ["J"],
+        "address": {"@type": "Address", "street": "Main", "number": 1},
+        "friend": "Person/2",
+        "extra": {"a": [1, 2]},
+    },
+    {
+        "@id": "Person/2",
+        "@type": "Person",
+        "name": "John",
+        "height": 1.8,
+        "active": False,
+        "born": "1991-05-06",
+        "joined": "2022-01-01T00:00:00Z",
+        "nicknames": [],
+        "address": {"@type": "Address", "street": "High", "number": 2},
+        "extra": None,
+    },
+]
+
+
+def test_arrow_schema():
+    schema = arrow_schema(SCHEMA, "Person")
+    assert schema.names[0] == "@id"
+    assert schema.field("age").type == pa.decimal128(38, 0)
+    assert schema.field("height").type == pa.string()
+    assert schema.field("active").type == pa.bool_()
+    assert schema.field("born").type == pa.date32()
+    assert schema.field("joined").type == pa.timestamp("us", tz="UTC")
+    assert schema.field("nicknames").type == pa.list_(pa.string())
+    assert schema.field("address.number").type == pa.decimal128(38, 0)
+    # references to documents are kept as ids
+    assert schema.field("friend").metadata[b"terminusdb:type"] == b"xsd:string"
+    with pytest.raises(InterfaceError):
+        arrow_schema(SCHEMA, "Nobody")
+
+
+def test_parquet_round_trip(tmp_path):
+    batches = to_record_batches(iter(DOCUMENTS), SCHEMA, "Person", batch_size=1)
+    filename = str(tmp_path / "Person.parquet")
+    with pq.ParquetWriter(filename, batches.schema) as writer:
+        for batch in batches:
+            assert batch.num_rows == 1
+            writer.write_batch(batch)
+    parquet_file = pq.ParquetFile(filename)
+    assert parquet_file.num_row_groups == 2
+    table = parquet_file.read()
+    assert table.column("joined")[0].as_py() == dt.datetime(
+        2021, 3, 4, 5, 6, 7, tzinfo=dt.timezone.utc
+    )
+    assert table.column("age").to_pylist() == [30, None]
+
+    documents = list(parquet_to_documents(filename))
+    assert documents[0] == {
+        "@id": "Person/1",
+        "@type": "Person",
+        "name": "Jane",
+        "age": 30,
+        "height": "1.70",
+        "active": True,
+        "born": "1990-01-02",
+        "joined": "2021-03-04T05:06:07Z",
+        "nicknames": ["J"],
+        "address": {"@type": "Address", "street": "Main", "number": 1},
+        "friend": "Person/2",
+        "extra": {"a": [1, 2]},
+    }
+    assert "age" not in documents[1]
+    assert "extra" not in documents[1]
+    assert documents[1]["height"] == "1.8"
+    assert documents[1]["nicknames"] == []
+
+
+def test_big_integers(tmp_path):
+    schema = {
+        "Counter": {
+            "@id": "Counter",
+            "@type": "Class",
+            "count": "xsd:integer",
+            "total": "xsd:nonNegativeInteger",
+            "small": "xsd:long",
+        }
+    }
+    document = {
+        "@id": "Counter/1",
+        "@type": "Counter",
+        "count": -(2**63) - 1,
+        "total": 2**64 + 1,
+        "small": 2**62,
+    }
+    batches = to_record_batches([document], schema, "Counter")
+    assert batches.schema.field("small").type == pa.int64()
+    filename = str(tmp_path / "Counter.parquet")
+    with pq.ParquetWriter(filename, batches.schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+    assert list(parquet_to_documents(filename)) == [document]
+
+
+def test_parquet_without_metadata(tmp_path):
+    filename = str(tmp_path / "plain.parquet")
+    table = pa.table(
+        {"name": ["Jane", None], "joined": [dt.datetime(2021, 3, 4), None]}
+    )
+    pq.write_table(table, filename)
+    with pytest.raises(ValueError):
+        list(parquet_to_documents(filename))
+    assert list(parquet_to_documents(filename, "Person")) == [
+        {"@type": "Person", "name": "Jane", "joined": "2021-03-04T00:00:00Z"},
+        {"@type": "Person"},
+    ]
+
+
+def test_client_export_arrow():
+    client = Client("http://localhost:6363")
+    client._connected = True
+    client.db = "myDBName"
+    with mock.patch.object(
+        client, "get_existing_classes", return_value=SCHEMA
+    ), mock.patch.object(
+        client, "get_documents_by_type", return_value=iter(DOCUMENTS)
+    ) as mocked_get:
+        table = client.export_arrow("Person", prefixed=False).read_all()
+        mocked_get.assert_called_once_with("Person", prefixed=False)
+        assert table.num_rows == 2
+        with pytest.raises(InterfaceError):
+            client.export_arrow("Nobody")
+
+
+def test_times_in_utc():
+    schema = {"Shift": {"@id": "Shift", "@type": "Class", "start": "xsd:time"}}
+    documents = [
+        {"@type": "Shift", "start": start}
+        for start in ["10:30:00+02:00", "23:00:00-02:00", "12:00:00Z", "09:15:00"]
+    ]
+    batch = to_record_batches(documents, schema, "Shift").read_next_batch()
+    assert batch.schema.field("start").type == pa.time64("us")
+    assert batch.column("start").to_pylist() == [
+        dt.time(8, 30),
+        dt.time(1, 0),
+        dt.time(12, 0),
+        dt.time(9, 15),
+    ]
@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 from terminusdb_client.woqldataframe.woqlDataframe import (
     result_to_df,
+    result_to_df_chunks,
     _expand_df,
     _embed_obj,
 )
@@ -169,40 +170,153 @@ def test_result_to_df_requires_client_for_embedding():
 
 def test_result_to_df_expand_nested_json():
     """Test that result_to_df expands nested JSON structures."""
-    mock_pd = MagicMock()
+    result = result_to_df(
+        [
+            {
+                "@id": "Person/Jane",
+                "@type": "Person",
+                "address": {
+                    "@id": "Address/1",
+                    "@type": "Address",
+                    "street": "Main St",
+                    "geo": {"@id": "Geo/1", "@type": "Geo", "lat": 1.5},
+                },
+                "name": "Jane",
+            },
+            {"@id": "Person/Joe", "@type": "Person", "name": "Joe"},
+        ]
+    )
 
-    # Setup mock DataFrame with nested structure
-    mock_df = MagicMock()
-    mock_df.__getitem__.return_value.unique.return_value = ["Person"]
-    mock_df.columns = ["Document id", "address"]
-    mock_df.rename.return_value = mock_df
-    mock_df.drop.return_value = mock_df
-    mock_df.join.return_value = mock_df
+    # subdocument columns come after the other ones, as json_normalize names them
+    assert list(result.columns) == [
+        "Document id",
+        "name",
+        "address.street",
+        "address.geo.@id",
+        "address.geo.@type",
+        "address.geo.lat",
+    ]
+    assert list(result["Document id"]) == ["Person/Jane", "Person/Joe"]
+    assert result["address.street"][0] == "Main St"
+    assert result["address.street"].isna()[1]
 
-    # Mock json_normalize to simulate expansion
-    mock_expanded = MagicMock()
-    mock_expanded.columns = ["@id", "street"]
-    mock_pd.json_normalize.return_value = mock_expanded
 
-    mock_pd.DataFrame.return_value.from_records.return_value = mock_df
+def test_result_to_df_no_schema_without_embedding():
+    """Test that result_to_df keeps the columns of the documents without fetching the schema."""
+    mock_client = MagicMock()
 
-    with patch(
-        "terminusdb_client.woqldataframe.woqlDataframe.import_module",
-        return_value=mock_pd,
-    ):
-        result = result_to_df(
-            [
-                {
-                    "@id": "Person/Jane",
-                    "@type": "Person",
-                    "address": {"@id": "Address/1", "street": "Main St"},
-                }
-            ]
-        )
+    result = result_to_df(
+        [
+            {"@id": "Person/Jane", "@type": "Person", "age": 30, "name": "Jane"},
+            {"@id": "Person/Joe", "@type": "Person", "name": "Joe"},
+        ],
+        client=mock_client,
+    )
 
-        # json_normalize should be called for expansion
-        assert mock_pd.json_normalize.called
-        assert result is not None
+    assert not mock_client.get_existing_classes.called
+    assert list(result.columns) == ["Document id", "age", "name"]
+
+
+def test_result_to_df_chunks_schema_layout():
+    """Test that the columns of the chunks follow the schema when a client is provided."""
+    mock_client = MagicMock()
+    mock_client.get_existing_classes.return_value = {
+        "Named": {"@type": "Class", "name": "xsd:string"},
+        "Person": {
+            "@type": "Class",
+            "@inherits": "Named",
+            "age": "xsd:integer",
+            "address": {"@type": "Optional", "@class": "Address"},
+            "friends": {"@type": "Set", "@class": "Person"},
+        },
+        "Address": {"@type": "Class", "@subdocument": [], "street": "xsd:string"},
+    }
+
+    (result,) = result_to_df_chunks(
+        [
+            {"@id": "Person/Jane", "@type": "Person", "age": 30, "name": "Jane"},
+            {
+                "@id": "Person/Joe",
+                "@type": "Person",
+                "address": {"@id": "Address/1", "@type": "Address", "street": "A"},
+                "name": "Joe",
+            },
+        ],
+        client=mock_client,
+    )
+
+    assert list(result.columns) == [
+        "Document id",
+        "name",
+        "age",
+        "address.street",
+        "friends",
+    ]
+    assert list(result["name"]) == ["Jane", "Joe"]
+    assert result["friends"].isna().all()
+    assert result["address.street"][1] == "A"
+
+
+def test_result_to_df_chunks():
+    """Test result_to_df_chunks yields bounded DataFrames with the columns of the first one."""
+    import pandas as pd
+
+    records = [
+        {"@id": f"Person/{i}", "@type": "Person", "name": f"name{i}"} for i in range(5)
+    ]
+    records[1]["age"] = 1
+    records[4]["extra"] = "x"
+
+    with pytest.warns(UserWarning, match="extra"):
+        chunks = list(result_to_df_chunks(iter(records), chunksize=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    for chunk in chunks:
+        assert list(chunk.columns) == ["Document id", "name", "age"]
+    assert list(chunks[2].index) == [4]
+    combined = pd.concat(chunks)
+    expected = result_to_df(records[:4])
+    pd.testing.assert_frame_equal(combined.iloc[:4], expected, check_dtype=False)
+
+
+def test_result_to_df_chunks_embedded_header():
+    """Test result_to_df_chunks keeps the columns of the schema when embedding."""
+    schema = {
+        "Company": {"@id": "Company", "@type": "Class", "ceo": "Person"},
+        "Person": {
+            "@id": "Person",
+            "@type": "Class",
+            "name": "xsd:string",
+            "age": {"@type": "Optional", "@class": "xsd:integer"},
+        },
+    }
+    people = {
+        "Person/1": {"@id": "Person/1", "@type": "Person", "name": "Jane"},
+        "Person/2": {"@id": "Person/2", "@type": "Person", "name": "Jim", "age": 3},
+    }
+    client = MagicMock()
+    client.get_existing_classes.return_value = schema
+    client.get_documents.side_effect = lambda ids, workers: [people[i] for i in ids]
+    records = [
+        {"@id": "Company/1", "@type": "Company", "ceo": "Person/1"},
+        {"@id": "Company/2", "@type": "Company", "ceo": "Person/2"},
+    ]
+
+    chunks = list(
+        result_to_df_chunks(records, chunksize=1, max_embed_dep=1, client=client)
+    )
+
+    for chunk in chunks:
+        assert list(chunk.columns) == ["Document id", "ceo.name", "ceo.age"]
+    assert chunks[1]["ceo.age"].tolist() == [3]
+
+
+def test_result_to_df_chunks_multiple_types_error():
+    """Test result_to_df_chunks checks the type across chunks."""
+    records = [{"@id": "A/1", "@type": "A"}, {"@id": "B/1", "@type": "B"}]
+    with pytest.raises(ValueError) as exc_info:
+        list(result_to_df_chunks(records, chunksize=1))
+    assert "multiple type" in str(exc_info.value).lower()
 
 
 def test_result_to_df_expand_df_exception_handling():
@@ -302,7 +416,7 @@ def test_result_to_df_embed_obj_with_xsd_type():
         and True  # Simplified enum check
     )
 
-    # xsd types should be skipped (not processed with get_document)
+    # xsd types should be skipped (not processed with get_documents)
     assert prop_type.startswith("xsd:")
     assert should_skip is True
 
@@ -344,8 +458,8 @@ def test_result_to_df_embed_obj_with_enum_type():
 
 
 def test_result_to_df_embed_obj_applies_get_document():
-    """Test embed_obj applies get_document to valid properties (line 63)."""
-    # Test the logic that applies get_document
+    """Test embed_obj applies get_documents to valid properties (line 63)."""
+    # Test the logic that applies get_documents
 
     prop_type = "Address"
     class_obj = "Person"
@@ -360,7 +474,7 @@ def test_result_to_df_embed_obj_applies_get_document():
     )
 
     assert should_process is True
-    # This would trigger: df[col] = df[col].apply(client.get_document)
+    # This would trigger: df[col] = _embed_column(df[col], client, documents, workers)
 
 
 def test_result_to_df_embed_obj_returns_early_for_maxdep_zero():
@@ -392,8 +506,8 @@ def test_result_to_df_embed_obj_returns_early_for_maxdep_zero():
             client=mock_client,
         )
 
-        # Should return early without calling get_document
-        assert not mock_client.get_document.called
+        # Should return early without calling get_documents
+        assert not mock_client.get_documents.called
         assert result is not None
 
 
@@ -432,7 +546,7 @@ class TestEmbedObjCoverage:
         assert prop_type == "xsd:string"
 
     def test_embed_obj_applies_get_document_logic(self):
-        """Test embed_obj applies get_document to object properties"""
+        """Test embed_obj applies get_documents to object properties"""
         # Test the condition from lines 58-63
 
         prop_type = "Address"
@@ -448,7 +562,7 @@ class TestEmbedObjCoverage:
         )
 
         assert should_process is True
-        # This would trigger: df[col] = df[col].apply(client.get_document)
+        # This would trigger: df[col] = _embed_column(df[col], client, documents, workers)
 
     def test_embed_obj_recursive_call_logic(self):
         """Test embed_obj makes recursive call when columns change"""
@@ -513,8 +627,8 @@ class TestEmbedObjCoverage:
             result = result_to_df(test_data, max_embed_dep=0, client=mock_client)
             assert result is not None
 
-            # Verify get_document was not called when max_embed_dep=0
-            assert not mock_client.get_document.called
+            # Verify get_documents was not called when max_embed_dep=0
+            assert not mock_client.get_documents.called
 
 
 class TestExpandDfDirect:
@@ -569,12 +683,12 @@ class TestEmbedObjDirect:
 
         result = _embed_obj(df, 0, pd, False, all_existing_class, "Person", mock_client)
 
-        # Should return the same DataFrame without calling get_document
+        # Should return the same DataFrame without calling get_documents
         assert result is df
-        assert not mock_client.get_document.called
+        assert not mock_client.get_documents.called
 
     def test_embed_obj_processes_object_properties(self):
-        """Test _embed_obj calls get_document for object properties"""
+        """Test _embed_obj calls get_documents for object properties"""
         import pandas as pd
 
         df = pd.DataFrame([{"name": "John", "address": "addr1"}])
@@ -583,11 +697,11 @@ class TestEmbedObjDirect:
         # Use a real function that pandas can handle
         call_tracker = []
 
-        def real_get_document(doc_id):
-            call_tracker.append(doc_id)
-            return "expanded_" + str(doc_id)
+        def real_get_documents(ids, workers=1):
+            call_tracker.extend(ids)
+            return ["expanded_" + str(doc_id) for doc_id in ids]
 
-        mock_client.get_document = real_get_document
+        mock_client.get_documents = real_get_documents
 
         all_existing_class = {
             "Person": {"name": "xsd:string", "address": "Address"},
@@ -596,7 +710,7 @@ class TestEmbedObjDirect:
 
         result = _embed_obj(df, 1, pd, False, all_existing_class, "Person", mock_client)
 
-        # get_document should have been called
+        # get_documents should have been called
         assert len(call_tracker) > 0
         assert result is not None
 
@@ -611,8 +725,8 @@ class TestEmbedObjDirect:
 
         _embed_obj(df, 1, pd, False, all_existing_class, "Person", mock_client)
 
-        # get_document should NOT have been called for xsd:string
-        assert not mock_client.get_document.called
+        # get_documents should NOT have been called for xsd:string
+        assert not mock_client.get_documents.called
 
     def test_embed_obj_skips_same_class(self):
         """Test _embed_obj skips properties of the same class (self-reference)"""
@@ -625,8 +739,8 @@ class TestEmbedObjDirect:
 
         _embed_obj(df, 1, pd, False, all_existing_class, "Person", mock_client)
 
-        # get_document should NOT have been called for same class reference
-        assert not mock_client.get_document.called
+        # get_documents should NOT have been called for same class reference
+        assert not mock_client.get_documents.called
 
     def test_embed_obj_skips_enum_types(self):
         """Test _embed_obj skips Enum types"""
@@ -642,8 +756,8 @@ class TestEmbedObjDirect:
 
         _embed_obj(df, 1, pd, False, all_existing_class, "Person", mock_client)
 
-        # get_document should NOT have been called for Enum type
-        assert not mock_client.get_document.called
+        # get_documents should NOT have been called for Enum type
+        assert not mock_client.get_documents.called
 
     def test_embed_obj_handles_nested_properties(self):
         """Test _embed_obj handles nested property paths like address.city"""
@@ -655,11 +769,11 @@ class TestEmbedObjDirect:
         # Use a real function that pandas can handle
         call_tracker = []
 
-        def real_get_document(doc_id):
-            call_tracker.append(doc_id)
-            return "expanded_" + str(doc_id)
+        def real_get_documents(ids, workers=1):
+            call_tracker.extend(ids)
+            return ["expanded_" + str(doc_id) for doc_id in ids]
 
-        mock_client.get_document = real_get_document
+        mock_client.get_documents = real_get_documents
 
         all_existing_class = {
             "Person": {"name": "xsd:string", "address": "Address"},
@@ -669,7 +783,7 @@ class TestEmbedObjDirect:
 
         result = _embed_obj(df, 1, pd, False, all_existing_class, "Person", mock_client)
 
-        # get_document should have been called for the nested city property
+        # get_documents should have been called for the nested city property
         assert len(call_tracker) > 0
         assert result is not None
 
@@ -677,20 +791,24 @@ class TestEmbedObjDirect:
         """Test _embed_obj recurses when expand_df adds new columns"""
         import pandas as pd
 
-        # Start with a column that will trigger get_document
+        # Start with a column that will trigger get_documents
         df = pd.DataFrame([{"name": "John", "address": "addr1"}])
         mock_client = MagicMock()
 
         # Use a real function - first call returns a dict that expands
         call_count = [0]
 
-        def real_get_document(doc_id):
-            call_count[0] += 1
-            if call_count[0] == 1:
-                return {"@id": "addr1", "street": "Main St"}
-            return "simple_value"
+        def real_get_documents(ids, workers=1):
+            documents = []
+            for doc_id in ids:
+                call_count[0] += 1
+                if call_count[0] == 1:
+                    documents.append({"@id": "addr1", "street": "Main St"})
+                else:
+                    documents.append("simple_value")
+            return documents
 
-        mock_client.get_document = real_get_document
+        mock_client.get_documents = real_get_documents
 
         all_existing_class = {
             "Person": {"name": "xsd:string", "address": "Address"},
@@ -713,11 +831,11 @@ class TestEmbedObjDirect:
         # Use a real function that returns a simple string
         call_tracker = []
 
-        def real_get_document(doc_id):
-            call_tracker.append(doc_id)
-            return "simple_value"
+        def real_get_documents(ids, workers=1):
+            call_tracker.extend(ids)
+            return ["simple_value" for doc_id in ids]
 
-        mock_client.get_document = real_get_document
+        mock_client.get_documents = real_get_documents
 
         all_existing_class = {
             "Person": {"name": "xsd:string", "address": "Address"},
@@ -730,6 +848,42 @@ class TestEmbedObjDirect:
         assert result is not None
         assert len(call_tracker) > 0
 
+    def test_embed_obj_fetches_distinct_ids_once(self):
+        """Test _embed_obj fetches each referenced id once, in one batch per column and level"""
+        import pandas as pd
+
+        df = pd.DataFrame(
+            [
+                {"name": "John", "address": "Address/1", "work": "Address/2"},
+                {"name": "Jane", "address": "Address/1", "work": None},
+                {"name": "Jim", "address": "Address/2", "work": "Address/2"},
+            ]
+        )
+        addresses = {
+            "Address/1": {"@id": "Address/1", "city": "City/1"},
+            "Address/2": {"@id": "Address/2", "city": "City/1"},
+            "City/1": {"@id": "City/1", "name": "Paris"},
+        }
+        calls = []
+
+        def real_get_documents(ids, workers=1):
+            calls.append(list(ids))
+            return [addresses[doc_id] for doc_id in ids]
+
+        mock_client = MagicMock()
+        mock_client.get_documents = real_get_documents
+        all_existing_class = {
+            "Person": {"name": "xsd:string", "address": "Address", "work": "Address"},
+            "Address": {"city": "City"},
+            "City": {"name": "xsd:string"},
+        }
+
+        result = _embed_obj(df, 2, pd, False, all_existing_class, "Person", mock_client)
+
+        assert calls == [["Address/1", "Address/2"], ["City/1"]]
+        assert list(result["address.city.name"]) == ["Paris", "Paris", "Paris"]
+        assert result["work.city.name"].isna().tolist() == [False, True, False]
+
 
 def test_result_to_df_with_embed_obj_full_path():
     """Test result_to_df with max_embed_dep > 0 to cover line 113"""
@@ -742,11 +896,11 @@ def test_result_to_df_with_embed_obj_full_path():
     mock_client.get_existing_classes.return_value = all_existing_class
     mock_client.db = "testdb"
 
-    # Use a real function for get_document
-    def real_get_document(doc_id):
-        return "expanded_" + str(doc_id)
+    # Use a real function for get_documents
+    def real_get_documents(ids, workers=1):
+        return ["expanded_" + str(doc_id) for doc_id in ids]
 
-    mock_client.get_document = real_get_document
+    mock_client.get_documents = real_get_documents
 
     test_data = [
         {"@id": "person1", "@type": "Person", "name": "John", "address": "addr1"}
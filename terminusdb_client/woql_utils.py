@@ -1,25 +1,183 @@
 import json
+import re
+import zlib
 from datetime import datetime
 
+from . import json_codec
 from .errors import DatabaseError
 
 
+# read size used when pulling a streamed response body off the socket
+_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
 def _result2stream(result):
     """turning JSON string into a interable that give you a stream of dictionary"""
     decoder = json.JSONDecoder()
 
-    idx = 0
+    idx = _WHITESPACE.match(result, 0).end()
     result_length = len(result)
-    while True:
-        if idx >= result_length:
-            return
-        data, offset = decoder.raw_decode(result[idx:])
-        idx += offset
-        while idx < result_length and result[idx].isspace():
-            idx += 1
+    while idx < result_length:
+        data, idx = decoder.raw_decode(result, idx)
+        idx = _WHITESPACE.match(result, idx).end()
         yield data
 
 
+class _TextDecoder:
+    """Incremental decoder for JSON documents spread over lines, or sharing one
+
+    Only the undecoded tail is kept, and a partial document is parsed again only
+    once the pending data has doubled, so the total work stays linear in the
+    body size.
+    """
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.idx = 0
+        self.pending = []
+        self.pending_length = 0
+        self.retry_at = 0
+        # part of a document is waiting for the rest of it
+        self.busy = False
+
+    def feed(self, text):
+        """Add some text, yielding the documents it completes"""
+        if not text:
+            return
+        self.pending.append(text)
+        self.pending_length += len(text)
+        self.busy = True
+        if len(self.buffer) - self.idx + self.pending_length < self.retry_at:
+            return
+        buffer = self.buffer[self.idx :] + "".join(self.pending)
+        buffer_length = len(buffer)
+        self.buffer = buffer
+        self.pending = []
+        self.pending_length = 0
+        self.retry_at = 0
+        idx = 0
+        while True:
+            idx = _WHITESPACE.match(buffer, idx).end()
+            if idx >= buffer_length:
+                break
+            try:
+                data, end = self.decoder.raw_decode(buffer, idx)
+            except json.JSONDecodeError:
+                # incomplete document, wait until the pending data doubles
+                self.retry_at = 2 * (buffer_length - idx)
+                break
+            idx = end
+            self.idx = idx
+            yield data
+        self.idx = idx
+        self.busy = idx < buffer_length
+
+    def close(self):
+        """Yield the documents left once the stream has ended"""
+        tail = self.buffer[self.idx :] + "".join(self.pending)
+        self.buffer = ""
+        self.idx = 0
+        self.pending = []
+        self.pending_length = 0
+        self.busy = False
+        yield from _result2stream(tail)
+
+
+class _StreamDecoder:
+    """Incremental decoder for a stream of JSON documents fed in bytes chunks
+
+    The documents are expected one per line: each line is decoded from its
+    bytes with `json_codec` as soon as its line break has arrived. Documents
+    spread over lines, or sharing one, are left to a `_TextDecoder`.
+    """
+
+    def __init__(self):
+        # chunks received after the last line break
+        self.pending = []
+        self.text = _TextDecoder()
+
+    def feed(self, chunk):
+        """Add a chunk, yielding the documents it completes"""
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        if not chunk:
+            return
+        self.pending.append(chunk)
+        if b"\n" not in chunk:
+            return
+        data = b"".join(self.pending)
+        cut = data.rfind(b"\n")
+        self.pending = [data[cut + 1 :]]
+        yield from self._lines(data[:cut].split(b"\n"))
+
+    def _lines(self, lines):
+        loads = json_codec.get_codec().loads
+        for line in lines:
+            if not self.text.busy:
+                if not line.strip():
+                    continue
+                try:
+                    document = loads(line)
+                except ValueError:
+                    pass
+                else:
+                    yield document
+                    continue
+            yield from self.text.feed(line.decode("utf-8") + "\n")
+
+    def close(self):
+        """Yield the documents left once the stream has ended"""
+        tail = b"".join(self.pending)
+        self.pending = []
+        yield from self._lines([tail])
+        yield from self.text.close()
+
+
+def _chunks2stream(chunks):
+    """turning an iterable of JSON text or bytes chunks (e.g. `Response.iter_content`) into a stream of dictionary"""
+    decoder = _StreamDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+
+def _stream2chunks(documents, chunk_size=None):
+    """turning a stream of dictionary into UTF-8 encoded chunks of a JSON list
+
+    Documents are encoded one at a time and joined into chunks of about
+    `chunk_size` bytes, so the whole list is never held in memory.
+    """
+    if chunk_size is None:
+        chunk_size = _CHUNK_SIZE
+    buffer = [b"["]
+    buffer_length = 1
+    separator = b""
+    for document in documents:
+        encoded = separator + json_codec.dumps(document)
+        separator = b","
+        buffer.append(encoded)
+        buffer_length += len(encoded)
+        if buffer_length >= chunk_size:
+            yield b"".join(buffer)
+            buffer = []
+            buffer_length = 0
+    buffer.append(b"]")
+    yield b"".join(buffer)
+
+
+def _gzip_chunks(chunks):
+    """compressing an iterable of bytes into a gzip stream chunk by chunk"""
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
 def _args_as_payload(args: dict) -> dict:
     return {k: v for k, v in args.items() if v}
 
@@ -55,6 +213,71 @@ def _finish_response(request_response, get_version=False, streaming=False):
         raise DatabaseError(request_response)
 
 
+def _finish_json(request_response, get_version=False):
+    """Get the response body decoded from JSON
+
+    The body is decoded from `Response.content` by the JSON codec in use,
+    without decoding it to a str first.
+
+    Parameters
+    ----------
+    request_response: Response Object
+
+    Returns
+    -------
+    dict or list
+        Response content (and the data version if `get_version` is True)
+
+    Raises
+    ------
+    DatabaseError
+        For status codes 400 to 598
+
+    """
+    if request_response.status_code == 200:
+        result = json_codec.loads(request_response.content)
+        if get_version:
+            return result, request_response.headers.get("Terminusdb-Data-Version")
+        return result
+    elif request_response.status_code > 399 and request_response.status_code < 599:
+        raise DatabaseError(request_response)
+
+
+def _finish_document_stream(request_response, get_version=False, chunk_size=None):
+    """Get the response body as a stream of documents
+
+    The body is decoded incrementally from `Response.iter_content`, so the
+    request should be sent with `stream=True` for the first document to be
+    available before the whole body has been downloaded.
+
+    Parameters
+    ----------
+    request_response: Response Object
+    chunk_size: int, optional
+        Number of bytes read from the socket at a time, default to 64 KiB
+
+    Returns
+    -------
+    iterable
+        Stream of dictionaries (and the data version if `get_version` is True)
+
+    Raises
+    ------
+    DatabaseError
+        For status codes 400 to 598
+
+    """
+    if request_response.status_code == 200:
+        if chunk_size is None:
+            chunk_size = _CHUNK_SIZE
+        stream = _chunks2stream(request_response.iter_content(chunk_size=chunk_size))
+        if get_version:
+            return stream, request_response.headers.get("Terminusdb-Data-Version")
+        return stream
+    elif request_response.status_code > 399 and request_response.status_code < 599:
+        raise DatabaseError(request_response)
+
+
 def _clean_list(obj):
     cleaned = []
     for item in obj:
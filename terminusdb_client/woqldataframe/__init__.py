@@ -1 +1,2 @@
-from .woqlDataframe import result_to_df  # noqa
+from .woqlDataframe import result_to_df, result_to_df_chunks  # noqa
+from .woqlArrow import arrow_schema, to_record_batches, parquet_to_documents  # noqa
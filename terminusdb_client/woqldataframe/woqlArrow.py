@@ -0,0 +1,311 @@
+# woqlArrow.py
+
+import datetime as dt
+import json
+from importlib import import_module
+
+from .. import woql_type as wt
+from ..errors import InterfaceError
+from .woqlDataframe import _class_properties, _subdocument_class
+
+CLASS_KEY = b"terminusdb:class"
+SUBDOCUMENTS_KEY = b"terminusdb:subdocuments"
+TYPE_KEY = b"terminusdb:type"
+
+_TIMESTAMPS = ("xsd:dateTime", "xsd:dateTimeStamp")
+# integers without bounds, beyond the range of int64
+_UNBOUNDED_INTEGERS = (
+    "xsd:integer",
+    "xsd:positiveInteger",
+    "xsd:negativeInteger",
+    "xsd:nonPositiveInteger",
+    "xsd:nonNegativeInteger",
+)
+
+
+def _import_pyarrow(module="pyarrow"):
+    try:
+        return import_module(module)
+    except ImportError:
+        raise ImportError(
+            "Library 'pyarrow' is required, install it as follows: python -m pip install -U pyarrow, or with the client: python -m pip install -U terminusdb[arrow]"
+        )
+
+
+def _arrow_type(pa, woql):
+    """Arrow type of the values of a TerminusDB datatype, mapped through `woql_type`.
+
+    Args:
+        pa: pyarrow module reference
+        woql: TerminusDB datatype e.g. "xsd:integer"
+
+    Returns:
+        pyarrow DataType, string for the types without an Arrow counterpart
+    """
+    if woql == "xsd:float":
+        return pa.float64()
+    if woql == "xsd:unsignedLong":
+        return pa.uint64()
+    if woql in _UNBOUNDED_INTEGERS:
+        return pa.decimal128(38, 0)
+    py_type = wt.from_woql_type(woql, skip_convert_error=True)
+    py_type = getattr(py_type, "__supertype__", py_type)
+    if py_type is bool:
+        return pa.bool_()
+    if py_type is int:
+        return pa.int64()
+    if py_type is float:
+        return pa.float64()
+    if py_type is dt.datetime:
+        return pa.timestamp("us", tz="UTC")
+    if py_type is dt.date:
+        return pa.date32()
+    if py_type is dt.time:
+        return pa.time64("us")
+    # str, decimal (kept exact), duration, JSON, ids of documents and enums
+    return pa.string()
+
+
+def _to_arrow(woql, value):
+    """Convert a value of a document to the Python value of its Arrow type"""
+    if woql == "sys:JSON":
+        return json.dumps(value)
+    if woql in _TIMESTAMPS:
+        return wt.datetime_from_woql(value, "xsd:dateTime")
+    if woql == "xsd:date":
+        return wt.datetime_from_woql(value, "xsd:date")
+    if woql == "xsd:time":
+        value = dt.time.fromisoformat(value.replace("Z", "+00:00"))
+        if value.tzinfo is not None:
+            # time64 has no time zone, the times are in UTC as the timestamps
+            value = (
+                dt.datetime.combine(dt.date(2000, 1, 1), value)
+                .astimezone(dt.timezone.utc)
+                .time()
+            )
+        return value
+    return value
+
+
+def _from_arrow(woql, value):
+    """Convert a value of an Arrow column to its value in a document"""
+    if woql == "sys:JSON":
+        return json.loads(value)
+    if woql in _UNBOUNDED_INTEGERS:
+        return int(value)
+    if isinstance(value, dt.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(dt.timezone.utc).replace(tzinfo=None)
+        return value.isoformat() + "Z"
+    if isinstance(value, (dt.date, dt.time)):
+        return value.isoformat()
+    return value
+
+
+class _Column:
+    """Column of a property of the documents, or of their subdocuments"""
+
+    def __init__(self, pa, path, prop_type, all_existing_class):
+        self.path = path
+        self.name = ".".join(path)
+        self.collection = False
+        if isinstance(prop_type, dict):
+            # Set, List, Array and Cardinality are Arrow lists
+            self.collection = prop_type.get("@type") != "Optional"
+            prop_type = prop_type.get("@class")
+        if not isinstance(prop_type, str):
+            self.woql = "sys:JSON"
+        elif prop_type in all_existing_class:
+            class_dict = all_existing_class[prop_type]
+            # subdocuments in a collection are kept as JSON, documents as ids
+            self.woql = "sys:JSON" if "@subdocument" in class_dict else "xsd:string"
+        else:
+            self.woql = prop_type
+        value_type = _arrow_type(pa, self.woql)
+        self.string = pa.types.is_string(value_type)
+        self.field = pa.field(
+            self.name,
+            pa.list_(value_type) if self.collection else value_type,
+            metadata={TYPE_KEY: self.woql},
+        )
+
+    def _convert(self, value):
+        value = _to_arrow(self.woql, value)
+        if self.string and not isinstance(value, str):
+            # e.g. decimals sent as JSON numbers
+            return json.dumps(value)
+        return value
+
+    def values(self, documents):
+        """Values of the column in the documents"""
+        values = []
+        for document in documents:
+            value = document
+            for key in self.path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if value is None:
+                values.append(None)
+            elif self.collection:
+                values.append([self._convert(item) for item in value])
+            else:
+                values.append(self._convert(value))
+        return values
+
+
+def _columns(pa, all_existing_class, class_obj, prefix=(), visited=()):
+    """Columns of the properties of a class and the classes of its subdocuments by dotted path"""
+    visited = visited + (class_obj,)
+    columns = []
+    subdocuments = {}
+    for prop, prop_type in _class_properties(all_existing_class, class_obj).items():
+        path = prefix + (prop,)
+        subdocument = _subdocument_class(all_existing_class, prop_type)
+        if subdocument is None or subdocument in visited:
+            columns.append(_Column(pa, path, prop_type, all_existing_class))
+        else:
+            subdocuments[".".join(path)] = subdocument
+            sub_columns, sub_subdocuments = _columns(
+                pa, all_existing_class, subdocument, path, visited
+            )
+            columns.extend(sub_columns)
+            subdocuments.update(sub_subdocuments)
+    return columns, subdocuments
+
+
+def arrow_schema(all_existing_class, class_obj):
+    """Arrow schema of the documents of a class.
+
+    There is a column for the @id and one for each property, the properties of
+    the subdocuments are in dotted columns (e.g. "address.street"). The class
+    and the TerminusDB datatypes are kept in the metadata of the schema, so
+    `parquet_to_documents` can rebuild the documents.
+
+    Args:
+        all_existing_class: dict of class definitions from schema (see `Client.get_existing_classes`)
+        class_obj: the class of the documents
+
+    Returns:
+        pyarrow.Schema
+    """
+    pa = _import_pyarrow()
+    if class_obj not in all_existing_class:
+        raise InterfaceError(f"{class_obj} not found in the schema.")
+    columns, subdocuments = _columns(pa, all_existing_class, class_obj)
+    fields = [pa.field("@id", pa.string())] + [column.field for column in columns]
+    return pa.schema(
+        fields,
+        metadata={
+            CLASS_KEY: class_obj,
+            SUBDOCUMENTS_KEY: json.dumps(subdocuments),
+        },
+    )
+
+
+def to_record_batches(documents, all_existing_class, class_obj, batch_size=10000):
+    """Turn documents of a class into Arrow record batches of at most `batch_size` rows.
+
+    The documents are consumed as the batches are read, so a stream of
+    documents (e.g. from `Client.get_documents_by_type`) can be written to a
+    Parquet file batch by batch. The values are typed after the schema: numbers
+    and booleans as such, xsd:dateTime as UTC timestamps, xsd:date and
+    xsd:time as dates and times, JSON and subdocuments in collections as JSON
+    strings, references to other documents as ids.
+
+    Args:
+        documents: iterable of documents of the class
+        all_existing_class: dict of class definitions from schema (see `Client.get_existing_classes`)
+        class_obj: the class of the documents
+        batch_size: maximum number of rows in a record batch
+
+    Returns:
+        pyarrow.RecordBatchReader
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size needs to be at least 1.")
+    pa = _import_pyarrow()
+    schema = arrow_schema(all_existing_class, class_obj)
+    columns, _ = _columns(pa, all_existing_class, class_obj)
+
+    def record_batch(chunk):
+        arrays = [pa.array([document.get("@id") for document in chunk], pa.string())]
+        for column in columns:
+            arrays.append(pa.array(column.values(chunk), column.field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def record_batches():
+        chunk = []
+        for document in documents:
+            chunk.append(document)
+            if len(chunk) == batch_size:
+                yield record_batch(chunk)
+                chunk = []
+        if chunk:
+            yield record_batch(chunk)
+
+    return pa.RecordBatchReader.from_batches(schema, record_batches())
+
+
+def _table_documents(table, class_obj, subdocuments):
+    """Documents of the rows of an Arrow table"""
+    fields = []
+    for field in table.schema:
+        metadata = field.metadata or {}
+        woql = metadata.get(TYPE_KEY, b"").decode() or None
+        # the path of the column, the dotted prefixes of subdocuments split
+        path = []
+        start = 0
+        parts = field.name.split(".")
+        for end in range(1, len(parts)):
+            prefix = ".".join(parts[:end])
+            if prefix in subdocuments:
+                path.append((".".join(parts[start:end]), subdocuments[prefix]))
+                start = end
+        fields.append((path, ".".join(parts[start:]), woql))
+    columns = [table.column(index).to_pylist() for index in range(table.num_columns)]
+    for row in zip(*columns):
+        document = {"@type": class_obj}
+        for (path, key, woql), value in zip(fields, row):
+            if value is None:
+                continue
+            if isinstance(value, list):
+                value = [_from_arrow(woql, item) for item in value]
+            else:
+                value = _from_arrow(woql, value)
+            target = document
+            for prop, subdocument in path:
+                if prop not in target:
+                    target[prop] = {"@type": subdocument}
+                target = target[prop]
+            target[key] = value
+        yield document
+
+
+def parquet_to_documents(source, class_obj=None):
+    """Read documents from a Parquet file, one row group at a time.
+
+    Files written from `to_record_batches` (e.g. by `tdbpy exportparquet`)
+    keep the class, the subdocuments and the datatypes of the columns. For
+    other files, the class needs to be given and each column is a property,
+    timestamps, dates and times are converted to their xsd format.
+
+    Args:
+        source: path or file object of the Parquet file
+        class_obj: the class of the documents, from the metadata of the file if not given
+
+    Returns:
+        iterable of documents, to be loaded with `BulkLoader`
+    """
+    pq = _import_pyarrow("pyarrow.parquet")
+    parquet_file = pq.ParquetFile(source)
+    metadata = parquet_file.schema_arrow.metadata or {}
+    if class_obj is None:
+        if CLASS_KEY not in metadata:
+            raise ValueError(
+                "The Parquet file has no TerminusDB class, the class of the documents needs to be given."
+            )
+        class_obj = metadata[CLASS_KEY].decode()
+    subdocuments = json.loads(metadata.get(SUBDOCUMENTS_KEY, b"{}"))
+    for index in range(parquet_file.num_row_groups):
+        yield from _table_documents(
+            parquet_file.read_row_group(index), class_obj, subdocuments
+        )
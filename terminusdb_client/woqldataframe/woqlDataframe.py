@@ -1,13 +1,60 @@
 # woqlDataframe.py
 
+import itertools
+import warnings
 from importlib import import_module
 
 from ..errors import InterfaceError
 
+_MISSING = float("nan")
+
+
+def _is_subdocument(value):
+    return isinstance(value, dict) and "@id" in value
+
+
+def _put(columns, path, row, value):
+    """Set the value of a row in a column built as a list, padding the rows without value."""
+    column = columns.get(path)
+    if column is None:
+        column = columns[path] = []
+    if len(column) < row:
+        column.extend([_MISSING] * (row - len(column)))
+    column.append(value)
+
+
+def _pad(column, rows):
+    if len(column) < rows:
+        column.extend([_MISSING] * (rows - len(column)))
+    return column
+
+
+def _flatten_object(obj, prefix, flat):
+    """Add the values of a nested object to `flat` by dotted path, as `json_normalize` does."""
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            _flatten_object(value, f"{prefix}{key}.", flat)
+        else:
+            flat[prefix + key] = value
+
+
+def _flatten_subdocument(document, prefix, keepid, flat):
+    """Add the values of a subdocument to `flat`, without its @ keys unless `keepid`."""
+    for key, value in document.items():
+        if not keepid and key.startswith("@"):
+            continue
+        if isinstance(value, dict):
+            _flatten_object(value, f"{prefix}{key}.", flat)
+        else:
+            flat[prefix + key] = value
+
 
 def _expand_df(df, pd, keepid):
     """Expand nested JSON objects in DataFrame columns.
 
+    Each column holding objects with an @id is walked once, the new columns
+    are built as lists and added to the frame in a single concat.
+
     Args:
         df: pandas DataFrame to expand
         pd: pandas module reference
@@ -16,26 +63,261 @@ def _expand_df(df, pd, keepid):
     Returns:
         DataFrame with nested objects expanded into separate columns
     """
+    expanded = {}
     for col in df.columns:
         if col == "Document id":
             continue
-        try:
-            expanded = pd.json_normalize(df[col])
-        except Exception:
-            expanded = None
-        if expanded is not None and "@id" in expanded.columns:
-            if not keepid:
-                expanded.drop(
-                    columns=list(filter(lambda x: x[0] == "@", expanded.columns)),
-                    inplace=True,
+        values = df[col].tolist()
+        if not any(_is_subdocument(value) for value in values):
+            continue
+        columns = {}
+        for row, value in enumerate(values):
+            if isinstance(value, dict):
+                flat = {}
+                _flatten_subdocument(value, col + ".", keepid, flat)
+                for path, item in flat.items():
+                    _put(columns, path, row, item)
+        expanded[col] = columns
+    if not expanded:
+        return df
+    new_columns = {
+        path: _pad(column, len(df))
+        for columns in expanded.values()
+        for path, column in columns.items()
+    }
+    return pd.concat(
+        [df.drop(columns=list(expanded)), pd.DataFrame(new_columns, index=df.index)],
+        axis=1,
+    )
+
+
+def _class_properties(all_existing_class, class_obj):
+    """Properties of a class with the inherited ones, by name"""
+    class_dict = all_existing_class.get(class_obj, {})
+    properties = {}
+    parents = class_dict.get("@inherits", [])
+    if not isinstance(parents, list):
+        parents = [parents]
+    for parent in parents:
+        properties.update(_class_properties(all_existing_class, parent))
+    for prop, prop_type in class_dict.items():
+        if not prop.startswith("@"):
+            properties[prop] = prop_type
+    return properties
+
+
+def _subdocument_class(all_existing_class, prop_type):
+    """Class of a property if it holds a single subdocument, None otherwise"""
+    if isinstance(prop_type, dict):
+        if prop_type.get("@type") != "Optional":
+            # Set, List, Array and Cardinality are kept as lists in a cell
+            return None
+        prop_type = prop_type.get("@class")
+    if not isinstance(prop_type, str):
+        return None
+    if "@subdocument" in all_existing_class.get(prop_type, {}):
+        return prop_type
+    return None
+
+
+def _embedded_class(all_existing_class, prop_type, root):
+    """Class of a property if `_embed_obj` embeds its documents, None otherwise"""
+    if not isinstance(prop_type, str) or prop_type == root:
+        return None
+    class_dict = all_existing_class.get(prop_type)
+    if class_dict is None or "@subdocument" in class_dict:
+        return None
+    if class_dict.get("@type") == "Enum":
+        return None
+    return prop_type
+
+
+def _class_layout(
+    all_existing_class,
+    class_obj,
+    keepid,
+    prefix="",
+    visited=(),
+    max_embed_dep=0,
+    root=None,
+):
+    """Dotted column names of a class, with the properties of its subdocuments expanded.
+
+    Args:
+        all_existing_class: dict of class definitions from schema
+        class_obj: the class type of the documents
+        keepid: whether to keep @id columns
+        prefix: dotted path of the subdocument
+        visited: classes of the enclosing subdocuments, to stop on recursive ones
+        max_embed_dep: depth of the embedding, the properties of the
+            referenced documents are expanded as `_embed_obj` does
+        root: the class of the documents of the DataFrame
+
+    Returns:
+        list of column names
+    """
+    if root is None:
+        root = class_obj
+    if not prefix:
+        layout = ["@id", "@type"] if keepid else ["Document id"]
+    elif keepid or len(visited) > 1:
+        # json_normalize keeps the @ keys of the nested objects
+        layout = [prefix + "@id", prefix + "@type"]
+    else:
+        layout = []
+    visited = visited + (class_obj,)
+    for prop, prop_type in _class_properties(all_existing_class, class_obj).items():
+        subdocument = _subdocument_class(all_existing_class, prop_type)
+        embedded = None
+        if max_embed_dep > 0:
+            embedded = _embedded_class(all_existing_class, prop_type, root)
+        if embedded is not None:
+            # an embedded document is expanded like a subdocument of the root
+            layout.extend(
+                _class_layout(
+                    all_existing_class,
+                    embedded,
+                    keepid,
+                    f"{prefix}{prop}.",
+                    (root,),
+                    max_embed_dep - 1,
+                    root,
                 )
-            expanded.columns = [col + "." + x for x in expanded]
-            df.drop(columns=col, inplace=True)
-            df = df.join(expanded)
-    return df
+            )
+        elif subdocument is None or subdocument in visited:
+            layout.append(prefix + prop)
+        else:
+            layout.extend(
+                _class_layout(
+                    all_existing_class,
+                    subdocument,
+                    keepid,
+                    f"{prefix}{prop}.",
+                    visited,
+                    max_embed_dep,
+                    root,
+                )
+            )
+    return layout
+
+
+def _flatten_records(records, keepid, layout=None, class_obj=None):
+    """Flatten documents into columns, walking each document once.
+
+    Subdocuments (objects with an @id) are expanded into dotted columns as
+    `_expand_df` does, without building an intermediate DataFrame.
+
+    Args:
+        records: iterable of documents, all of the same type
+        keepid: whether to keep @id columns
+        layout: column names from the schema, the columns not in the
+            documents are kept empty and the unexpected ones are added after
+        class_obj: type the documents should have, the type of the first one if None
+
+    Returns:
+        tuple of the class of the documents, the number of rows and the
+        columns as a dict of lists, in order
+    """
+    groups = {}
+    expanded = set()
+    columns = {}
+    rows = 0
+    for row, document in enumerate(records):
+        doc_type = document.get("@type")
+        if class_obj is None:
+            class_obj = doc_type
+        elif doc_type != class_obj:
+            raise ValueError(
+                "Cannot convert to DataFrame from multiple type of objects."
+            )
+        for key, value in document.items():
+            if not keepid and key.startswith("@"):
+                if key != "@id":
+                    continue
+                key = "Document id"
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {}
+            if key != "Document id" and _is_subdocument(value):
+                expanded.add(key)
+                flat = {}
+                _flatten_subdocument(value, key + ".", keepid, flat)
+                for path, item in flat.items():
+                    group[path] = None
+                    _put(columns, path, row, item)
+            else:
+                group[key] = None
+                _put(columns, key, row, value)
+        rows = row + 1
 
+    order = [
+        path for key, group in groups.items() if key not in expanded for path in group
+    ]
+    order.extend(
+        path
+        for key, group in groups.items()
+        if key in expanded
+        for path in group
+        if path != key
+    )
+    if layout is not None:
+        in_layout = set(layout)
+        order = layout + [path for path in order if path not in in_layout]
+    return (
+        class_obj,
+        rows,
+        {path: _pad(columns.get(path, []), rows) for path in order},
+    )
 
-def _embed_obj(df, maxdep, pd, keepid, all_existing_class, class_obj, client):
+
+def _fetch_documents(client, ids, documents, workers):
+    """Retrieve the documents of the ids not fetched yet, in batches.
+
+    Args:
+        client: TerminusDB client for fetching documents
+        ids: referenced ids, may contain duplicates
+        documents: dict of the documents already fetched by id, updated
+        workers: number of requests sent in parallel
+    """
+    wanted = [doc_id for doc_id in dict.fromkeys(ids) if doc_id not in documents]
+    if wanted:
+        documents.update(zip(wanted, client.get_documents(wanted, workers=workers)))
+
+
+def _embed_column(values, client, documents, workers):
+    """Replace the ids in a column by their documents.
+
+    The distinct ids of the column are fetched once, then mapped back to the
+    cells with a join on the id.
+
+    Args:
+        values: pandas Series of the column
+        client: TerminusDB client for fetching documents
+        documents: dict of the documents already fetched by id, updated
+        workers: number of requests sent in parallel
+
+    Returns:
+        Series with the ids replaced by their documents
+    """
+    is_id = values.map(lambda value: isinstance(value, str)).astype(bool)
+    ids = values[is_id]
+    _fetch_documents(client, ids.unique(), documents, workers)
+    embedded = values.astype(object)
+    embedded[is_id] = ids.map(documents)
+    return embedded
+
+
+def _embed_obj(
+    df,
+    maxdep,
+    pd,
+    keepid,
+    all_existing_class,
+    class_obj,
+    client,
+    documents=None,
+    workers=1,
+):
     """Recursively embed object references in DataFrame.
 
     Args:
@@ -46,12 +328,16 @@ def _embed_obj(df, maxdep, pd, keepid, all_existing_class, class_obj, client):
         all_existing_class: dict of class definitions from schema
         class_obj: the class type of the documents
         client: TerminusDB client for fetching documents
+        documents: dict of the documents already fetched by id, shared by all the columns and levels
+        workers: number of requests sent in parallel to fetch the documents
 
     Returns:
         DataFrame with object references replaced by their document content
     """
     if maxdep == 0:
         return df
+    if documents is None:
+        documents = {}
     for col in df.columns:
         if "@" not in col and col != "Document id":
             col_comp = col.split(".")
@@ -67,7 +353,7 @@ def _embed_obj(df, maxdep, pd, keepid, all_existing_class, class_obj, client):
                 and prop_type != class_obj
                 and all_existing_class[prop_type].get("@type") != "Enum"
             ):
-                df[col] = df[col].apply(client.get_document)
+                df[col] = _embed_column(df[col], client, documents, workers)
     finish_df = _expand_df(df, pd, keepid)
     if (
         len(finish_df.columns) == len(df.columns)
@@ -76,44 +362,174 @@ def _embed_obj(df, maxdep, pd, keepid, all_existing_class, class_obj, client):
         return finish_df
     else:
         return _embed_obj(
-            finish_df, maxdep - 1, pd, keepid, all_existing_class, class_obj, client
+            finish_df,
+            maxdep - 1,
+            pd,
+            keepid,
+            all_existing_class,
+            class_obj,
+            client,
+            documents,
+            workers,
         )
 
 
-def result_to_df(all_records, keepid=False, max_embed_dep=0, client=None):
-    """Turn result documents into pandas DataFrame, all documents should be the same type.
-    If max_embed_dep > 0, a client needs to be provided to get objects to embed in DataFrame.
-    """
+def _import_pandas():
     try:
-        pd = import_module("pandas")
+        return import_module("pandas")
     except ImportError:
         raise ImportError(
             "Library 'pandas' is required, either install 'pandas' or install woqlDataframe requirements as follows: python -m pip install -U terminus-client-python[dataframe]"
         )
 
+
+def _existing_classes(max_embed_dep, client):
+    """Class definitions of the schema, None without a client"""
     if max_embed_dep > 0 and client is None:
         raise ValueError(
             "A client need to be provide to get objects to embed in DataFrame if max_embed_dep > 0"
         )
-    elif max_embed_dep > 0:
-        all_existing_class = client.get_existing_classes()
+    elif client is not None:
+        return client.get_existing_classes()
+    return None
 
-    df = pd.DataFrame().from_records(list(all_records))
-    all_types = df["@type"].unique()
-    if len(all_types) > 1:
-        raise ValueError("Cannot convert to DataFrame from multiple type of objects.")
-    else:
-        class_obj = all_types[0]
-    if not keepid:
-        df.rename(columns={"@id": "Document id"}, inplace=True)
-        df.drop(columns=list(filter(lambda x: x[0] == "@", df.columns)), inplace=True)
-    df = _expand_df(df, pd, keepid)
+
+def _schema_layout(records, all_existing_class, keepid, max_embed_dep=0):
+    """Column layout of the class of the first record, and the records with the first one put back.
+
+    The layout has the columns of the flattened documents, and another one
+    with the columns of the DataFrame once the documents are embedded (None
+    when the class is not known)."""
+    if all_existing_class is None:
+        return records, None, None
+    first = next(records, None)
+    if first is None:
+        return records, None, None
+    layout = None
+    embedded_layout = None
+    class_obj = first.get("@type")
+    if class_obj in all_existing_class:
+        layout = _class_layout(all_existing_class, class_obj, keepid)
+        embedded_layout = _class_layout(
+            all_existing_class, class_obj, keepid, max_embed_dep=max_embed_dep
+        )
+    return itertools.chain([first], records), layout, embedded_layout
+
+
+def _records_to_df(
+    records,
+    pd,
+    keepid,
+    max_embed_dep,
+    all_existing_class,
+    client,
+    workers,
+    layout=None,
+    class_obj=None,
+    start=0,
+):
+    """Flatten the records into a DataFrame and embed the objects they reference.
+
+    Args:
+        records: iterable of documents, all of the same type
+        pd: pandas module reference
+        keepid: whether to keep @id columns
+        max_embed_dep: depth of the embedding
+        all_existing_class: dict of class definitions from schema
+        client: TerminusDB client for fetching documents
+        workers: number of requests sent in parallel to fetch the documents
+        layout: column names from the schema
+        class_obj: type the documents should have
+        start: index of the first row
+
+    Returns:
+        tuple of the class of the documents and the DataFrame
+    """
+    class_obj, rows, columns = _flatten_records(records, keepid, layout, class_obj)
+    df = pd.DataFrame(columns, index=range(start, start + rows))
     if max_embed_dep > 0:
         if class_obj not in all_existing_class:
             raise InterfaceError(
                 f"{class_obj} not found in database ({client.db}) schema.'"
             )
         df = _embed_obj(
-            df, max_embed_dep, pd, keepid, all_existing_class, class_obj, client
+            df,
+            max_embed_dep,
+            pd,
+            keepid,
+            all_existing_class,
+            class_obj,
+            client,
+            workers=workers,
         )
-    return df
+    return class_obj, df
+
+
+def result_to_df(all_records, keepid=False, max_embed_dep=0, client=None, workers=1):
+    """Turn result documents into pandas DataFrame, all documents should be the same type.
+    If max_embed_dep > 0, a client needs to be provided to get objects to embed in DataFrame.
+    The embedded objects are retrieved in batches, with `workers` requests in parallel.
+    The columns are the ones found in the documents, the schema is only fetched when embedding.
+    """
+    pd = _import_pandas()
+    all_existing_class = None
+    if max_embed_dep > 0:
+        all_existing_class = _existing_classes(max_embed_dep, client)
+    return _records_to_df(
+        all_records,
+        pd,
+        keepid,
+        max_embed_dep,
+        all_existing_class,
+        client,
+        workers,
+    )[1]
+
+
+def result_to_df_chunks(
+    all_records, chunksize=10000, keepid=False, max_embed_dep=0, client=None, workers=1
+):
+    """Turn result documents into pandas DataFrames of at most `chunksize` rows, all documents should be the same type.
+    Only `chunksize` records are held at a time, so a stream of documents (e.g. from `Client.get_documents_by_type`) can be converted and written chunk by chunk.
+    All the chunks have the same columns, known before any chunk is converted if a client is provided: the properties of the class in the schema, with the ones of the subdocuments and the embedded documents expanded.
+    Otherwise the chunks have the columns of the first one, from the first `chunksize` documents.
+    Columns not in the first chunk are dropped, with a warning.
+    Other arguments are the same as `result_to_df`.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize needs to be at least 1.")
+    pd = _import_pandas()
+    all_existing_class = _existing_classes(max_embed_dep, client)
+    records, layout, columns = _schema_layout(
+        iter(all_records), all_existing_class, keepid, max_embed_dep
+    )
+    class_obj = None
+    start = 0
+    while True:
+        chunk = list(itertools.islice(records, chunksize))
+        if not chunk:
+            return
+        class_obj, df = _records_to_df(
+            chunk,
+            pd,
+            keepid,
+            max_embed_dep,
+            all_existing_class,
+            client,
+            workers,
+            layout,
+            class_obj,
+            start,
+        )
+        if columns is None:
+            columns = list(df.columns)
+        elif list(df.columns) != columns:
+            known = set(columns)
+            dropped = [col for col in df.columns if col not in known]
+            if dropped:
+                warnings.warn(
+                    f"Columns not in the header are dropped: {', '.join(dropped)}"
+                )
+            df = df.reindex(columns=columns)
+        start += len(chunk)
+        yield df